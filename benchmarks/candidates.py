@@ -0,0 +1,112 @@
+"""
+Candidate record microbenchmark.
+
+Compares the per-candidate cost of building, ranking and serializing one job's
+candidates as validated Pydantic models (TopCandidate with a ScoreBreakdown per
+candidate, as the pipeline used to) with the slotted CandidateRecord path that only
+validates once, when the JobResult is built. Run from the repository root:
+
+    python benchmarks/candidates.py --candidates 20000 --runs 5
+"""
+import os
+import sys
+import json
+import random
+import argparse
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.data.models import CandidateScores, JobResult, ScoreBreakdown, TopCandidate  # noqa: E402
+from src.core.candidate_records import CandidateRecord, rank_candidates, to_job_result  # noqa: E402
+
+TOP_N = 5
+
+
+def _inputs(count: int, seed: int = 7) -> List[Tuple[str, Dict[str, Any], CandidateScores]]:
+    """(url, profile, scores) per candidate, with scores already validated as the scorer returns them"""
+    rng = random.Random(seed)
+    inputs = []
+    for i in range(count):
+        values = [round(rng.uniform(0, 10), 1) for _ in range(7)]
+        scores = CandidateScores(
+            education_score=values[0], career_trajectory_score=values[1], company_relevance_score=values[2],
+            experience_match_score=values[3], location_match_score=values[4], tenure_score=values[5],
+            fit_score=values[6],
+        )
+        inputs.append((f"https://www.linkedin.com/in/candidate-{i}", {"full_name": f"Candidate {i}"}, scores))
+    return inputs
+
+
+def model_path(inputs: List[Tuple[str, Dict[str, Any], CandidateScores]]) -> str:
+    """Validated TopCandidate per candidate, sorted, wrapped in a JobResult and dumped"""
+    candidates = [
+        TopCandidate(
+            name=profile.get("full_name", "Unknown"),
+            linkedin_url=url,
+            fit_score=scores.fit_score,
+            score_breakdown=ScoreBreakdown(
+                education=scores.education_score,
+                trajectory=scores.career_trajectory_score,
+                company=scores.company_relevance_score,
+                skills=scores.experience_match_score,
+                location=scores.location_match_score,
+                tenure=scores.tenure_score,
+            ),
+        )
+        for url, profile, scores in inputs
+    ]
+    candidates.sort(key=lambda x: x.fit_score, reverse=True)
+    for candidate in candidates[TOP_N:]:
+        candidate.outreach_message = ""
+    result = JobResult(job_id="bench", candidates_found=len(candidates),
+                       top_candidates=candidates[:TOP_N], all_candidates=candidates)
+    return json.dumps(result.model_dump(), separators=(",", ":"))
+
+
+def record_path(inputs: List[Tuple[str, Dict[str, Any], CandidateScores]]) -> str:
+    """CandidateRecord per candidate, ranked, validated once into a JobResult and dumped"""
+    records = [CandidateRecord.from_scores(url, profile, scores) for url, profile, scores in inputs]
+    rank_candidates(records)
+    for record in records[TOP_N:]:
+        record.outreach_message = ""
+    return to_job_result("bench", records, TOP_N).model_dump_json()
+
+
+def _measure(fn: Callable[[Any], str], inputs: Any, runs: int) -> Tuple[List[float], float]:
+    """Wall times in ms over runs, and the peak traced memory of one run in MB"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(inputs)
+        times.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    fn(inputs)
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return times, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare Pydantic candidates with slotted candidate records")
+    parser.add_argument("--candidates", type=int, default=20000, help="Candidates per job")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per path")
+    args = parser.parse_args()
+
+    inputs = _inputs(args.candidates)
+    assert json.loads(model_path(inputs)) == json.loads(record_path(inputs)), "paths disagree"
+
+    print(f"{args.candidates} candidates, {args.runs} runs")
+    print(f"{'path':<10} {'median ms':>10} {'min ms':>10} {'us/cand':>9} {'peak MB':>9}")
+    for name, fn in (("pydantic", model_path), ("records", record_path)):
+        times, peak = _measure(fn, inputs, args.runs)
+        median = statistics.median(times)
+        print(f"{name:<10} {median:>10.1f} {min(times):>10.1f} {median * 1000 / args.candidates:>9.2f} {peak:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
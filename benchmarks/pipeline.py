@@ -0,0 +1,175 @@
+"""
+Offline end-to-end benchmark of the candidate processor.
+
+Starts local stand-ins for Google CSE, RapidAPI and an OpenAI-compatible endpoint
+(benchmarks/stub_servers.py), points the pipeline at them through GOOGLE_CSE_URL,
+RAPID_API_URL and OPENAI_BASE_URL, and runs process_all_jobs and
+process_all_jobs_sequential over synthetic jobs. Each mode runs in a fresh interpreter
+with empty caches so peak RSS and cache state don't leak between modes.
+
+    python benchmarks/pipeline.py --jobs 8 --latency-ms 80 --rate-limit-rate 0.02
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import subprocess
+import contextlib
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from stub_servers import StubConfig, StubServer, TITLES, CITIES, SKILLS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = ["concurrent", "sequential"]
+STAGES = ["search", "fetch", "score", "outreach"]
+
+
+def _synthetic_jobs(count: int, seed: int = 7) -> List[Any]:
+    from src.data.models import JobData
+    rng = random.Random(seed)
+    return [
+        JobData(
+            title=f"{rng.choice(TITLES)} {i}",
+            location=", ".join(rng.choice(CITIES)[:2]),
+            experience_level=rng.choice(["Mid", "Senior", "Staff"]),
+            keywords=rng.sample(SKILLS, 4),
+        )
+        for i in range(count)
+    ]
+
+
+def run_child(mode: str, jobs: int, max_workers: int) -> Dict[str, Any]:
+    """Run one mode in this process (environment already points at the stubs)"""
+    import resource
+    from src.core import candidate_processor
+    from src.services.metrics import get_metrics
+
+    job_list = _synthetic_jobs(jobs)
+
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        if mode == "concurrent":
+            results = candidate_processor.process_all_jobs(job_list, max_workers=max_workers)
+        else:
+            results = candidate_processor.process_all_jobs_sequential(job_list)
+    elapsed = time.perf_counter() - start
+
+    candidates = sum(result.candidates_found for result in results.root)
+    summary = get_metrics().summary()
+    return {
+        "mode": mode,
+        "jobs": len(results.root),
+        "failed_jobs": sum(1 for result in results.root if result.error),
+        "candidates": candidates,
+        "seconds": round(elapsed, 3),
+        "jobs_per_min": round(len(results.root) / elapsed * 60, 2),
+        "candidates_per_s": round(candidates / elapsed, 2),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "stages": {stage: summary["spans"].get(stage, {}) for stage in STAGES},
+        "counters": summary["counters"],
+    }
+
+
+def _child_env(servers: Dict[str, StubServer], cache_dir: str, args: argparse.Namespace) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update({
+        "GOOGLE_CSE_URL": servers["search"].url + "/customsearch/v1",
+        "RAPID_API_URL": servers["profile"].url + "/get-linkedin-profile",
+        "OPENAI_BASE_URL": servers["openai"].url + "/v1",
+        "OPENAI_API_KEY": "bench",
+        "GOOGLE_SEARCH_API_KEY": "bench",
+        "GOOGLE_SEARCH_CSE_ID": "bench",
+        "RAPID_API_KEY": "bench",
+        "PROFILE_CACHE_PATH": os.path.join(cache_dir, "profiles.sqlite3"),
+        "LLM_CACHE_PATH": os.path.join(cache_dir, "llm.sqlite3"),
+        "RUN_STATE_PATH": os.path.join(cache_dir, "runs.sqlite3"),
+        "TALENT_POOL_PATH": os.path.join(cache_dir, "talent_pool.sqlite3"),
+        "INCREMENTAL_PATH": os.path.join(cache_dir, "incremental.sqlite3"),
+        # Never charge the real daily quota or share the production work queue
+        "QUOTA_PATH": os.path.join(cache_dir, "quota.sqlite3"),
+        "WORK_QUEUE_PATH": os.path.join(cache_dir, "work_queue.sqlite3"),
+        "PYTHONPATH": ROOT,
+        "METRICS_ENABLED": "true",
+    })
+    if args.no_cache:
+        env["PROFILE_CACHE_ENABLED"] = "false"
+        env["LLM_CACHE_ENABLED"] = "false"
+        env["TALENT_POOL_ENABLED"] = "false"
+        env["INCREMENTAL_ENABLED"] = "false"
+    for provider in ("GOOGLE_CSE", "RAPIDAPI", "OPENAI"):
+        env[f"RATE_LIMIT_{provider}_RPS"] = str(args.rps)
+        env[f"RATE_LIMIT_{provider}_BURST"] = str(max(1, int(args.rps)))
+    return env
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(f"\n{'mode':<12} {'jobs':>5} {'failed':>7} {'cands':>7} {'sec':>8} {'jobs/min':>9} {'cand/s':>8} {'rss MB':>8}")
+    for run in report["runs"]:
+        print(f"{run['mode']:<12} {run['jobs']:>5} {run['failed_jobs']:>7} {run['candidates']:>7} {run['seconds']:>8.2f} "
+              f"{run['jobs_per_min']:>9.1f} {run['candidates_per_s']:>8.1f} {run['peak_rss_mb']:>8.1f}")
+        for stage, stats in run["stages"].items():
+            print(f"    {stage:<10} calls={stats.get('count', 0):<5} p50={stats.get('p50_ms', 0):.1f}ms "
+                  f"p95={stats.get('p95_ms', 0):.1f}ms p99={stats.get('p99_ms', 0):.1f}ms")
+    print(f"\nStub servers: {report['servers']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline throughput benchmark of the candidate pipeline")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--jobs", type=int, default=6, help="Synthetic jobs per run")
+    parser.add_argument("--max-workers", type=int, default=3, help="Concurrent jobs in process_all_jobs")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Mean latency of every stub")
+    parser.add_argument("--llm-latency-ms", type=float, default=None, help="Latency of the OpenAI stub (default: --latency-ms)")
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--rps", type=float, default=1000.0, help="Client-side rate limit per provider")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the profile and LLM caches and the talent pool")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.jobs, args.max_workers)))
+        return
+
+    def config(latency: float) -> StubConfig:
+        return StubConfig(latency_ms=latency, jitter_ms=args.jitter_ms,
+                          error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate)
+
+    llm_latency = args.llm_latency_ms if args.llm_latency_ms is not None else args.latency_ms
+    servers = {
+        "search": StubServer("search", config(args.latency_ms)).start(),
+        "profile": StubServer("profile", config(args.latency_ms)).start(),
+        "openai": StubServer("openai", config(llm_latency)).start(),
+    }
+    report: Dict[str, Any] = {"settings": vars(args), "runs": []}
+    try:
+        for mode in args.modes:
+            with tempfile.TemporaryDirectory(prefix="syn-bench-") as cache_dir:
+                out = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--child", mode,
+                     "--jobs", str(args.jobs), "--max-workers", str(args.max_workers)],
+                    env=_child_env(servers, cache_dir, args), cwd=ROOT, capture_output=True, text=True
+                )
+            if out.returncode != 0:
+                print(f"{mode} run failed:\n{out.stderr}")
+                continue
+            report["runs"].append(json.loads(out.stdout.strip().splitlines()[-1]))
+    finally:
+        report["servers"] = {name: server.stats_dict() for name, server in servers.items()}
+        for server in servers.values():
+            server.stop()
+
+    _print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Cold-start import benchmark.
+
+Each measurement imports a module in a fresh interpreter, so nothing is shared between
+runs. Run from the repository root:
+
+    python benchmarks/startup.py --runs 10 --importtime
+"""
+import os
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+from typing import List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODULES = ["src.data", "src.services", "src.core", "main"]
+
+
+def _import_ms(module: str) -> float:
+    """Wall time of importing one module in a new interpreter, in milliseconds"""
+    code = (
+        "import time; t = time.perf_counter(); "
+        f"import {module}; "
+        "print((time.perf_counter() - t) * 1000)"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def _top_imports(module: str, limit: int) -> List[Tuple[int, str]]:
+    """Slowest imports (cumulative, so parents include their children), from python -X importtime"""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                         cwd=ROOT, capture_output=True, text=True, check=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \| +(\S+)", line)
+        if match and match.group(2) != module:
+            rows.append((int(match.group(1)), match.group(2)))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure cold import time of the package")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES, help="Modules to import")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module")
+    parser.add_argument("--importtime", action="store_true", help="Show the slowest imports per module")
+    parser.add_argument("--top", type=int, default=8, help="Rows shown with --importtime")
+    args = parser.parse_args()
+
+    print(f"{'module':<16} {'median ms':>10} {'min ms':>10} {'max ms':>10}")
+    for module in args.modules:
+        times = [_import_ms(module) for _ in range(args.runs)]
+        print(f"{module:<16} {statistics.median(times):>10.1f} {min(times):>10.1f} {max(times):>10.1f}")
+
+    if args.importtime:
+        for module in args.modules:
+            print(f"\nSlowest imports for {module}:")
+            for micros, name in _top_imports(module, args.top):
+                print(f"  {micros / 1000:>8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Local stand-ins for Google Custom Search, the RapidAPI LinkedIn profile API and an
+OpenAI-compatible chat completions endpoint.
+
+Responses are synthetic but deterministic (derived from a hash of the request), so two
+benchmark runs with the same settings send and receive the same data. Each server can
+add latency, fail a fraction of requests with 500 and throttle a fraction with 429.
+"""
+import re
+import json
+import time
+import random
+import hashlib
+import threading
+from dataclasses import dataclass, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+FIRST_NAMES = ["Ada", "Grace", "Alan", "Linus", "Barbara", "Ken", "Margaret", "Dennis", "Radia", "Guido"]
+LAST_NAMES = ["Lovelace", "Hopper", "Turing", "Torvalds", "Liskov", "Thompson", "Hamilton", "Ritchie", "Perlman", "Rossum"]
+COMPANIES = ["Google", "Microsoft", "Stripe", "Acme Corp", "Initech", "Globex", "Datadog", "Shopify"]
+TITLES = ["Software Engineer", "Senior Software Engineer", "Data Scientist", "ML Engineer",
+          "Backend Engineer", "Engineering Manager", "Staff Engineer", "Product Engineer"]
+CITIES = [("San Francisco", "California", "United States"), ("New York", "New York", "United States"),
+          ("Seattle", "Washington", "United States"), ("Austin", "Texas", "United States"),
+          ("London", "England", "United Kingdom"), ("Toronto", "Ontario", "Canada")]
+SCHOOLS = ["MIT", "Stanford University", "University of Texas", "University of Toronto", "State University"]
+SKILLS = ["python", "java", "go", "kubernetes", "aws", "react", "sql", "pytorch", "spark", "typescript"]
+
+
+@dataclass
+class StubConfig:
+    """Fault injection settings of one stub server"""
+    latency_ms: float = 50.0
+    jitter_ms: float = 10.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_seconds: float = 0.5
+
+
+@dataclass
+class StubStats:
+    requests: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+
+
+def _seed(*parts: Any) -> int:
+    return int(hashlib.sha256("|".join(map(str, parts)).encode("utf-8")).hexdigest()[:12], 16)
+
+
+def _rng(*parts: Any) -> random.Random:
+    return random.Random(_seed(*parts))
+
+
+def synthetic_profile(profile_url: str) -> Dict[str, Any]:
+    """A plausible RapidAPI profile payload derived from the URL"""
+    rng = _rng(profile_url)
+    city, state, country = rng.choice(CITIES)
+    start = rng.randint(2005, 2018)
+    experiences = []
+    for _ in range(rng.randint(1, 4)):
+        end = min(2026, start + rng.randint(1, 5))
+        experiences.append({
+            "title": rng.choice(TITLES),
+            "company": rng.choice(COMPANIES),
+            "start_year": start,
+            "end_year": end,
+            "description": "Worked with " + ", ".join(rng.sample(SKILLS, 3)),
+        })
+        start = end
+    experiences.reverse()
+    return {
+        "full_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        "headline": f"{experiences[0]['title']} at {experiences[0]['company']}",
+        "about": "Engineer interested in " + ", ".join(rng.sample(SKILLS, 2)),
+        "city": city,
+        "state": state,
+        "country": country,
+        "experiences": experiences,
+        "educations": [{"school": rng.choice(SCHOOLS), "degree": "BS", "field_of_study": "Computer Science"}],
+    }
+
+
+def _scores(rng: random.Random) -> Dict[str, float]:
+    scores = {
+        "education_score": rng.randint(4, 10),
+        "career_trajectory_score": rng.randint(4, 10),
+        "company_relevance_score": rng.randint(4, 10),
+        "experience_match_score": rng.randint(3, 10),
+        "location_match_score": rng.randint(3, 10),
+        "tenure_score": rng.randint(4, 10),
+    }
+    scores["fit_score"] = round(
+        scores["education_score"] * 0.20 + scores["career_trajectory_score"] * 0.20
+        + scores["company_relevance_score"] * 0.15 + scores["experience_match_score"] * 0.25
+        + scores["location_match_score"] * 0.10 + scores["tenure_score"] * 0.10, 2
+    )
+    return scores
+
+
+def synthetic_completion(prompt: str) -> str:
+    """Answer one of the repo's prompts in the format its parser expects"""
+    rng = _rng(prompt)
+    if "Candidates (JSON array, each with a candidate_id)" in prompt:
+        ids = re.findall(r'"candidate_id":\s*(\d+)', prompt)
+        return json.dumps([{"candidate_id": int(i), **_scores(rng)} for i in ids])
+    if "Jobs (JSON array, each with a job_id)" in prompt:
+        ids = re.findall(r'"job_id":\s*(\d+)', prompt)
+        return json.dumps([{"job_id": int(i), **_scores(rng)} for i in ids])
+    if "expert candidate evaluator" in prompt:
+        return json.dumps({**_scores(rng), "reasoning": "Synthetic benchmark score"})
+    if "job description parser" in prompt:
+        return json.dumps({"title": rng.choice(TITLES), "location": ", ".join(rng.choice(CITIES)[:2]),
+                           "experience_level": "Senior", "keywords": rng.sample(SKILLS, 4)})
+    return "Hi there,\n\nI came across your profile and think you'd be a great fit for a role we're hiring for. " \
+           "Would you be open to a quick chat?\n\nBest regards,\nBenchmark"
+
+
+class StubServer:
+    """One stand-in HTTP service on 127.0.0.1, served from a background thread"""
+
+    def __init__(self, name: str, config: Optional[StubConfig] = None, port: int = 0):
+        """
+        Args:
+            name: "search", "profile" or "openai"
+            config: Latency and fault injection settings
+            port: Port to listen on (0 picks a free one)
+        """
+        self.name = name
+        self.config = config or StubConfig()
+        self.stats = StubStats()
+        self._lock = threading.Lock()
+        self._rng = random.Random(_seed(name))
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name=f"stub-{name}", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def stats_dict(self) -> Dict[str, int]:
+        with self._lock:
+            return asdict(self.stats)
+
+    def _fault(self) -> Optional[int]:
+        """Pick the injected status for the next request (None serves it normally)"""
+        with self._lock:
+            self.stats.requests += 1
+            roll = self._rng.random()
+            if roll < self.config.rate_limit_rate:
+                self.stats.rate_limited += 1
+                return 429
+            if roll < self.config.rate_limit_rate + self.config.error_rate:
+                self.stats.errors += 1
+                return 500
+            delay = max(0.0, self.config.latency_ms + self._rng.uniform(-1, 1) * self.config.jitter_ms) / 1000
+        time.sleep(delay)
+        return None
+
+    def respond(self, method: str, path: str, query: Dict[str, List[str]], body: bytes) -> Tuple[int, Dict[str, Any]]:
+        if self.name == "search":
+            return 200, self._search(query)
+        if self.name == "profile":
+            return 200, {"data": synthetic_profile(query.get("linkedin_url", [""])[0])}
+        return 200, self._chat(json.loads(body or b"{}"))
+
+    def _search(self, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        q = query.get("q", [""])[0]
+        start = int(query.get("start", ["1"])[0])
+        # Several jobs share a slug pool, so the same profiles show up for different searches
+        rng = _rng(q, start)
+        items = [{"link": f"https://www.linkedin.com/in/bench-{rng.randint(0, 499)}"} for _ in range(10)]
+        payload: Dict[str, Any] = {"items": items, "queries": {}}
+        if start < 21:
+            payload["queries"]["nextPage"] = [{"startIndex": start + 10}]
+        return payload
+
+    def _chat(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        prompt = "\n".join(str(m.get("content", "")) for m in request.get("messages", []))
+        content = synthetic_completion(prompt)
+        prompt_tokens, completion_tokens = len(prompt) // 4, len(content) // 4
+        return {
+            "id": f"chatcmpl-{_seed(prompt):x}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self, method: str) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                status = server._fault()
+                headers = {}
+                if status == 429:
+                    payload: Dict[str, Any] = {"error": {"message": "Rate limit exceeded (stub)"}}
+                    headers["Retry-After"] = str(server.config.retry_after_seconds)
+                elif status == 500:
+                    payload = {"error": {"message": "Internal error (stub)"}}
+                else:
+                    parsed = urlparse(self.path)
+                    status, payload = server.respond(method, parsed.path, parse_qs(parsed.query), body)
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self) -> None:
+                self._handle("GET")
+
+            def do_POST(self) -> None:
+                self._handle("POST")
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
@@ -1,42 +1,120 @@
-import json
-from src.data.models import JobData
+import argparse
 from src.core.candidate_processor import process_all_jobs
-from src.core.parse_jd import process_all_job_descriptions
+from src.core.parse_jd import iter_job_descriptions
+from src.services.profile_cache import get_profile_cache
+from src.services.llm_cache import get_llm_cache
+from src.core.prefilter import get_prefilter_stats
+from src.core.result_writer import ResultWriter, finalize_results, RESULTS_JSONL_PATH
+from src.core.run_state import RunStateStore, RunState
+from src.core.work_queue import WorkQueue
+from src.core.distributed import enqueue_jobs, spawn_local_workers, wait_until_drained, collect_results
+from src.services.metrics import get_metrics, METRICS_SUMMARY_PATH, METRICS_PROMETHEUS_PATH
 
-def save_results(results, filename: str = 'final.json'):
-    """Save results to JSON file"""
-    with open(filename, 'w') as f:
-        json.dump([result.model_dump() for result in results.root], f, indent=2)
+def _counter_total(run_summary, name: str, **labels) -> float:
+    """Sum of a counter's series in a metrics summary, optionally filtered by labels"""
+    return sum(series["value"] for series in run_summary["counters"].get(name, [])
+               if all(series.get(key) == value for key, value in labels.items()))
+
+
+def run_distributed(run_state: RunState, workers: int, resume: bool = False) -> None:
+    """Queue every job (unless resuming) and run local workers until the queue is drained"""
+    queue_id = run_state.run_id
+    queue = WorkQueue()
+    if not resume:
+        # The queued tasks of a resumed run are picked up where they were left
+        print("\nParsing job descriptions and queueing jobs...")
+        enqueue_jobs(queue, iter_job_descriptions(run_state=run_state), queue_id)
+    print(f"Queue {queue_id}: {queue.counts(queue_id)}")
+    for process in spawn_local_workers(queue_id, workers):
+        process.wait()
+    # Workers on other machines may still hold leases
+    wait_until_drained(queue, queue_id, on_progress=lambda counts: print(f"Queue {queue_id}: {counts}"))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Candidate sourcing and outreach generation")
+    parser.add_argument("--resume", metavar="RUN_ID", help="resume an interrupted run, skipping completed work")
+    parser.add_argument("--list-runs", action="store_true", help="list recorded runs and exit")
+    parser.add_argument("--workers", type=int, default=0, metavar="N",
+                        help="process jobs through the work queue with N local worker processes "
+                             "(more can join from other machines with: python worker.py --queue RUN_ID)")
+    return parser.parse_args()
 
 
 def main():
     """Main workflow: parse jobs, process candidates, save results"""
-    print("Starting candidate scoring and outreach generation...")
-    print("Processing mode: concurrent (3 workers)")
+    args = parse_args()
+    run_store = RunStateStore()
+    if args.list_runs:
+        for run in run_store.list_runs():
+            print(f"{run['run_id']}  {run['status']}")
+        return
     
-    # Parse job descriptions
-    print("\nParsing job descriptions...")
-    jobs = process_all_job_descriptions()
-    print(f"Found {len(jobs)} jobs to process")
+    run_state = run_store.start_run(args.resume)
+    print("Starting candidate scoring and outreach generation...")
+    if args.workers:
+        print(f"Processing mode: distributed ({args.workers} local worker processes)")
+    else:
+        print("Processing mode: concurrent (3 workers)")
+    if args.resume:
+        print(f"Resuming run {run_state.run_id}: {run_state.progress()}")
+    else:
+        print(f"Run ID: {run_state.run_id} (resume with --resume {run_state.run_id})")
     
-    # Process all jobs
-    print("\nProcessing candidates and generating scores...")
-    results = process_all_jobs(jobs, max_workers=3)
+    # Parse job descriptions and process candidates; jobs start as soon as their JD is parsed
+    # and each result is appended to the JSON Lines file the moment its job finishes
+    if args.workers:
+        run_distributed(run_state, args.workers, resume=bool(args.resume))
+        with ResultWriter(RESULTS_JSONL_PATH) as writer:
+            for result in collect_results(WorkQueue(), run_state.run_id).root:
+                writer.write(result)
+    else:
+        print("\nParsing job descriptions and processing candidates...")
+        jobs = iter_job_descriptions(run_state=run_state)
+        with ResultWriter(RESULTS_JSONL_PATH) as writer:
+            process_all_jobs(jobs, max_workers=3, on_result=writer.write, keep_results=False, run_state=run_state)
+    run_state.finish()
     
     # Save results
     print("\nSaving results...")
-    save_results(results, 'final.json')
+    finalize_results(writer.path, 'final.json')
     
     # Summary
-    total_candidates = sum(result.candidates_found for result in results.root)
-    total_top_candidates = sum(len(result.top_candidates) for result in results.root)
-    successful_jobs = len([r for r in results.root if not r.error])
-    failed_jobs = len([r for r in results.root if r.error])
+    summary = writer.summary
     
-    print(f"\nComplete! Processed {total_candidates} candidates across {len(jobs)} jobs.")
-    print(f"Top candidates with outreach messages: {total_top_candidates}")
-    print(f"Successful jobs: {successful_jobs}, Failed jobs: {failed_jobs}")
-    print(f"Results saved to 'final.json'")
+    print(f"\nComplete! Processed {summary.candidates} candidates across {summary.jobs} jobs.")
+    print(f"Top candidates with outreach messages: {summary.top_candidates}")
+    print(f"Successful jobs: {summary.successful_jobs}, Failed jobs: {summary.failed_jobs}")
+    if summary.partial_jobs:
+        print(f"Partial jobs (candidates skipped for the daily quota or failed): {summary.partial_jobs}")
+    print(f"Results saved to 'final.json' (streamed to '{writer.path}')")
+
+    print(f"Prefilter: {get_prefilter_stats()}")
+    profile_cache = get_profile_cache()
+    if profile_cache is not None:
+        print(f"Profile cache: {profile_cache.stats_dict()}")
+    llm_cache = get_llm_cache()
+    if llm_cache is not None:
+        print(f"LLM cache: {llm_cache.stats_dict()}")
+
+    metrics = get_metrics()
+    if metrics.enabled:
+        metrics.write(METRICS_SUMMARY_PATH, METRICS_PROMETHEUS_PATH)
+        run_summary = metrics.summary()
+        print("Stage latency:")
+        for span, stats in run_summary["spans"].items():
+            print(f"  {span:<9} n={stats['count']:<5} p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms p99={stats['p99_ms']}ms")
+        llm_requests = _counter_total(run_summary, "llm_requests_total")
+        if llm_requests:
+            prompt_tokens = _counter_total(run_summary, "llm_prompt_tokens_total")
+            print(f"LLM prompt tokens per call: {prompt_tokens / llm_requests:.0f}")
+        compactions = _counter_total(run_summary, "prompt_compactions_total")
+        if compactions:
+            kept = _counter_total(run_summary, "prompt_profile_tokens_total", result="kept")
+            dropped = _counter_total(run_summary, "prompt_profile_tokens_total", result="dropped")
+            print(f"Profile tokens per scoring prompt (estimated): {kept / compactions:.0f} kept, "
+                  f"{dropped / compactions:.0f} trimmed")
+        print(f"Metrics written to '{METRICS_SUMMARY_PATH}' and '{METRICS_PROMETHEUS_PATH}'")
 
 
 if __name__ == "__main__":
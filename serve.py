@@ -0,0 +1,22 @@
+import argparse
+from src.core.service import serve, SERVICE_HOST, SERVICE_PORT, SERVICE_WORKERS, SERVICE_QUEUE_SIZE
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Long-running sourcing service with a job submission API")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--workers", type=int, default=SERVICE_WORKERS, help="jobs processed concurrently")
+    parser.add_argument("--queue-size", type=int, default=SERVICE_QUEUE_SIZE,
+                        help="submissions allowed to wait; more are refused with 429")
+    return parser.parse_args()
+
+
+def main():
+    """Service entry point: submit JDs with POST /jobs and follow them with GET /jobs/<id>/events"""
+    args = parse_args()
+    serve(args.host, args.port, args.workers, args.queue_size)
+
+
+if __name__ == "__main__":
+    main()
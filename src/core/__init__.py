@@ -1,12 +1,53 @@
-from .parse_jd import parse_job_description, process_all_job_descriptions
-from .scorer import score_candidate
+from .parse_jd import parse_job_description, process_all_job_descriptions, iter_job_descriptions
+from .scorer import score_candidate, score_candidates, score_candidate_multi_job
 from .candidate_processor import process_all_jobs
 from .outreach import generate_outreach_message
+from .pipeline import PipelineConfig
+from .candidate_registry import CandidateRegistry
+from .candidate_records import CandidateRecord
+from .result_writer import ResultWriter, iter_results, finalize_results
+from .run_state import RunStateStore, RunState
+from .prefilter import PrefilterConfig, prefilter_candidate, get_prefilter_stats
+from .search import build_search_queries, search_candidates, source_candidates
+from .talent_pool import TalentPool, get_talent_pool
+from .work_queue import WorkQueue
+from .distributed import enqueue_jobs, run_worker, collect_results
+from .incremental import IncrementalStore, get_incremental_store
+from .scheduler import Scheduler
+from .service import SourcingService, serve
 
 __all__ = [
     'parse_job_description',
     'process_all_job_descriptions', 
+    'iter_job_descriptions',
     'score_candidate',
+    'score_candidates',
+    'score_candidate_multi_job',
     'process_all_jobs',
-    'generate_outreach_message'
+    'generate_outreach_message',
+    'PipelineConfig',
+    'CandidateRegistry',
+    'CandidateRecord',
+    'ResultWriter',
+    'iter_results',
+    'finalize_results',
+    'RunStateStore',
+    'RunState',
+    'PrefilterConfig',
+    'prefilter_candidate',
+    'get_prefilter_stats',
+    'build_search_queries',
+    'search_candidates',
+    'source_candidates',
+    'TalentPool',
+    'get_talent_pool',
+    'WorkQueue',
+    'enqueue_jobs',
+    'run_worker',
+    'collect_results',
+    'IncrementalStore',
+    'get_incremental_store',
+    'Scheduler',
+    'SourcingService',
+    'serve'
 ] 
\ No newline at end of file
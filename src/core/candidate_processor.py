@@ -1,165 +1,561 @@
 import os
 import json
-import time
-from typing import List, Dict, Any
+import heapq
+import hashlib
+import threading
+from dataclasses import asdict
+from typing import Callable, Iterable, List, Dict, Any, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from ..data.models import JobData, JobResult, TopCandidate, FinalResults, ScoreBreakdown
-from ..services.api_client import search_linkedin_profiles, get_linkedin_profile
-from .scorer import score_candidate
+from ..data.models import JobData, JobResult, FinalResults, CandidateScores
+from ..services.api_client import get_linkedin_profile
+from ..services.metrics import get_metrics, traced
+from .scorer import score_candidates, scoring_fingerprint, refresh_local_scores
 from .outreach import generate_outreach_message
+from .pipeline import PipelineConfig, run_pipeline
+from .prefilter import PrefilterConfig, split_candidates
+from .candidate_registry import CandidateRegistry
+from .candidate_records import CandidateRecord, rank_candidates, to_job_result
+from .run_state import RunState
+from .scheduler import Scheduler, JobTicket, SCHEDULER_CONCURRENCY, SCHEDULER_CANDIDATES_PER_JOB
+from .local_scoring import SCORE_WEIGHTS
+from .search import source_candidates
+from .talent_pool import get_talent_pool
+from .incremental import (
+    get_incremental_store, job_fingerprint, job_lineage_key, changed_fields,
+    INCREMENTAL_RESEARCH_FIELDS, INCREMENTAL_OUTREACH_FIELDS
+)
 
 
-def process_job(job: JobData) -> JobResult:
+@traced("fetch")
+def _fetch_profile(url: str, job: JobData, registry: Optional[CandidateRegistry] = None,
+                   run_state: Optional[RunState] = None) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Pipeline fetch stage: return (url, profile) or None if the profile could not be fetched"""
+    if run_state is not None:
+        profile_data = run_state.get_profile(url)
+        if profile_data:
+            return url, profile_data
+    
+    # Cached (within PROFILE_CACHE_TTL_HOURS) and rate limited per provider inside the client;
+    # the registry additionally makes sure jobs running in parallel don't fetch the same URL twice
+    profile_data = registry.get_profile(url) if registry is not None else get_linkedin_profile(url)
+    if not profile_data:
+        return None
+    # Indexed in the talent pool so later jobs can discover the candidate without a search
+    pool = get_talent_pool()
+    if pool is not None:
+        pool.add(url, profile_data)
+    if run_state is not None:
+        run_state.record_profile(job, url, profile_data)
+    return url, profile_data
+
+
+@traced("score")
+def _score_profiles(items: List[Tuple[str, Dict[str, Any]]], job: JobData,
+                    prefilter: Optional[PrefilterConfig] = None,
+                    registry: Optional[CandidateRegistry] = None,
+                    run_state: Optional[RunState] = None) -> Tuple[List[Optional[CandidateRecord]], int]:
+    """
+    Pipeline score stage: score a micro-batch of fetched profiles in as few LLM round trips as possible.
+    
+    Returns (records, number of profiles whose scoring call failed).
+    Profiles that fail the cheap local prefilter are dropped or get a fast-path score
+    without an LLM call. With a registry, profiles other jobs also found are scored
+    once for all of them. With a run state, candidates scored before a crash are reused.
+    Profiles scored for an earlier version of the job whose scoring inputs did not
+    change get their stored LLM scores back, with only the local dimensions recomputed.
+    """
+    scores: Dict[int, Optional[CandidateScores]] = {}
+    pending = list(range(len(items)))
+    if run_state is not None:
+        pending = []
+        for i, (url, _) in enumerate(items):
+            done, stored_scores = run_state.get_scores(job, url)
+            if done:
+                scores[i] = stored_scores
+            else:
+                pending.append(i)
+    
+    profiles = [items[i][1] for i in pending]
+    to_score, rejected = split_candidates(profiles, job, prefilter)
+    scores.update((pending[i], rejected_scores) for i, rejected_scores in rejected.items())
+    to_score = [pending[i] for i in to_score]
+    
+    store = get_incremental_store()
+    scoring_fp = scoring_fingerprint(job) if store is not None else None
+    if store is not None:
+        stored = [(i, store.get_scores(items[i][0], scoring_fp, items[i][1])) for i in to_score]
+        reused = {i: refresh_local_scores(s, items[i][1], job) for i, s in stored if s is not None}
+        if reused:
+            get_metrics().inc("incremental_reuses_total", len(reused), what="scores")
+            scores.update(reused)
+            to_score = [i for i in to_score if i not in reused]
+    
+    for i in to_score:
+        # Get candidate name for logging
+        candidate_name = items[i][1].get('full_name', 'Unknown')
+        print(f"Processing: {candidate_name} for job: {job.title}")
+    
+    # Score the candidates that passed the prefilter
+    failed = set()
+    if to_score:
+        if registry is not None:
+            llm_scores = registry.score_many([items[i] for i in to_score], job)
+        else:
+            llm_scores = score_candidates([items[i][1] for i in to_score], job)
+        scores.update(zip(to_score, llm_scores))
+        # Failed scoring calls are neither stored nor checkpointed, so they are retried
+        failed = {i for i, candidate_scores in zip(to_score, llm_scores) if candidate_scores is None}
+        if store is not None:
+            for i, candidate_scores in zip(to_score, llm_scores):
+                if i not in failed:
+                    store.put_scores(items[i][0], scoring_fp, items[i][1], candidate_scores)
+    
+    if run_state is not None:
+        for i in pending:
+            if i not in failed:
+                run_state.record_scores(job, items[i][0], scores[i])
+    
+    return [
+        CandidateRecord.from_scores(url, profile_data, scores[i]) if scores[i] is not None else None
+        for i, (url, profile_data) in enumerate(items)
+    ], len(failed)
+
+
+OUTREACH_FAILED_MESSAGE = "Unable to generate personalized message."
+
+
+@traced("outreach")
+def _add_outreach(candidate: CandidateRecord, job: JobData, run_state: Optional[RunState] = None,
+                  previous_outreach: Optional[Dict[str, str]] = None) -> None:
+    """Pipeline outreach stage: attach a personalized message to a top candidate"""
+    if previous_outreach and candidate.linkedin_url in previous_outreach:
+        candidate.outreach_message = previous_outreach[candidate.linkedin_url]
+        get_metrics().inc("incremental_reuses_total", what="outreach")
+        return
+    if run_state is not None:
+        message = run_state.get_outreach(job, candidate.linkedin_url)
+        if message is not None:
+            candidate.outreach_message = message
+            return
+    try:
+        message = generate_outreach_message(candidate, job)
+        candidate.outreach_message = message
+        if run_state is not None:
+            run_state.record_outreach(job, candidate.linkedin_url, message)
+    except Exception as e:
+        print(f"Error generating outreach message: {e}")
+        candidate.outreach_message = OUTREACH_FAILED_MESSAGE
+
+
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
+
+
+@traced("job")
+def process_job(job: JobData, config: Optional[PipelineConfig] = None,
+                registry: Optional[CandidateRegistry] = None,
+                run_state: Optional[RunState] = None,
+                on_progress: Optional[ProgressCallback] = None,
+                scheduler: Optional[Scheduler] = None,
+                incremental: bool = True) -> JobResult:
     """
     Process a single job: find candidates, score them, and generate outreach messages.
     
+    Search, profile fetching and scoring run as a pipeline of worker pools connected by
+    bounded queues, so profiles are scored while others are still being fetched.
+    Outreach for the top candidates starts as soon as the ranking is final.
+    
+    When an earlier version of the job (same requisition ID, or same title and location)
+    was processed, only what the edit affects is recomputed: an unchanged job run with
+    the same settings returns its stored result, a job whose search inputs
+    (INCREMENTAL_RESEARCH_FIELDS) did not change re-scores the candidates found last
+    time, and candidates that stay in the top N keep their outreach message unless an
+    INCREMENTAL_OUTREACH_FIELDS field changed. Only complete results are stored as a
+    version: not after an empty search, skipped or failed candidates, or failed outreach.
+    
     Args:
         job: JobData object containing job information
+        config: Per-stage concurrency settings (defaults to PipelineConfig())
+        registry: Run-level registry shared with other jobs for fetch and score dedup
+        run_state: Checkpoint store of the run; completed work recorded there is skipped
+        on_progress: Called with (event, details) as the job advances: "searched",
+            "scoring" after every scored micro-batch, and "ranked"
+        scheduler: Shares candidate slots and daily quotas with the other jobs of the run
+        incremental: Reuse and record versions of the job; False for a job whose lineage
+            another job of the same run already uses (see _claim_lineage)
         
     Returns:
         JobResult object with top candidates and scores
     """
+    config = config or PipelineConfig()
+    if run_state is not None:
+        stored_result = run_state.get_result(job)
+        if stored_result is not None:
+            print(f"Skipping job completed before resume: {job.title}")
+            return stored_result
     print(f"Processing job: {job.title}")
     
-    # Search for LinkedIn profiles
-    search_query = f"{job.title} {job.location} site:linkedin.com/in/"
-    profile_urls = search_linkedin_profiles(search_query)
+    store = get_incremental_store() if incremental else None
+    run_fp = _run_fingerprint(job, config)
+    previous = store.get_version(job) if store is not None else None
+    changed = changed_fields(previous.fingerprint, job_fingerprint(job)) if previous is not None else set()
+    if previous is not None and not changed and previous.result is not None and previous.run_fingerprint == run_fp:
+        print(f"Job unchanged since its last run, reusing its result: {job.title}")
+        get_metrics().inc("incremental_reuses_total", what="job")
+        if run_state is not None:
+            run_state.record_result(job, previous.result)
+        return previous.result
+    
+    # Find candidates: local talent pool first, topped up by a fan-out web search
+    profile_urls = run_state.get_search(job) if run_state is not None else None
+    if profile_urls is None:
+        if previous is not None and not changed & INCREMENTAL_RESEARCH_FIELDS:
+            print(f"Re-scoring the candidates of the previous version ({', '.join(sorted(changed))} changed)")
+            get_metrics().inc("incremental_reuses_total", what="search")
+            profile_urls = previous.urls
+        else:
+            with get_metrics().span("search"):
+                profile_urls = source_candidates(job)
+        if run_state is not None:
+            run_state.record_search(job, profile_urls)
     
+    if on_progress is not None:
+        on_progress("searched", {"profiles": len(profile_urls)})
     if not profile_urls:
+        # Not stored as a version: an empty search may just mean the search API was unavailable
         print("No LinkedIn profiles found")
         return JobResult(job_id=job.title, candidates_found=0, top_candidates=[])
     
     print(f"Found {len(profile_urls)} LinkedIn profiles")
+    if registry is not None:
+        registry.register(job, profile_urls)
     
-    # Fetch and score candidates
-    candidates = []
-    for i, url in enumerate(profile_urls):       
-        # Rate limiting
-        time.sleep(1)
-        
-        # Fetch profile data
-        profile_data = get_linkedin_profile(url)
-        if not profile_data:
-            continue
-        
-        # Get candidate name for logging
-        candidate_name = profile_data.get('full_name', 'Unknown')
-        print(f"Processing: {candidate_name} for job: {job.title}")
-        
-        # Score the candidate
-        scores = score_candidate(profile_data, job)
+    # The ticket stays open through outreach, whose tokens it keeps reserved
+    ticket = scheduler.register(job, len(profile_urls)) if scheduler is not None else None
+    try:
+        candidates, failed = score_profile_urls(profile_urls, job, config, registry, run_state, on_progress, ticket)
+        if failed:
+            print(f"{failed} of {len(profile_urls)} candidates could not be fetched or scored: {job.title}")
+        if ticket is not None and ticket.skipped:
+            print(f"Scheduler skipped {ticket.skipped} of {len(profile_urls)} candidates "
+                  f"(candidate budget or daily quota): {job.title}")
+        if on_progress is not None:
+            on_progress("ranked", {"candidates": len(candidates)})
+        previous_outreach = None
+        if previous is not None and previous.result is not None and not changed & INCREMENTAL_OUTREACH_FIELDS:
+            previous_outreach = {
+                candidate.linkedin_url: candidate.outreach_message
+                for candidate in previous.result.top_candidates
+                if candidate.outreach_message and candidate.outreach_message != OUTREACH_FAILED_MESSAGE
+            }
+        skipped = failed + (ticket.quota_skipped if ticket is not None else 0)
+        result = build_job_result(job, candidates, config, run_state, previous_outreach, skipped)
+    finally:
+        if ticket is not None:
+            ticket.close()
+        if registry is not None:
+            # URLs the pipeline never got to (e.g. after an error) are let go too
+            registry.release(job, profile_urls)
+    if run_state is not None:
+        run_state.record_result(job, result)
+    if result.skipped:
+        print(f"Partial result, {result.skipped} candidates left for a later run: {job.title}")
+    elif store is not None and not any(c.outreach_message == OUTREACH_FAILED_MESSAGE for c in result.top_candidates):
+        store.put_version(job, profile_urls, result, run_fp)
+    return result
+
+
+def _run_fingerprint(job: JobData, config: PipelineConfig) -> str:
+    """
+    Hash of the run settings a job's result depends on besides the job fields: the
+    scoring fingerprint (mode, model, prompts), the fit-score weights, top N, the
+    prefilter and the job's candidate budget.
+    """
+    data = {
+        "scoring": scoring_fingerprint(job),
+        "weights": SCORE_WEIGHTS,
+        "top_n": config.top_n,
+        "prefilter": asdict(config.prefilter),
+        "max_candidates": job.max_candidates if job.max_candidates is not None else SCHEDULER_CANDIDATES_PER_JOB,
+    }
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+def _claim_lineage(lineages: Dict[str, str], job: JobData) -> bool:
+    """
+    Record a job's lineage key for a run; False if a different job of the run already
+    has it (two ID-less JDs with the same title and location), in which case the job is
+    processed as a new job rather than as a version of the other.
+    """
+    fingerprint = json.dumps(job_fingerprint(job), sort_keys=True)
+    return lineages.setdefault(job_lineage_key(job), fingerprint) == fingerprint
+
+
+def score_profile_urls(profile_urls: List[str], job: JobData, config: Optional[PipelineConfig] = None,
+                       registry: Optional[CandidateRegistry] = None,
+                       run_state: Optional[RunState] = None,
+                       on_progress: Optional[ProgressCallback] = None,
+                       ticket: Optional[JobTicket] = None) -> Tuple[List[CandidateRecord], int]:
+    """
+    Fetch and score profiles for a job, concurrently (the fetch and score pipeline stages).
+    
+    Args:
+        profile_urls: Candidate profile URLs
+        job: Job the candidates are scored for
+        config: Per-stage concurrency settings (defaults to PipelineConfig())
+        registry: Run-level registry shared with other jobs for fetch and score dedup
+        run_state: Checkpoint store of the run
+        on_progress: Called with ("scoring", {"scored": n, "profiles": total}) after every micro-batch
+        ticket: The job's scheduler ticket; each profile is fetched only once it is admitted
         
-        # Create candidate object
-        candidate = TopCandidate(
-            name=profile_data.get('full_name', 'Unknown'),
-            linkedin_url=url,
-            fit_score=scores.fit_score,
-            score_breakdown=ScoreBreakdown(
-                education=scores.education_score,
-                trajectory=scores.career_trajectory_score,
-                company=scores.company_relevance_score,
-                skills=scores.experience_match_score,
-                location=scores.location_match_score,
-                tenure=scores.tenure_score
-            )
-        )
+    Returns:
+        (candidates, failed): scored candidates, unsorted (profiles that failed to fetch,
+        were dropped or were not admitted are left out), and the number of profiles
+        whose fetch or scoring failed
+    """
+    config = config or PipelineConfig()
+    scored = 0
+    failed = 0
+    scored_lock = threading.Lock()
+    
+    def count_failed(count: int) -> None:
+        nonlocal failed
+        with scored_lock:
+            failed += count
+    
+    def score(items: List[Tuple[str, Dict[str, Any]]]) -> List[Optional[CandidateRecord]]:
+        nonlocal scored
+        try:
+            results, score_failures = _score_profiles(items, job, config.prefilter, registry, run_state)
+        except Exception:
+            # The stage retries a failed batch one item at a time, and those calls finish them
+            if len(items) == 1:
+                count_failed(1)
+                if ticket is not None:
+                    ticket.finish()
+            raise
+        finally:
+            if registry is not None:
+                registry.release(job, [url for url, _ in items])
+        if ticket is not None:
+            ticket.finish(len(items))
+        if score_failures:
+            count_failed(score_failures)
+        if on_progress is not None:
+            with scored_lock:
+                scored += len(items)
+                on_progress("scoring", {"scored": scored, "profiles": len(profile_urls)})
+        return results
+    
+    def fetch(url: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        fetched = None
+        admitted = False
+        try:
+            admitted = ticket is None or ticket.admit()
+            if admitted:
+                fetched = _fetch_profile(url, job, registry, run_state)
+            return fetched
+        finally:
+            if admitted and fetched is None:
+                count_failed(1)
+            if ticket is not None and admitted:
+                ticket.release()
+                if fetched is None:
+                    ticket.finish()
+            if fetched is None and registry is not None:
+                registry.release(job, [url])
+    
+    candidates = run_pipeline(
+        profile_urls,
+        [
+            ("fetch", fetch, config.fetch_workers),
+            ("score", score, config.score_workers, config.score_batch_size),
+        ],
+        queue_size=config.queue_size
+    )
+    return candidates, failed
+
+
+def build_job_result(job: JobData, candidates: List[CandidateRecord], config: Optional[PipelineConfig] = None,
+                     run_state: Optional[RunState] = None,
+                     previous_outreach: Optional[Dict[str, str]] = None,
+                     skipped: int = 0) -> JobResult:
+    """
+    Rank a job's scored candidates and write outreach messages for the top ones.
+    
+    The candidates stay lightweight records until here; the JobResult is their only
+    validation on the way out.
+    
+    Args:
+        job: Job the candidates were scored for
+        candidates: Scored candidates (sorted in place)
+        config: top_n and outreach concurrency (defaults to PipelineConfig())
+        run_state: Checkpoint store of the run; outreach written before a crash is reused
+        previous_outreach: Messages written for an earlier version of the job, by profile
+            URL; candidates found there keep their message
+        skipped: Candidates left out, making the result partial (see JobResult.skipped)
         
-        candidates.append(candidate)
+    Returns:
+        JobResult with the top candidates and all candidates
+    """
+    config = config or PipelineConfig()
     
-    # Sort by fit score and take top 5
-    candidates.sort(key=lambda x: x.fit_score, reverse=True)
-    top_candidates = candidates[:5]
+    # Sort by fit score and take top N
+    rank_candidates(candidates)
+    top_candidates = candidates[:config.top_n]
     
     # Generate outreach messages for top candidates only
-    for candidate in top_candidates:
-        try:
-            message = generate_outreach_message(candidate, job)
-            candidate.outreach_message = message
-        except Exception as e:
-            print(f"Error generating outreach message: {e}")
-            candidate.outreach_message = "Unable to generate personalized message."
+    if top_candidates:
+        with ThreadPoolExecutor(max_workers=max(1, config.outreach_workers)) as executor:
+            list(executor.map(lambda candidate: _add_outreach(candidate, job, run_state, previous_outreach),
+                              top_candidates))
     
     # Set empty outreach messages for all other candidates
-    for candidate in candidates[5:]:
+    for candidate in candidates[config.top_n:]:
         candidate.outreach_message = ""
     
-    return JobResult(
-        job_id=job.title,
-        candidates_found=len(candidates),
-        top_candidates=top_candidates,
-        all_candidates=candidates
-    )
+    return to_job_result(job.title, candidates, config.top_n, skipped)
 
 
-def process_all_jobs(jobs: List[JobData], max_workers: int = 3) -> FinalResults:
+def process_all_jobs(jobs: Iterable[JobData], max_workers: int = 3,
+                     config: Optional[PipelineConfig] = None,
+                     share_candidates: bool = True,
+                     on_result: Optional[Callable[[JobResult], None]] = None,
+                     keep_results: bool = True,
+                     run_state: Optional[RunState] = None,
+                     scheduler: Optional[Scheduler] = None) -> FinalResults:
     """
     Process all jobs concurrently and return comprehensive results.
     
+    Jobs may be a lazy iterator (e.g. iter_job_descriptions()): each job is submitted
+    as soon as it is produced, so processing starts before the last JD is parsed.
+    Whenever a worker frees up it starts the highest-priority job waiting (in arrival
+    order among equal priorities), and the scheduler interleaves the candidates of the
+    running jobs and keeps them within their candidate budgets and the daily quotas.
+    
     Args:
-        jobs: List of JobData objects to process
+        jobs: JobData objects to process (list or iterator)
         max_workers: Maximum number of concurrent jobs to process (default: 3)
+        config: Per-stage concurrency used inside each job
+        share_candidates: Fetch each profile once per run and score profiles that
+            several jobs found against all of them in one request
+        on_result: Called with every JobResult (including failed ones) as soon as
+            its job finishes, e.g. ResultWriter.write
+        keep_results: Keep results in memory; pass False together with on_result
+            to stream results out and keep memory flat
+        run_state: Checkpoint store; pass a resumed run to skip completed work
+        scheduler: Candidate scheduler (defaults to one with SCHEDULER_CONCURRENCY slots,
+            or max_workers x fetch workers)
         
     Returns:
-        FinalResults object containing all job results
+        FinalResults object containing all job results (empty if keep_results is False)
     """
     results = []
     completed_jobs = 0
+    registry = CandidateRegistry() if share_candidates else None
+    config = config or PipelineConfig()
+    scheduler = scheduler or Scheduler(SCHEDULER_CONCURRENCY or max_workers * config.fetch_workers)
+    # Jobs not started yet, as (-priority, arrival, job, incremental); every submitted task runs the best one
+    waiting: List[Tuple[int, int, JobData, bool]] = []
+    waiting_lock = threading.Lock()
+    lineages: Dict[str, str] = {}
     
     print(f"Starting concurrent processing with {max_workers} workers...")
     
+    def run_next() -> Tuple[JobData, Any]:
+        with waiting_lock:
+            _, _, job, incremental = heapq.heappop(waiting)
+        try:
+            return job, process_job(job, config, registry, run_state, scheduler=scheduler, incremental=incremental)
+        except Exception as e:
+            return job, e
+    
+    def handle_completed(future) -> None:
+        nonlocal completed_jobs
+        completed_jobs += 1
+        job, result = future.result()
+        
+        if isinstance(result, Exception):
+            print(f"\nError processing job {job.title}: {result}")
+            # Create a failed result
+            result = JobResult(
+                job_id=job.title,
+                candidates_found=0,
+                top_candidates=[],
+                error=f"Processing failed: {str(result)}"
+            )
+        else:
+            # Summary for this job
+            print(f"\nCompleted job {completed_jobs}/{submitted_jobs}: {job.title}")
+            print(f"Candidates found: {result.candidates_found}")
+            if result.top_candidates:
+                print(f"Top candidate score: {result.top_candidates[0].fit_score:.1f}/10")
+            print("-" * 50)
+        
+        if on_result is not None:
+            on_result(result)
+        if keep_results:
+            results.append(result)
+    
     # Use ThreadPoolExecutor for concurrent processing
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all jobs to the executor
-        future_to_job = {executor.submit(process_job, job): job for job in jobs}
+        futures = set()
+        submitted_jobs = 0
         
-        # Process completed jobs as they finish
-        for future in as_completed(future_to_job):
-            job = future_to_job[future]
-            completed_jobs += 1
-            
-            try:
-                result = future.result()
-                results.append(result)
-                
-                # Summary for this job
-                print(f"\nCompleted job {completed_jobs}/{len(jobs)}: {job.title}")
-                print(f"Candidates found: {result.candidates_found}")
-                if result.top_candidates:
-                    print(f"Top candidate score: {result.top_candidates[0].fit_score:.1f}/10")
-                print("-" * 50)
-                
-            except Exception as e:
-                print(f"\nError processing job {job.title}: {e}")
-                # Create a failed result
-                failed_result = JobResult(
-                    job_id=job.title,
-                    candidates_found=0,
-                    top_candidates=[],
-                    error=f"Processing failed: {str(e)}"
-                )
-                results.append(failed_result)
-    
-    print(f"\nConcurrent processing complete! Processed {len(results)} jobs.")
+        # Submit jobs as they arrive, reporting any that finished in the meantime
+        for job in jobs:
+            incremental = _claim_lineage(lineages, job)
+            with waiting_lock:
+                heapq.heappush(waiting, (-job.priority, submitted_jobs, job, incremental))
+            futures.add(executor.submit(run_next))
+            submitted_jobs += 1
+            for future in [f for f in futures if f.done()]:
+                futures.discard(future)
+                handle_completed(future)
+        
+        # Process the remaining jobs as they finish
+        for future in as_completed(list(futures)):
+            handle_completed(future)
+    
+    print(f"\nConcurrent processing complete! Processed {completed_jobs} jobs.")
+    quota = scheduler.stats()["quota"]
+    if any(usage["limit"] for usage in quota.values()):
+        print(f"Daily quota usage: {quota}")
+    if registry is not None:
+        print(f"Candidate registry: {registry.stats_dict()}")
     return FinalResults(results)
 
 
-def process_all_jobs_sequential(jobs: List[JobData]) -> FinalResults:
+def process_all_jobs_sequential(jobs: Iterable[JobData],
+                                config: Optional[PipelineConfig] = None,
+                                on_result: Optional[Callable[[JobResult], None]] = None,
+                                keep_results: bool = True,
+                                run_state: Optional[RunState] = None) -> FinalResults:
     """
     Process all jobs sequentially (original implementation).
     Kept for comparison or when concurrent processing is not desired.
     
     Args:
-        jobs: List of JobData objects to process
+        jobs: JobData objects to process (list or iterator)
+        config: Per-stage concurrency used inside each job
+        on_result: Called with every JobResult as soon as its job finishes
+        keep_results: Keep results in memory (see process_all_jobs)
+        run_state: Checkpoint store; pass a resumed run to skip completed work
         
     Returns:
-        FinalResults object containing all job results
+        FinalResults object containing all job results (empty if keep_results is False)
     """
     results = []
+    # Sequential jobs can't share scoring requests, but still fetch each profile once
+    registry = CandidateRegistry()
+    lineages: Dict[str, str] = {}
     
     for i, job in enumerate(jobs):
-        print(f"\nProcessing job {i+1}/{len(jobs)}")
-        result = process_job(job)
-        results.append(result)
+        print(f"\nProcessing job {i+1}")
+        result = process_job(job, config, registry, run_state, incremental=_claim_lineage(lineages, job))
+        if on_result is not None:
+            on_result(result)
+        if keep_results:
+            results.append(result)
         
         # Summary for this job
         print(f"Job: {job.title}")
@@ -0,0 +1,100 @@
+from operator import attrgetter
+from typing import Any, Dict, List, Optional, Tuple
+from ..data.models import CandidateScores, JobResult, TopCandidate
+
+# ScoreBreakdown fields, in the order of CandidateRecord.breakdown
+BREAKDOWN_FIELDS = ("education", "trajectory", "company", "skills", "location", "tenure")
+# CandidateScores fields feeding each breakdown field
+_SCORE_FIELDS = (
+    "education_score", "career_trajectory_score", "company_relevance_score",
+    "experience_match_score", "location_match_score", "tenure_score",
+)
+
+_fit_score = attrgetter("fit_score")
+
+
+class CandidateRecord:
+    """
+    Scored candidate as it moves through a job: plain slots, no validation.
+
+    Scores are validated once when they come out of the scorer (CandidateScores) and
+    the records are validated again, in one go, when they leave as a JobResult
+    (to_job_result), so the per-candidate work in between is just attribute access.
+    The dict form (to_dict / from_dict) matches TopCandidate.model_dump().
+    """
+    __slots__ = ("name", "linkedin_url", "fit_score", "breakdown", "outreach_message")
+
+    def __init__(self, name: str, linkedin_url: str, fit_score: float,
+                 breakdown: Tuple[float, ...], outreach_message: Optional[str] = None):
+        self.name = name
+        self.linkedin_url = linkedin_url
+        self.fit_score = fit_score
+        self.breakdown = breakdown
+        self.outreach_message = outreach_message
+
+    @classmethod
+    def from_scores(cls, url: str, profile: Dict[str, Any], scores: CandidateScores) -> "CandidateRecord":
+        """Record for a scored profile"""
+        return cls(
+            profile.get("full_name") or "Unknown",
+            url,
+            scores.fit_score,
+            tuple(getattr(scores, field) for field in _SCORE_FIELDS),
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CandidateRecord":
+        """Record from a dict written by to_dict() (or TopCandidate.model_dump())"""
+        breakdown = data["score_breakdown"]
+        return cls(
+            data["name"],
+            data["linkedin_url"],
+            data["fit_score"],
+            tuple(breakdown[field] for field in BREAKDOWN_FIELDS),
+            data.get("outreach_message"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready form, shaped like TopCandidate.model_dump()"""
+        return {
+            "name": self.name,
+            "linkedin_url": self.linkedin_url,
+            "fit_score": self.fit_score,
+            "score_breakdown": dict(zip(BREAKDOWN_FIELDS, self.breakdown)),
+            "outreach_message": self.outreach_message,
+        }
+
+    def to_model(self) -> TopCandidate:
+        """Validated TopCandidate"""
+        return TopCandidate.model_validate(self.to_dict())
+
+    def __repr__(self) -> str:
+        return f"CandidateRecord({self.name!r}, {self.linkedin_url!r}, fit_score={self.fit_score})"
+
+
+def rank_candidates(records: List[CandidateRecord]) -> None:
+    """Sort records by fit score, best first (stable, in place)"""
+    records.sort(key=_fit_score, reverse=True)
+
+
+def to_job_result(job_id: str, records: List[CandidateRecord], top_n: int, skipped: int = 0) -> JobResult:
+    """
+    Validate ranked records into a JobResult in a single model_validate call.
+
+    Args:
+        job_id: Job the candidates were scored for
+        records: Candidates, ranked best first
+        top_n: Number of leading records that are the top candidates
+        skipped: Candidates left out of a partial result (see JobResult.skipped)
+
+    Returns:
+        JobResult with the top candidates and all candidates
+    """
+    candidates = [record.to_dict() for record in records]
+    return JobResult.model_validate({
+        "job_id": job_id,
+        "candidates_found": len(candidates),
+        "top_candidates": candidates[:top_n],
+        "all_candidates": candidates,
+        "skipped": skipped,
+    })
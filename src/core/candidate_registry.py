@@ -0,0 +1,198 @@
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional, Tuple
+from ..data.models import JobData, CandidateScores
+from ..services.api_client import get_linkedin_profile
+from ..services.urls import canonicalize_linkedin_url
+from .scorer import score_candidates, score_candidate_multi_job
+
+
+def job_key(job: JobData) -> str:
+    """Identity of a job within a run (two JDs with the same title are still different jobs)"""
+    return job.model_dump_json()
+
+
+@dataclass
+class RegistryStats:
+    profile_fetches: int = 0
+    profile_reuses: int = 0
+    single_job_scores: int = 0
+    multi_job_requests: int = 0
+    multi_job_scores: int = 0
+    score_reuses: int = 0
+
+
+class CandidateRegistry:
+    """
+    Run-level registry shared by every job worker.
+
+    Each unique profile URL is fetched once per run no matter how many jobs found it.
+    When a profile is first scored, it is scored in one LLM request against every job
+    that has asked for its LLM scores by then (jobs that prefilter the profile out,
+    reuse stored scores or skip it never ask); jobs asking later score it on their own,
+    and jobs already covered reuse those scores.
+
+    A profile is kept only while a job that registered its URL still has to score it:
+    once every such job has released the URL, the profile and its scores are dropped,
+    so the registry holds the profiles in flight rather than every profile of the run.
+    Failed fetches are not kept, so the next job asking retries them.
+    """
+
+    def __init__(self):
+        self.stats = RegistryStats()
+        self._lock = threading.Lock()
+        self._jobs_by_url: Dict[str, Dict[str, JobData]] = {}
+        # canonical URL -> jobs that asked for its LLM scores (see score_many)
+        self._wanted: Dict[str, Dict[str, JobData]] = {}
+        self._profiles: Dict[str, Future] = {}
+        # canonical URL -> job key -> scores future
+        self._scores: Dict[str, Dict[str, Future]] = {}
+
+    def register(self, job: JobData, urls: List[str]) -> None:
+        """
+        Record that a job's search returned these profile URLs.
+
+        Args:
+            job: The job that searched
+            urls: Profile URLs from the search
+        """
+        key = job_key(job)
+        with self._lock:
+            for url in urls:
+                self._jobs_by_url.setdefault(canonicalize_linkedin_url(url), {})[key] = job
+
+    def release(self, job: JobData, urls: List[str]) -> None:
+        """
+        Record that a job is done with these profile URLs (scored, skipped or failed);
+        a profile no registered job still needs is dropped.
+
+        Args:
+            job: The job that registered the URLs
+            urls: Profile URLs it no longer needs (releasing one twice is harmless)
+        """
+        key = job_key(job)
+        with self._lock:
+            for url in urls:
+                canonical = canonicalize_linkedin_url(url)
+                jobs = self._jobs_by_url.get(canonical)
+                if jobs is None:
+                    continue
+                jobs.pop(key, None)
+                self._wanted.get(canonical, {}).pop(key, None)
+                if not jobs:
+                    del self._jobs_by_url[canonical]
+                    self._profiles.pop(canonical, None)
+                    self._scores.pop(canonical, None)
+                    self._wanted.pop(canonical, None)
+
+    def get_profile(self, url: str) -> Dict[str, Any]:
+        """
+        Fetch a profile, or wait for the fetch another job already started.
+
+        Args:
+            url: LinkedIn profile URL
+
+        Returns:
+            Profile data ({} if the fetch failed)
+        """
+        canonical = canonicalize_linkedin_url(url)
+        with self._lock:
+            future = self._profiles.get(canonical)
+            owner = future is None
+            if owner:
+                future = self._profiles[canonical] = Future()
+                self.stats.profile_fetches += 1
+            else:
+                self.stats.profile_reuses += 1
+
+        if owner:
+            profile = None
+            try:
+                profile = get_linkedin_profile(url)
+                future.set_result(profile)
+            except Exception as e:
+                future.set_exception(e)
+            if not profile:
+                # Jobs already waiting share the failure; later ones fetch again
+                with self._lock:
+                    if self._profiles.get(canonical) is future:
+                        del self._profiles[canonical]
+        return future.result()
+
+    def _claim(self, canonical: str, job: JobData) -> Tuple[Future, List[JobData]]:
+        """
+        Find the scoring future for (profile, job), creating one that also covers every
+        other job that asked for the profile's LLM scores and has none yet. Returns
+        (future, jobs to score) where jobs is empty if another worker owns the future.
+        """
+        key = job_key(job)
+        with self._lock:
+            scores = self._scores.setdefault(canonical, {})
+            future = scores.get(key)
+            if future is not None:
+                self.stats.score_reuses += 1
+                return future, []
+            self._jobs_by_url.setdefault(canonical, {}).setdefault(key, job)
+            jobs = [job] + [
+                other for other_key, other in self._wanted.get(canonical, {}).items()
+                if other_key != key and other_key not in scores
+            ]
+            future = Future()
+            for covered in jobs:
+                scores[job_key(covered)] = future
+            return future, jobs
+
+    def score_many(self, items: List[Tuple[str, Dict[str, Any]]], job: JobData) -> List[Optional[CandidateScores]]:
+        """
+        Score fetched profiles for a job, reusing or sharing work with the other jobs.
+
+        Callers pass only the profiles the job decided to score with the LLM. Profiles no
+        other waiting job asked for are scored together with score_candidates; profiles
+        several jobs asked for are scored against all of them with one request each.
+
+        Args:
+            items: (url, profile) pairs
+            job: The job asking for scores
+
+        Returns:
+            CandidateScores per item, in input order (None where scoring failed)
+        """
+        key = job_key(job)
+        canonicals = [canonicalize_linkedin_url(url) for url, _ in items]
+        with self._lock:
+            for canonical in canonicals:
+                self._wanted.setdefault(canonical, {})[key] = job
+        claims = [self._claim(canonical, job) for canonical in canonicals]
+
+        single = [i for i, (_, jobs) in enumerate(claims) if len(jobs) == 1]
+        multi = [i for i, (_, jobs) in enumerate(claims) if len(jobs) > 1]
+
+        if single:
+            try:
+                scores = score_candidates([items[i][1] for i in single], job)
+                for i, candidate_scores in zip(single, scores):
+                    claims[i][0].set_result({key: candidate_scores})
+            except Exception as e:
+                for i in single:
+                    claims[i][0].set_exception(e)
+            with self._lock:
+                self.stats.single_job_scores += len(single)
+
+        for i in multi:
+            future, jobs = claims[i]
+            try:
+                scores = score_candidate_multi_job(items[i][1], jobs)
+                future.set_result({job_key(covered): s for covered, s in zip(jobs, scores)})
+            except Exception as e:
+                future.set_exception(e)
+            with self._lock:
+                self.stats.multi_job_requests += 1
+                self.stats.multi_job_scores += len(jobs)
+
+        return [future.result()[key] for future, _ in claims]
+
+    def stats_dict(self) -> Dict[str, int]:
+        """Stats snapshot for logging"""
+        with self._lock:
+            return asdict(self.stats)
@@ -0,0 +1,192 @@
+import os
+import sys
+import time
+import uuid
+import socket
+import threading
+import subprocess
+from typing import Callable, Iterable, List, Optional
+from ..data.models import JobData, JobResult, FinalResults
+from ..services.metrics import get_metrics
+from .candidate_processor import score_profile_urls, build_job_result
+from .candidate_records import CandidateRecord
+from .pipeline import PipelineConfig
+from .run_state import new_run_id
+from .search import source_candidates
+from .work_queue import WorkQueue, Task, DONE, FAILED
+
+# Profile URLs per candidate task
+WORK_QUEUE_CHUNK_SIZE = int(os.environ.get("WORK_QUEUE_CHUNK_SIZE", "20"))
+WORKER_POLL_SECONDS = float(os.environ.get("WORKER_POLL_SECONDS", "1.0"))
+
+# Task kinds: a job task searches and splits the candidates into candidate tasks, which
+# fetch and score them; the finalize task ranks them and writes outreach
+JOB_TASK = "job"
+CANDIDATES_TASK = "candidates"
+FINALIZE_TASK = "finalize"
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def enqueue_jobs(queue: WorkQueue, jobs: Iterable[JobData], queue_id: Optional[str] = None) -> str:
+    """
+    Add one job task per job.
+
+    Args:
+        queue: Work queue shared with the workers
+        jobs: Jobs to process (list or iterator)
+        queue_id: Queue to add them to (a new id if None)
+
+    Returns:
+        The queue id, to pass to run_worker() and collect_results()
+    """
+    queue_id = queue_id or new_run_id()
+    for job in jobs:
+        queue.enqueue(queue_id, JOB_TASK, {"job": job.model_dump()})
+    return queue_id
+
+
+def _run_job_task(queue: WorkQueue, task: Task, config: PipelineConfig) -> bool:
+    job = JobData.model_validate(task.payload["job"])
+    with get_metrics().span("search"):
+        urls = source_candidates(job)
+    print(f"Found {len(urls)} LinkedIn profiles for job: {job.title}")
+    chunk_size = max(1, WORK_QUEUE_CHUNK_SIZE)
+    children = [
+        (CANDIDATES_TASK, {"job": task.payload["job"], "urls": urls[start:start + chunk_size]})
+        for start in range(0, len(urls), chunk_size)
+    ]
+    return queue.complete(task, {"urls": len(urls)}, children=children,
+                          follow_up=(FINALIZE_TASK, {"job": task.payload["job"]}))
+
+
+def _run_candidates_task(queue: WorkQueue, task: Task, config: PipelineConfig) -> bool:
+    job = JobData.model_validate(task.payload["job"])
+    candidates, _ = score_profile_urls(task.payload["urls"], job, config)
+    return queue.complete(task, [candidate.to_dict() for candidate in candidates])
+
+
+def _run_finalize_task(queue: WorkQueue, task: Task, config: PipelineConfig) -> bool:
+    job = JobData.model_validate(task.payload["job"])
+    chunks = queue.tasks(task.queue_id, CANDIDATES_TASK, task.parent_id)
+    failed = sum(1 for chunk in chunks if chunk.status == FAILED)
+    if failed:
+        print(f"{failed}/{len(chunks)} candidate tasks failed for job: {job.title}")
+    candidates = [
+        CandidateRecord.from_dict(candidate)
+        for chunk in chunks if chunk.status == DONE
+        for candidate in chunk.result or []
+    ]
+    result = build_job_result(job, candidates, config)
+    return queue.complete(task, result.model_dump())
+
+
+_HANDLERS = {
+    JOB_TASK: _run_job_task,
+    CANDIDATES_TASK: _run_candidates_task,
+    FINALIZE_TASK: _run_finalize_task,
+}
+
+
+def _keep_leased(queue: WorkQueue, task: Task, stop: threading.Event) -> None:
+    """Heartbeat thread: renew the lease at a third of its length until stopped"""
+    while not stop.wait(queue.lease_seconds / 3):
+        if not queue.heartbeat(task):
+            print(f"Lost the lease on task {task.id}; its result will be discarded")
+            return
+
+
+def run_task(queue: WorkQueue, task: Task, config: Optional[PipelineConfig] = None) -> bool:
+    """
+    Process one claimed task, heartbeating while it runs.
+
+    Returns:
+        True if the task completed and its result was recorded
+    """
+    config = config or PipelineConfig()
+    stop = threading.Event()
+    heartbeat = threading.Thread(target=_keep_leased, args=(queue, task, stop), daemon=True)
+    heartbeat.start()
+    try:
+        return _HANDLERS[task.kind](queue, task, config)
+    except Exception as e:
+        print(f"Task {task.id} ({task.kind}) failed on attempt {task.attempts}: {e}")
+        queue.fail(task, f"{type(e).__name__}: {e}")
+        return False
+    finally:
+        stop.set()
+        heartbeat.join()
+
+
+def run_worker(queue_id: Optional[str] = None, queue: Optional[WorkQueue] = None,
+               worker_id: Optional[str] = None, config: Optional[PipelineConfig] = None,
+               forever: bool = False, poll_seconds: float = WORKER_POLL_SECONDS) -> int:
+    """
+    Claim and process tasks until the queue is drained.
+
+    Any number of workers, in any number of processes or machines sharing the queue
+    file, can run at once. A worker keeps polling while other workers hold leases, so
+    it can take over tasks whose worker died.
+
+    Args:
+        queue_id: Queue to work on (None works on every queue, see forever)
+        queue: Work queue (defaults to WorkQueue())
+        worker_id: Unique id of this worker (defaults to host-pid-random)
+        config: Per-stage concurrency inside each task
+        forever: Keep polling after the queue is drained (always the case without a queue_id)
+        poll_seconds: Wait between claims when nothing is available
+
+    Returns:
+        Number of tasks this worker completed
+    """
+    queue = queue or WorkQueue()
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+    completed = 0
+    while True:
+        task = queue.claim(worker_id, queue_id)
+        if task is None:
+            if not forever and queue_id is not None and queue.is_drained(queue_id):
+                return completed
+            time.sleep(poll_seconds)
+            continue
+        if run_task(queue, task, config):
+            completed += 1
+
+
+def spawn_local_workers(queue_id: str, count: int) -> List[subprocess.Popen]:
+    """Start count worker processes (worker.py) on this machine for a queue"""
+    return [
+        subprocess.Popen([sys.executable, os.path.join(ROOT, "worker.py"), "--queue", queue_id], cwd=ROOT)
+        for _ in range(max(1, count))
+    ]
+
+
+def wait_until_drained(queue: WorkQueue, queue_id: str, poll_seconds: float = WORKER_POLL_SECONDS,
+                       on_progress: Optional[Callable[[dict], None]] = None) -> None:
+    """Block until no task of the queue is pending or leased"""
+    last = None
+    while not queue.is_drained(queue_id):
+        counts = queue.counts(queue_id)
+        if on_progress is not None and counts != last:
+            on_progress(counts)
+            last = counts
+        time.sleep(poll_seconds)
+
+
+def collect_results(queue: WorkQueue, queue_id: str) -> FinalResults:
+    """
+    Merge a drained queue's job results, in the order the jobs were enqueued.
+
+    Jobs whose search or finalize task failed get a JobResult with an error.
+    """
+    results = []
+    for job_task in queue.tasks(queue_id, JOB_TASK):
+        title = job_task.payload["job"]["title"]
+        finalize = queue.tasks(queue_id, FINALIZE_TASK, job_task.id)
+        if finalize and finalize[0].status == DONE:
+            results.append(JobResult.model_validate(finalize[0].result))
+            continue
+        error = (finalize[0].error if finalize else job_task.error) or f"Task {job_task.status}"
+        results.append(JobResult(job_id=title, candidates_found=0, top_candidates=[],
+                                 error=f"Processing failed: {error}"))
+    return FinalResults(results)
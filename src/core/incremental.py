@@ -0,0 +1,211 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+from ..data.models import JobData, JobResult, CandidateScores
+from ..services.urls import canonicalize_linkedin_url
+
+INCREMENTAL_ENABLED = os.environ.get("INCREMENTAL_ENABLED", "true").lower() not in ("0", "false", "no")
+INCREMENTAL_PATH = os.environ.get("INCREMENTAL_PATH", ".cache/incremental.sqlite3")
+# Stored job versions and candidate scores older than this are recomputed (0 or less keeps them forever)
+INCREMENTAL_MAX_AGE_HOURS = float(os.environ.get("INCREMENTAL_MAX_AGE_HOURS", "24"))
+# Job fields whose change re-runs the candidate search; other changes re-score the
+# candidates found for the previous version
+INCREMENTAL_RESEARCH_FIELDS = frozenset(
+    field.strip() for field in os.environ.get("INCREMENTAL_RESEARCH_FIELDS", "title,keywords").split(",") if field.strip()
+)
+# Job fields whose change rewrites outreach for candidates that stay in the top N
+INCREMENTAL_OUTREACH_FIELDS = frozenset(
+    field.strip() for field in os.environ.get("INCREMENTAL_OUTREACH_FIELDS", "title").split(",") if field.strip()
+)
+
+# JobData fields covered by the fingerprint (id only names the job, it is not part of it)
+FINGERPRINT_FIELDS = ("title", "location", "experience_level", "keywords")
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def _normalize(text: Optional[str]) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def job_lineage_key(job: JobData) -> str:
+    """
+    Key shared by all versions of a job: its requisition ID, or its title and location
+    for JDs without one (so same-titled openings in different cities stay apart, and a
+    retitled or relocated job without an ID is a new job).
+    """
+    if job.id:
+        return f"id:{job.id.strip().lower()}"
+    return f"title:{_normalize(job.title)}|location:{_normalize(job.location)}"
+
+
+def job_fingerprint(job: JobData) -> Dict[str, str]:
+    """
+    Per-field hashes of a job, insensitive to case, whitespace and keyword order.
+
+    Returns:
+        Dict mapping each field of FINGERPRINT_FIELDS to the hash of its normalized value
+    """
+    return {
+        "title": _digest(_normalize(job.title)),
+        "location": _digest(_normalize(job.location)),
+        "experience_level": _digest(_normalize(job.experience_level)),
+        "keywords": _digest(sorted({_normalize(keyword) for keyword in job.keywords if keyword.strip()})),
+    }
+
+
+def changed_fields(old: Dict[str, str], new: Dict[str, str]) -> Set[str]:
+    """Fields whose hash differs between two job fingerprints"""
+    return {field for field in FINGERPRINT_FIELDS if old.get(field) != new.get(field)}
+
+
+def profile_digest(profile: Dict[str, Any]) -> str:
+    """Hash of a profile's data, so stored scores are dropped when the profile changes"""
+    return _digest(profile)
+
+
+@dataclass
+class JobVersion:
+    """Last processed version of a job"""
+    fingerprint: Dict[str, str]
+    job: JobData
+    urls: List[str]
+    result: Optional[JobResult]
+    updated_at: float
+    # Hash of the run settings the result was produced with; the result is only reused under the same ones
+    run_fingerprint: Optional[str] = None
+
+
+class IncrementalStore:
+    """
+    Scores and results kept across runs so an edited job only recomputes what its edit affects.
+
+    Candidate scores are stored per (profile URL, scoring fingerprint), where the scoring
+    fingerprint covers exactly the job fields, model and prompt that went into the LLM
+    scores (see scorer.scoring_fingerprint). Job versions are stored per lineage key
+    (requisition ID, or title and location) with their field fingerprint, the run
+    settings fingerprint, candidate URLs and result.
+    """
+
+    def __init__(self, path: str = INCREMENTAL_PATH, max_age_seconds: float = INCREMENTAL_MAX_AGE_HOURS * 3600):
+        """
+        Args:
+            path: SQLite file holding the store (":memory:" for a throwaway store)
+            max_age_seconds: Entries older than this are ignored (0 or less keeps them forever)
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS profile_scores (
+                url TEXT NOT NULL,
+                scoring_fp TEXT NOT NULL,
+                profile_digest TEXT NOT NULL,
+                scores TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (url, scoring_fp)
+            );
+            CREATE TABLE IF NOT EXISTS job_versions (
+                job_key TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                job TEXT NOT NULL,
+                urls TEXT NOT NULL,
+                result TEXT,
+                updated_at REAL NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def _min_updated_at(self) -> float:
+        return time.time() - self.max_age_seconds if self.max_age_seconds > 0 else 0.0
+
+    def get_scores(self, url: str, scoring_fp: str, profile: Dict[str, Any]) -> Optional[CandidateScores]:
+        """Scores stored for this profile and scoring fingerprint, or None if missing, stale or the profile changed"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT profile_digest, scores FROM profile_scores WHERE url = ? AND scoring_fp = ? AND updated_at >= ?",
+                (canonicalize_linkedin_url(url), scoring_fp, self._min_updated_at())
+            ).fetchone()
+        if row is None or row[0] != profile_digest(profile):
+            return None
+        return CandidateScores.model_validate_json(row[1])
+
+    def put_scores(self, url: str, scoring_fp: str, profile: Dict[str, Any], scores: CandidateScores) -> None:
+        """Store LLM-derived scores of a profile under a scoring fingerprint"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO profile_scores (url, scoring_fp, profile_digest, scores, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (canonicalize_linkedin_url(url), scoring_fp, profile_digest(profile), scores.model_dump_json(), time.time())
+            )
+            self._conn.commit()
+
+    def get_version(self, job: JobData) -> Optional[JobVersion]:
+        """Last processed version of the job's lineage, or None if there is none or it is stale"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint, job, urls, result, updated_at FROM job_versions WHERE job_key = ? AND updated_at >= ?",
+                (job_lineage_key(job), self._min_updated_at())
+            ).fetchone()
+        if row is None:
+            return None
+        fingerprint, stored_job, urls, result, updated_at = row
+        fingerprint = json.loads(fingerprint)
+        return JobVersion(
+            run_fingerprint=fingerprint.pop("run", None),
+            fingerprint=fingerprint,
+            job=JobData.model_validate_json(stored_job),
+            urls=json.loads(urls),
+            result=JobResult.model_validate_json(result) if result else None,
+            updated_at=updated_at,
+        )
+
+    def put_version(self, job: JobData, urls: List[str], result: Optional[JobResult],
+                    run_fingerprint: Optional[str] = None) -> None:
+        """
+        Record the processed version of a job, replacing the previous one of its lineage.
+        Only complete results should be recorded: a stored result is returned as is.
+
+        Args:
+            job: The job
+            urls: Candidate URLs its search returned
+            result: Its complete result
+            run_fingerprint: Hash of the run settings the result depends on
+        """
+        # Kept with the field hashes; changed_fields() only compares FINGERPRINT_FIELDS
+        fingerprint = {**job_fingerprint(job), "run": run_fingerprint}
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO job_versions (job_key, fingerprint, job, urls, result, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_lineage_key(job), json.dumps(fingerprint), job.model_dump_json(), json.dumps(urls),
+                 result.model_dump_json() if result is not None else None, time.time())
+            )
+            self._conn.commit()
+
+
+_default_store: Optional[IncrementalStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_incremental_store() -> Optional[IncrementalStore]:
+    """Return the process-wide incremental store, or None if it is disabled"""
+    global _default_store
+    if not INCREMENTAL_ENABLED:
+        return None
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = IncrementalStore()
+        return _default_store
@@ -0,0 +1,271 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
+from ..data.models import JobData, CandidateScores
+from .prefilter import experience_years
+
+# Weights of the fit score, as documented in the scoring prompts
+SCORE_WEIGHTS = {
+    "education_score": 0.20,
+    "career_trajectory_score": 0.20,
+    "company_relevance_score": 0.15,
+    "experience_match_score": 0.25,
+    "location_match_score": 0.10,
+    "tenure_score": 0.10,
+}
+
+# Offline gazetteer: metro area -> (state or province, country, cities and aliases in it)
+METRO_AREAS: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {
+    "san francisco bay area": ("california", "united states", (
+        "san francisco", "oakland", "berkeley", "san jose", "palo alto", "mountain view", "sunnyvale",
+        "menlo park", "redwood city", "santa clara", "cupertino", "fremont", "san mateo", "south san francisco")),
+    "los angeles": ("california", "united states", (
+        "los angeles", "santa monica", "pasadena", "burbank", "long beach", "irvine", "culver city", "glendale")),
+    "san diego": ("california", "united states", ("san diego", "la jolla", "carlsbad")),
+    "seattle": ("washington", "united states", ("seattle", "bellevue", "redmond", "kirkland", "tacoma")),
+    "portland": ("oregon", "united states", ("portland", "beaverton", "hillsboro")),
+    "new york city": ("new york", "united states", (
+        "new york", "new york city", "nyc", "manhattan", "brooklyn", "queens", "bronx", "jersey city", "hoboken",
+        "newark", "stamford", "white plains")),
+    "boston": ("massachusetts", "united states", ("boston", "cambridge", "somerville", "waltham", "burlington")),
+    "washington dc": ("district of columbia", "united states", (
+        "washington", "washington dc", "arlington", "alexandria", "bethesda", "reston", "mclean", "tysons")),
+    "philadelphia": ("pennsylvania", "united states", ("philadelphia", "king of prussia")),
+    "pittsburgh": ("pennsylvania", "united states", ("pittsburgh",)),
+    "chicago": ("illinois", "united states", ("chicago", "evanston", "naperville", "schaumburg")),
+    "austin": ("texas", "united states", ("austin", "round rock")),
+    "dallas": ("texas", "united states", ("dallas", "fort worth", "plano", "irving", "frisco")),
+    "houston": ("texas", "united states", ("houston", "the woodlands", "sugar land")),
+    "denver": ("colorado", "united states", ("denver", "boulder", "aurora")),
+    "atlanta": ("georgia", "united states", ("atlanta", "alpharetta")),
+    "miami": ("florida", "united states", ("miami", "fort lauderdale", "boca raton")),
+    "raleigh-durham": ("north carolina", "united states", ("raleigh", "durham", "chapel hill", "cary")),
+    "minneapolis": ("minnesota", "united states", ("minneapolis", "saint paul", "st. paul")),
+    "salt lake city": ("utah", "united states", ("salt lake city", "lehi", "provo")),
+    "phoenix": ("arizona", "united states", ("phoenix", "scottsdale", "tempe", "chandler")),
+    "toronto": ("ontario", "canada", ("toronto", "mississauga", "markham", "waterloo")),
+    "vancouver": ("british columbia", "canada", ("vancouver", "burnaby", "richmond")),
+    "montreal": ("quebec", "canada", ("montreal",)),
+    "london": ("england", "united kingdom", ("london",)),
+    "dublin": ("leinster", "ireland", ("dublin",)),
+    "paris": ("ile-de-france", "france", ("paris",)),
+    "berlin": ("berlin", "germany", ("berlin",)),
+    "munich": ("bavaria", "germany", ("munich", "münchen")),
+    "amsterdam": ("north holland", "netherlands", ("amsterdam",)),
+    "bangalore": ("karnataka", "india", ("bangalore", "bengaluru")),
+    "singapore": ("singapore", "singapore", ("singapore",)),
+    "sydney": ("new south wales", "australia", ("sydney",)),
+}
+
+# Abbreviations and alternate spellings of regions and countries
+REGION_ALIASES = {
+    "al": "alabama", "ak": "alaska", "az": "arizona", "ar": "arkansas", "ca": "california",
+    "co": "colorado", "ct": "connecticut", "de": "delaware", "dc": "district of columbia",
+    "d.c.": "district of columbia", "fl": "florida", "ga": "georgia", "hi": "hawaii", "id": "idaho",
+    "il": "illinois", "in": "indiana", "ia": "iowa", "ks": "kansas", "ky": "kentucky", "la": "louisiana",
+    "me": "maine", "md": "maryland", "ma": "massachusetts", "mi": "michigan", "mn": "minnesota",
+    "ms": "mississippi", "mo": "missouri", "mt": "montana", "ne": "nebraska", "nv": "nevada",
+    "nh": "new hampshire", "nj": "new jersey", "nm": "new mexico", "ny": "new york",
+    "nc": "north carolina", "nd": "north dakota", "oh": "ohio", "ok": "oklahoma", "or": "oregon",
+    "pa": "pennsylvania", "ri": "rhode island", "sc": "south carolina", "sd": "south dakota",
+    "tn": "tennessee", "tx": "texas", "ut": "utah", "vt": "vermont", "va": "virginia",
+    "wa": "washington", "wv": "west virginia", "wi": "wisconsin", "wy": "wyoming",
+    "on": "ontario", "bc": "british columbia", "qc": "quebec",
+    "us": "united states", "usa": "united states", "u.s.": "united states", "united states of america": "united states",
+    "uk": "united kingdom", "u.k.": "united kingdom", "great britain": "united kingdom",
+}
+
+# Location Match scores (the prompt's rubric, plus the levels it leaves implicit)
+REMOTE_LOCATION_SCORE = 10.0
+SAME_CITY_SCORE = 10.0
+SAME_METRO_SCORE = 8.0
+SAME_REGION_SCORE = 6.0
+SAME_COUNTRY_SCORE = 4.0
+OTHER_LOCATION_SCORE = 2.0
+UNKNOWN_LOCATION_SCORE = 5.0
+
+# Tenure score of a profile without any datable experience
+UNKNOWN_TENURE_SCORE = 5.0
+
+_AREA_WORDS_RE = re.compile(r"^greater\s+|\s+(metropolitan|metro|bay)?\s*area$|\s+metro$")
+
+
+def _build_lookup() -> Tuple[Dict[str, str], Dict[str, Tuple[str, str]], Set[str], Set[str]]:
+    """City -> metro and metro -> (region, country) tables, plus the known regions and countries"""
+    city_to_metro: Dict[str, str] = {}
+    metro_places: Dict[str, Tuple[str, str]] = {}
+    for metro, (region, country, cities) in METRO_AREAS.items():
+        metro_places[metro] = (region, country)
+        city_to_metro.setdefault(metro, metro)
+        for city in cities:
+            city_to_metro.setdefault(city, metro)
+    regions = {region for region, _ in metro_places.values()}
+    regions.update(REGION_ALIASES.values())
+    countries = {country for _, country in metro_places.values()}
+    return city_to_metro, metro_places, regions, countries
+
+
+_CITY_TO_METRO, _METRO_PLACES, _REGIONS, _COUNTRIES = _build_lookup()
+
+
+def _normalize(part: str) -> str:
+    part = " ".join(part.lower().split()).strip(" .")
+    part = REGION_ALIASES.get(part, part)
+    stripped = _AREA_WORDS_RE.sub("", part).strip()
+    if part in _CITY_TO_METRO or stripped not in _CITY_TO_METRO:
+        return part
+    return stripped
+
+
+@lru_cache(maxsize=4096)
+def resolve_place(text: str) -> Dict[str, Optional[str]]:
+    """
+    Resolve a free-text location like "Palo Alto, CA" or "Greater Seattle Area".
+
+    Args:
+        text: Comma-separated location, city first
+
+    Returns:
+        Dict with city, metro, region and country (None where unknown)
+    """
+    parts = [_normalize(part) for part in text.split(",") if part.strip()]
+    place: Dict[str, Optional[str]] = {"city": None, "metro": None, "region": None, "country": None}
+    if not parts:
+        return place
+    for part in parts[1:]:
+        if part in _COUNTRIES:
+            place["country"] = place["country"] or part
+        elif part in _REGIONS:
+            place["region"] = place["region"] or part
+    place["city"] = parts[0]
+    metro = _CITY_TO_METRO.get(parts[0])
+    if metro is not None:
+        region, country = _METRO_PLACES[metro]
+        # A city name shared by two places (e.g. "Portland, ME") is only the metro if the region agrees
+        if place["region"] in (None, region) and place["country"] in (None, country):
+            place.update(metro=metro, region=region, country=country)
+    elif parts[0] in _COUNTRIES:
+        place.update(city=None, country=parts[0])
+    elif parts[0] in _REGIONS:
+        place.update(city=None, region=parts[0])
+    return place
+
+
+def _profile_location(profile: Dict[str, Any]) -> str:
+    fields = [profile.get(field) or "" for field in ("city", "state", "country")]
+    if not any(field.strip() for field in fields):
+        return profile.get("location") or ""
+    return ", ".join(field for field in fields if field.strip())
+
+
+def location_match_score(profile: Dict[str, Any], job: JobData) -> float:
+    """
+    Location Match score computed from the gazetteer.
+
+    Remote jobs and the same city score 10, the same metro area 8, the same state or
+    province 6, the same country 4 and anywhere else 2. A profile without a location
+    scores 5, since the candidate may well be local or willing to relocate.
+
+    Args:
+        profile: LinkedIn profile data from the API
+        job: Job details
+
+    Returns:
+        Score out of 10
+    """
+    job_location = (job.location or "").strip()
+    if not job_location or "remote" in job_location.lower():
+        return REMOTE_LOCATION_SCORE
+    candidate_location = _profile_location(profile).strip()
+    if not candidate_location:
+        return UNKNOWN_LOCATION_SCORE
+
+    wanted = resolve_place(job_location)
+    actual = resolve_place(candidate_location)
+    same_region = wanted["region"] is None or actual["region"] is None or wanted["region"] == actual["region"]
+    if wanted["city"] and wanted["city"] == actual["city"] and same_region:
+        return SAME_CITY_SCORE
+    if wanted["metro"] and wanted["metro"] == actual["metro"]:
+        return SAME_METRO_SCORE
+    if wanted["region"] and wanted["region"] == actual["region"]:
+        return SAME_REGION_SCORE
+    if wanted["country"] and wanted["country"] == actual["country"]:
+        return SAME_COUNTRY_SCORE
+    return OTHER_LOCATION_SCORE
+
+
+def average_tenure_years(profile: Dict[str, Any]) -> Optional[float]:
+    """
+    Average years spent per employer.
+
+    Consecutive entries at the same company (promotions) count as one stint, so an
+    internal move doesn't read as job hopping.
+
+    Returns:
+        Average years, or None if no experience has a start year or duration
+    """
+    stints: List[float] = []
+    previous_company = None
+    for exp in profile.get("experiences") or []:
+        years = experience_years(exp)
+        company = (exp.get("company") or "").strip().lower()
+        if stints and company and company == previous_company:
+            stints[-1] += years
+        elif years > 0:
+            stints.append(years)
+            previous_company = company
+    return sum(stints) / len(stints) if stints else None
+
+
+def tenure_score(profile: Dict[str, Any]) -> float:
+    """
+    Tenure score from the average years per employer.
+
+    Follows the prompt's rubric, interpolated inside each band: under 1 year scores
+    3-5, 1-2 years 6-8, 2-3 years 9-10, and longer stays 9.
+
+    Args:
+        profile: LinkedIn profile data from the API
+
+    Returns:
+        Score out of 10 (5 when the profile has no datable experience)
+    """
+    average = average_tenure_years(profile)
+    if average is None:
+        return UNKNOWN_TENURE_SCORE
+    if average < 1:
+        score = 3 + 2 * average
+    elif average < 2:
+        score = 6 + 2 * (average - 1)
+    elif average <= 3:
+        score = 9 + (average - 2)
+    else:
+        score = 9.0
+    return round(score, 1)
+
+
+def combine_fit_score(scores: Dict[str, float]) -> float:
+    """Weighted fit score out of 10 (missing dimensions count as 0)"""
+    return round(sum(scores.get(name, 0.0) * weight for name, weight in SCORE_WEIGHTS.items()), 2)
+
+
+def hybrid_scores(raw_scores: Dict[str, Any], profile: Dict[str, Any], job: JobData) -> CandidateScores:
+    """
+    Complete the LLM's subjective scores with the local location and tenure scores.
+
+    Args:
+        raw_scores: Education, career trajectory, company relevance and experience match
+            scores returned by a hybrid scoring prompt
+        profile: LinkedIn profile data the LLM scored
+        job: Job the profile was scored for
+
+    Returns:
+        CandidateScores with the fit score recomputed from all six dimensions
+    """
+    scores = {
+        name: float(raw_scores.get(name, 0))
+        for name in ("education_score", "career_trajectory_score", "company_relevance_score", "experience_match_score")
+    }
+    scores["location_match_score"] = location_match_score(profile, job)
+    scores["tenure_score"] = tenure_score(profile)
+    return CandidateScores(**scores, fit_score=combine_fit_score(scores))
@@ -1,27 +1,29 @@
 import os
-from typing import Dict, Any, Optional
-from langchain_openai import ChatOpenAI
-from pydantic import SecretStr
-from ..data.prompts import outreach_prompt
+from typing import Dict, Any, Optional, Union
+from ..data import prompts
 from ..data.models import TopCandidate, JobData
-from dotenv import load_dotenv
+from ..services.llm_cache import cached_invoke
+from ..services.llm_client import get_llm
+from .candidate_records import CandidateRecord
 
-# Initialize LangChain components
-load_dotenv()
-api_key = os.environ['OPENAI_API_KEY']
-llm = ChatOpenAI(api_key=SecretStr(api_key), model='gpt-4o-mini')
+# Outreach is sampled, so reuse a generated message for a shorter window (0 disables caching)
+OUTREACH_CACHE_TTL_SECONDS = float(os.environ.get("LLM_CACHE_TTL_OUTREACH_HOURS", "24")) * 3600
 
 
-def generate_outreach_message(candidate: TopCandidate, job: JobData) -> str:
+def generate_outreach_message(candidate: Union[TopCandidate, CandidateRecord], job: JobData) -> str:
     """
     Generate a personalized outreach message for a candidate.
     
     Args:
-        candidate: TopCandidate object with profile and scores
+        candidate: TopCandidate (or internal CandidateRecord) with profile and scores
         job: JobData object with job requirements
         
     Returns:
         Personalized outreach message string
+        
+    Raises:
+        Exception: If the message could not be generated; there is no canned fallback,
+            so a failure is never mistaken for a written message and stored or reused
     """
     # Extract candidate information from profile data
     # This would need to be enhanced based on actual profile data structure
@@ -49,21 +51,8 @@ def generate_outreach_message(candidate: TopCandidate, job: JobData) -> str:
         "fit_score": f"{candidate.fit_score:.1f}"
     }
     
-    try:
-        # Generate the message
-        message = llm.invoke(outreach_prompt.format(**inputs))
-        return str(message.content)
-        
-    except Exception as e:
-        print(f"Error generating outreach message: {e}")
-        # Fallback message
-        return f"""Hi {candidate_info['name']},
-
-I came across your profile and was impressed by your background in {candidate_info['current_role']} at {candidate_info['current_company']}. 
-
-We have a {job.title} position available at {job.location} that I believe would be a great fit for your experience. The role requires expertise in {', '.join(job.keywords[:3])} and {job.experience_level} level experience.
-
-Would you be interested in learning more about this opportunity? I'd love to discuss how your background aligns with our needs.
-
-Best regards,
-[Your Name]""" 
\ No newline at end of file
+    # Generate the message
+    return cached_invoke(
+        get_llm(), prompts.outreach_prompt.format(**inputs),
+        namespace="outreach", ttl_seconds=OUTREACH_CACHE_TTL_SECONDS
+    ) 
\ No newline at end of file
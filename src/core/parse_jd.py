@@ -1,19 +1,27 @@
 import os
-import json
-from typing import List, Optional
-from dataclasses import dataclass, asdict
-from langchain_openai import ChatOpenAI
-from langchain_core.output_parsers import JsonOutputParser
-from pydantic import BaseModel, Field, SecretStr
-from ..data.prompts import keyword_extraction_prompt
-from dotenv import load_dotenv
+import re
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional
+from pydantic import BaseModel, Field
+from ..data import prompts
 from ..data.job_descriptions import get_all_job_descriptions
 from ..data.models import JobData
+from ..services.llm_cache import cached_invoke, get_llm_cache
+from ..services.llm_client import get_llm, DEFAULT_MODEL
+from ..services.metrics import get_metrics
+from .run_state import RunState
 
-load_dotenv()
-api_key = os.environ['OPENAI_API_KEY']
+PARSE_JD_CACHE_TTL_SECONDS = float(os.environ.get("LLM_CACHE_TTL_PARSE_JD_HOURS", "720")) * 3600
+PARSE_JD_MAX_CONCURRENCY = int(os.environ.get("PARSE_JD_MAX_CONCURRENCY", "8"))
+
+# "ID: SRN2025-10916" / "Job ID: 12345" / "Req ID: R-77" lines in a JD
+_REQUISITION_ID_RE = re.compile(r"^\s*(?:job\s+|req(?:uisition)?\s+)?id\s*[:#]\s*([\w-]+)", re.I | re.M)
+# "Priority: urgent" / "Priority: 2" lines in a JD
+_PRIORITY_RE = re.compile(r"^\s*priority\s*[:#]\s*(-?\d+|[a-z]+)", re.I | re.M)
+PRIORITY_LEVELS = {"low": -1, "normal": 0, "medium": 0, "high": 1, "urgent": 2, "critical": 2}
 
-llm = ChatOpenAI(api_key=SecretStr(api_key), model='gpt-4o-mini')
 
 class JobExtractionSchema(BaseModel):
     """Pydantic schema for structured job information extraction"""
@@ -23,57 +31,178 @@ class JobExtractionSchema(BaseModel):
     experience_level: str = Field(description="Required experience level (e.g., Entry, Mid, Senior, Executive)")
     keywords: List[str] = Field(description="Key skills, technologies, or requirements mentioned in the job description")
 
-output_parser = JsonOutputParser(pydantic_object=JobExtractionSchema)
-chain = keyword_extraction_prompt | llm | output_parser   
+@lru_cache(maxsize=None)
+def _output_parser():
+    """JSON parser for JobExtractionSchema, created on first use"""
+    from langchain_core.output_parsers import JsonOutputParser
+    return JsonOutputParser(pydantic_object=JobExtractionSchema)
+
+
+def requisition_id(job_description: str) -> Optional[str]:
+    """The requisition ID stated in a JD, read from the text rather than asked of the LLM"""
+    match = _REQUISITION_ID_RE.search(job_description)
+    return match.group(1) if match else None
+
+
+def job_priority(job_description: str) -> int:
+    """The priority stated in a JD (a PRIORITY_LEVELS name or a number), 0 if none"""
+    match = _PRIORITY_RE.search(job_description)
+    if not match:
+        return 0
+    value = match.group(1).lower()
+    return int(value) if value.lstrip("-").isdigit() else PRIORITY_LEVELS.get(value, 0)
+
+
+def _jd_cache_key(job_description: str) -> str:
+    """Cache key of a parsed JD: hash of the whitespace-normalized JD text and the parsing model"""
+    text = re.sub(r"\s+", " ", job_description).strip()
+    return hashlib.sha256(f"parsed_jd:{DEFAULT_MODEL}:{text}".encode("utf-8")).hexdigest()
+
+
+def _cached_job(job_description: str) -> Optional[JobData]:
+    """Return the previously parsed JobData for an unchanged JD, if any"""
+    cache = get_llm_cache() if PARSE_JD_CACHE_TTL_SECONDS > 0 else None
+    if cache is None:
+        return None
+    cached = cache.get(_jd_cache_key(job_description))
+    job = None
+    if cached is not None:
+        try:
+            job = JobData.model_validate_json(cached)
+        except Exception:
+            pass
+    get_metrics().record_cache("parsed_jd", "miss" if job is None else "hit")
+    return job
+
+
+def _remember_job(job_description: str, job: JobData) -> None:
+    cache = get_llm_cache() if PARSE_JD_CACHE_TTL_SECONDS > 0 else None
+    if cache is not None:
+        cache.put(_jd_cache_key(job_description), job.model_dump_json(), PARSE_JD_CACHE_TTL_SECONDS, namespace="parsed_jd")
+
 
 def parse_job_description(job_description: str) -> Optional[JobData]:
     """
     Parse a job description and extract structured information
     
+    Unchanged JDs are served from the parsed-JD cache without an LLM call.
+    
     Args:
         job_description: The text of the job description
         
     Returns:
         JobData object containing extracted information, or None if parsing fails
     """
+    cached_job = _cached_job(job_description)
+    if cached_job is not None:
+        cached_job.id = cached_job.id or requisition_id(job_description)
+        cached_job.priority = job_priority(job_description)
+        return cached_job
+    return _parse(job_description)
+
+
+def _parse(job_description: str) -> Optional[JobData]:
+    """Parse a JD with the LLM, without looking it up in the parsed-JD cache first"""
     try:
-        result = chain.invoke({
-            "job_description": job_description,
-            "format_instructions": output_parser.get_format_instructions()
-        })
+        with get_metrics().span("parse_jd"):
+            output_parser = _output_parser()
+            prompt = prompts.keyword_extraction_prompt.invoke({
+                "job_description": job_description,
+                "format_instructions": output_parser.get_format_instructions()
+            })
+            # Only the parsed JobData is cached (see _remember_job), not the raw response too
+            result = cached_invoke(
+                get_llm(), prompt, parse=output_parser.parse,
+                namespace="parse_jd", ttl_seconds=0
+            )
                     
-        return JobData(
+        job = JobData(
             title=result["title"],
             location=result["location"],
             experience_level=result["experience_level"],
-            keywords=result["keywords"]
+            keywords=result["keywords"],
+            id=requisition_id(job_description),
+            priority=job_priority(job_description)
         )
+        _remember_job(job_description, job)
+        return job
         
     except Exception as e:
         print(f"Error parsing job description: {e}")
         return None
 
-def process_all_job_descriptions() -> List[JobData]:
+def iter_job_descriptions(job_descriptions: Optional[Iterable[str]] = None,
+                          max_concurrency: int = PARSE_JD_MAX_CONCURRENCY,
+                          run_state: Optional[RunState] = None) -> Iterator[JobData]:
     """
-    Process all job descriptions and return them as a list
+    Parse job descriptions concurrently and yield each job as soon as it is ready
     
-    Returns:
-        List of JobData objects containing parsed job information
+    Cached JDs are yielded immediately; the rest are parsed by up to max_concurrency
+    workers and yielded in completion order, so job processing can start before the
+    last JD is parsed.
+    
+    Args:
+        job_descriptions: JD texts (defaults to get_all_job_descriptions())
+        max_concurrency: Maximum JDs parsed at the same time
+        run_state: Run the jobs belong to; JDs parsed earlier in the run get the same
+            job back, and newly parsed jobs are recorded there
+        
+    Yields:
+        JobData for every JD that parsed successfully
     """
-    job_descriptions = get_all_job_descriptions()
-    parsed_jobs = []
+    if job_descriptions is None:
+        job_descriptions = get_all_job_descriptions()
     
-    for i, jd in enumerate(job_descriptions):
-        print(f"\nProcessing job description {i+1}/{len(job_descriptions)}")
-        job_info = parse_job_description(jd)
-        if job_info:
-            parsed_jobs.append(job_info)
-            print(f"Successfully parsed job: {job_info.title}")
+    parsed = 0
+    pending = []
+    for jd in job_descriptions:
+        run_job = run_state.get_job(jd) if run_state is not None else None
+        if run_job is not None:
+            parsed += 1
+            print(f"Loaded job parsed earlier in this run: {run_job.title}")
+            yield run_job
+            continue
+        cached_job = _cached_job(jd)
+        if cached_job is not None:
+            cached_job.id = cached_job.id or requisition_id(jd)
+            cached_job.priority = job_priority(jd)
+            if run_state is not None:
+                run_state.record_job(jd, cached_job)
+            parsed += 1
+            print(f"Loaded cached job: {cached_job.title}")
+            yield cached_job
         else:
-            print("Failed to parse job description")
+            pending.append(jd)
+    
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+            # Already looked up above, so the workers go straight to the LLM
+            futures = {executor.submit(_parse, jd): jd for jd in pending}
+            for future in as_completed(futures):
+                job_info = future.result()
+                if job_info:
+                    if run_state is not None:
+                        run_state.record_job(futures[future], job_info)
+                    parsed += 1
+                    print(f"Successfully parsed job: {job_info.title}")
+                    yield job_info
+                else:
+                    print("Failed to parse job description")
+    
+    print(f"\nTotal jobs parsed: {parsed}")
+
+
+def process_all_job_descriptions(max_concurrency: int = PARSE_JD_MAX_CONCURRENCY) -> List[JobData]:
+    """
+    Process all job descriptions and return them as a list
+    
+    Args:
+        max_concurrency: Maximum JDs parsed at the same time
     
-    print(f"\nTotal jobs parsed: {len(parsed_jobs)}")
-    return parsed_jobs
+    Returns:
+        List of JobData objects containing parsed job information
+    """
+    return list(iter_job_descriptions(max_concurrency=max_concurrency))
 
 if __name__ == "__main__":
     # For testing purposes, you can still run this file directly
@@ -0,0 +1,181 @@
+import os
+import time
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, Any, List
+from ..services.metrics import get_metrics
+from .prefilter import PrefilterConfig
+
+# Marks the end of a stage's output; every stage forwards exactly one
+_DONE = object()
+
+
+@dataclass
+class PipelineConfig:
+    """Per-stage concurrency for the intra-job fetch/score/outreach pipeline"""
+    fetch_workers: int = int(os.environ.get("PIPELINE_FETCH_WORKERS", "4"))
+    score_workers: int = int(os.environ.get("PIPELINE_SCORE_WORKERS", "4"))
+    outreach_workers: int = int(os.environ.get("PIPELINE_OUTREACH_WORKERS", "5"))
+    queue_size: int = int(os.environ.get("PIPELINE_QUEUE_SIZE", "16"))
+    score_batch_size: int = int(os.environ.get("PIPELINE_SCORE_BATCH_SIZE", "5"))
+    top_n: int = 5
+    prefilter: PrefilterConfig = field(default_factory=PrefilterConfig)
+
+
+class Stage:
+    """
+    A pool of worker threads that reads items from a bounded inbox, applies a function
+    and writes non-None results to a bounded outbox.
+
+    Stages are chained by passing one stage's outbox as the next stage's inbox. Because
+    the queues are bounded, a slow stage applies backpressure to the ones before it.
+
+    With batch_size > 1 the stage micro-batches: each worker waits briefly for up to
+    batch_size items, calls fn once with the list and emits each returned result.
+    If fn raises for a batch, the batch's items are retried one by one, so a single bad
+    item only loses itself; every item that still fails is logged and counted.
+    """
+
+    def __init__(self, name: str, fn: Callable[[Any], Any], inbox: "queue.Queue",
+                 workers: int = 1, queue_size: int = 16, batch_size: int = 1,
+                 linger: float = 0.05):
+        """
+        Args:
+            name: Stage name used in log lines and thread names
+            fn: Function applied to every item (or list of items when batching);
+                returning None drops the item
+            inbox: Queue the stage reads from, terminated by the upstream stage
+            workers: Number of worker threads
+            queue_size: Capacity of the stage's output queue
+            batch_size: Maximum items handed to fn at once (1 disables batching)
+            linger: Seconds a worker waits for a batch to fill before running it
+        """
+        self.name = name
+        self.fn = fn
+        self.inbox = inbox
+        self.batch_size = max(1, batch_size)
+        self.linger = linger
+        self.outbox: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self.errors = 0
+        self._remaining = max(1, workers)
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"{name}-{i}", daemon=True)
+            for i in range(self._remaining)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _next_batch(self) -> tuple:
+        """Collect up to batch_size items; returns (items, upstream_done)"""
+        items = []
+        deadline = None
+        while len(items) < self.batch_size:
+            try:
+                if not items:
+                    item = self.inbox.get()
+                    deadline = time.monotonic() + self.linger
+                else:
+                    item = self.inbox.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if item is _DONE:
+                # Let sibling workers see the end marker too
+                self.inbox.put(_DONE)
+                return items, True
+            items.append(item)
+        return items, False
+
+    def _apply(self, items: List[Any]) -> List[Any]:
+        """Results of fn for a batch, falling back to one item at a time if the batch fails"""
+        try:
+            return self.fn(items) if self.batch_size > 1 else [self.fn(items[0])]
+        except Exception as e:
+            if len(items) == 1:
+                self._failed(e)
+                return []
+            print(f"Error in {self.name} stage for a batch of {len(items)}, retrying item by item: {e}")
+        results = []
+        for item in items:
+            try:
+                results.extend(self.fn([item]))
+            except Exception as e:
+                self._failed(e)
+        return results
+
+    def _failed(self, error: Exception) -> None:
+        """Log and count an item the stage dropped because fn raised for it"""
+        print(f"Error in {self.name} stage, dropping an item: {error}")
+        get_metrics().inc("pipeline_items_failed_total", stage=self.name)
+        with self._lock:
+            self.errors += 1
+
+    def _run(self) -> None:
+        done = False
+        while not done:
+            items, done = self._next_batch()
+            if not items:
+                continue
+            for result in self._apply(items):
+                if result is not None:
+                    self.outbox.put(result)
+
+        with self._lock:
+            self._remaining -= 1
+            last = self._remaining == 0
+        if last:
+            self.outbox.put(_DONE)
+
+
+def feed(items: Iterable[Any], queue_size: int = 16) -> "queue.Queue":
+    """
+    Start a producer thread that pushes items into a bounded queue.
+
+    Args:
+        items: Any iterable, consumed lazily so results can stream in
+        queue_size: Capacity of the returned queue
+
+    Returns:
+        Queue terminated with the end marker once items is exhausted
+    """
+    out: "queue.Queue" = queue.Queue(maxsize=queue_size)
+
+    def produce():
+        try:
+            for item in items:
+                out.put(item)
+        except Exception as e:
+            print(f"Error in source stage: {e}")
+        finally:
+            out.put(_DONE)
+
+    threading.Thread(target=produce, name="source", daemon=True).start()
+    return out
+
+
+def drain(q: "queue.Queue") -> Iterator[Any]:
+    """Yield items from a stage's output queue until the end marker arrives"""
+    while True:
+        item = q.get()
+        if item is _DONE:
+            return
+        yield item
+
+
+def run_pipeline(source: Iterable[Any], stages: List[tuple], queue_size: int = 16) -> List[Any]:
+    """
+    Run items through a chain of stages and collect the final outputs.
+
+    Args:
+        source: Items fed into the first stage
+        stages: (name, fn, workers) or (name, fn, workers, batch_size) tuples, in order
+        queue_size: Capacity of every inter-stage queue
+
+    Returns:
+        Outputs of the last stage, in completion order
+    """
+    inbox = feed(source, queue_size)
+    for name, fn, workers, *batch_size in stages:
+        inbox = Stage(name, fn, inbox, workers, queue_size, *batch_size).outbox
+    return list(drain(inbox))
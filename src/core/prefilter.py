@@ -0,0 +1,275 @@
+import os
+import re
+import threading
+from datetime import date
+from functools import lru_cache
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional, Tuple
+from ..data.models import JobData, CandidateScores
+
+PREFILTER_ENABLED = os.environ.get("PREFILTER_ENABLED", "true").lower() not in ("0", "false", "no")
+PREFILTER_THRESHOLD = float(os.environ.get("PREFILTER_THRESHOLD", "0.2"))
+# "drop" removes rejected candidates, "fast_path" keeps them with a locally computed score
+PREFILTER_MODE = os.environ.get("PREFILTER_MODE", "fast_path")
+
+# Years of experience that fit each level: (min, max)
+EXPERIENCE_LEVEL_YEARS = {
+    "intern": (0, 1),
+    "entry": (0, 3),
+    "junior": (0, 3),
+    "mid": (2, 7),
+    "senior": (5, 15),
+    "staff": (8, 20),
+    "principal": (10, 25),
+    "lead": (6, 20),
+    "executive": (10, 40),
+    "director": (10, 40),
+}
+
+# Weights of the three cheap signals in the prefilter score
+KEYWORD_WEIGHT = 0.5
+LOCATION_WEIGHT = 0.25
+SENIORITY_WEIGHT = 0.25
+
+
+
+@dataclass
+class PrefilterConfig:
+    enabled: bool = PREFILTER_ENABLED
+    threshold: float = PREFILTER_THRESHOLD
+    mode: str = PREFILTER_MODE
+
+
+@dataclass
+class PrefilterResult:
+    score: float
+    keyword_overlap: float
+    location_match: float
+    seniority_fit: float
+    passed: bool
+
+
+@dataclass
+class PrefilterStats:
+    evaluated: int = 0
+    passed: int = 0
+    dropped: int = 0
+    fast_pathed: int = 0
+
+    @property
+    def llm_calls_skipped(self) -> int:
+        return self.dropped + self.fast_pathed
+
+
+_stats = PrefilterStats()
+_stats_lock = threading.Lock()
+
+
+def get_prefilter_stats() -> Dict[str, int]:
+    """Snapshot of the process-wide prefilter counters"""
+    with _stats_lock:
+        return {**asdict(_stats), "llm_calls_skipped": _stats.llm_calls_skipped}
+
+
+@lru_cache(maxsize=1024)
+def _word_pattern(phrase: str) -> "re.Pattern[str]":
+    """
+    Regex matching a phrase as whole words, so "go" doesn't match "google" and "c"
+    doesn't match "cloud" (while "c++" and "c#" still match as themselves)
+    """
+    words = phrase.lower().split()
+    return re.compile(r"(?<![\w+#])" + r"\s+".join(re.escape(word) for word in words) + r"(?![\w+#])")
+
+
+def _profile_text(profile: Dict[str, Any]) -> str:
+    """Everything in a profile that can mention a skill"""
+    parts = [profile.get("headline") or "", profile.get("about") or ""]
+    for exp in profile.get("experiences") or []:
+        parts += [exp.get("title") or "", exp.get("company") or "", exp.get("description") or ""]
+    for edu in profile.get("educations") or []:
+        parts += [edu.get("degree") or "", edu.get("field_of_study") or ""]
+    return " ".join(parts).lower()
+
+
+def keyword_overlap(profile: Dict[str, Any], job: JobData) -> float:
+    """
+    Fraction of the job keywords that appear anywhere in the profile, as whole words.
+
+    Multi-word keywords match as a phrase, or if all of their words are present.
+
+    Returns:
+        Value in [0, 1]; 1.0 when the job has no keywords
+    """
+    if not job.keywords:
+        return 1.0
+    text = _profile_text(profile)
+    hits = 0
+    for keyword in job.keywords:
+        words = keyword.split()
+        if not words:
+            continue
+        if _word_pattern(keyword).search(text) or (
+                len(words) > 1 and all(_word_pattern(word).search(text) for word in words)):
+            hits += 1
+    return hits / len(job.keywords)
+
+
+def location_match(profile: Dict[str, Any], job: JobData) -> float:
+    """
+    Rough location compatibility from the candidate's city and the job location.
+
+    Returns:
+        1.0 for remote jobs or a shared city token, 0.5 when only the region
+        (state or country) matches, 0.3 when the profile has no city, otherwise 0.0
+    """
+    job_location = (job.location or "").lower()
+    if not job_location or "remote" in job_location:
+        return 1.0
+    profile_location = " ".join(
+        profile.get(field) or "" for field in ("city", "state", "country", "location")
+    ).lower()
+    if not profile_location.strip():
+        return 0.3
+
+    job_parts = [part.strip() for part in job_location.split(",") if part.strip()]
+    if job_parts and job_parts[0] in profile_location:
+        return 1.0
+    if any(part in profile_location for part in job_parts[1:]):
+        return 0.5
+    return 0.0
+
+
+_DURATION_RE = re.compile(r"(\d+)\s*(yr|year|mo|month)", re.I)
+
+
+def experience_years(exp: Dict[str, Any]) -> float:
+    """Length of one experience entry, from start/end years or the duration string"""
+    start = exp.get("start_year")
+    if start:
+        try:
+            end = exp.get("end_year") or date.today().year
+            return max(0.0, float(end) - float(start))
+        except (TypeError, ValueError):
+            pass
+    years = 0.0
+    for amount, unit in _DURATION_RE.findall(exp.get("duration") or ""):
+        years += int(amount) if unit.lower().startswith(("yr", "year")) else int(amount) / 12
+    return years
+
+
+def estimate_years_of_experience(profile: Dict[str, Any]) -> float:
+    """Total professional experience in years, summed over the experiences list"""
+    return sum(experience_years(exp) for exp in profile.get("experiences") or [])
+
+
+def _level_range(experience_level: str) -> Optional[Tuple[float, float]]:
+    """Map an experience level like 'Senior' or '5+ years' to a (min, max) years range"""
+    level = (experience_level or "").lower()
+    match = re.search(r"(\d+)\s*\+?\s*(?:-|to)?\s*(\d+)?\s*(?:years|yrs)", level)
+    if match:
+        low = float(match.group(1))
+        high = float(match.group(2)) if match.group(2) else low + 10
+        return low, high
+    for name, years in EXPERIENCE_LEVEL_YEARS.items():
+        if name in level:
+            return years
+    return None
+
+
+def seniority_fit(profile: Dict[str, Any], job: JobData) -> float:
+    """
+    How well the candidate's estimated years of experience fit the job level.
+
+    Returns:
+        1.0 inside the expected range, decaying by 0.15 per year outside it;
+        1.0 when the level can't be interpreted
+    """
+    expected = _level_range(job.experience_level)
+    if expected is None:
+        return 1.0
+    years = estimate_years_of_experience(profile)
+    low, high = expected
+    distance = low - years if years < low else years - high if years > high else 0.0
+    return max(0.0, 1.0 - 0.15 * distance)
+
+
+def prefilter_candidate(profile: Dict[str, Any], job: JobData,
+                        config: Optional[PrefilterConfig] = None) -> PrefilterResult:
+    """
+    Cheap deterministic screen run before LLM scoring.
+
+    Args:
+        profile: LinkedIn profile data from the API
+        job: Job details
+        config: Threshold and mode (defaults to PrefilterConfig())
+
+    Returns:
+        PrefilterResult with the combined score and its components
+    """
+    config = config or PrefilterConfig()
+    keywords = keyword_overlap(profile, job)
+    location = location_match(profile, job)
+    seniority = seniority_fit(profile, job)
+    score = KEYWORD_WEIGHT * keywords + LOCATION_WEIGHT * location + SENIORITY_WEIGHT * seniority
+    return PrefilterResult(
+        score=round(score, 3),
+        keyword_overlap=keywords,
+        location_match=location,
+        seniority_fit=seniority,
+        passed=(not config.enabled) or score >= config.threshold
+    )
+
+
+def fast_path_scores(result: PrefilterResult) -> CandidateScores:
+    """
+    Local stand-in scores for a candidate that failed the prefilter.
+
+    Only the dimensions the prefilter measures directly get a value (skills as
+    experience match, and location); the rest, tenure included, stay at 0. The fit score
+    is therefore at most 3.5, but it is not a floor under LLM scores: a weak LLM-scored
+    candidate can still rank below a fast-pathed one.
+    """
+    skills = round(10 * result.keyword_overlap, 1)
+    location = round(10 * result.location_match, 1)
+    return CandidateScores(
+        education_score=0,
+        career_trajectory_score=0,
+        company_relevance_score=0,
+        experience_match_score=skills,
+        location_match_score=location,
+        tenure_score=0,
+        fit_score=round(skills * 0.25 + location * 0.10, 2)
+    )
+
+
+def split_candidates(profiles: List[Dict[str, Any]], job: JobData,
+                     config: Optional[PrefilterConfig] = None) -> Tuple[List[int], Dict[int, Optional[CandidateScores]]]:
+    """
+    Partition profiles into those that need an LLM score and those that don't.
+
+    Args:
+        profiles: LinkedIn profile data from the API
+        job: Job details
+        config: Threshold and mode (defaults to PrefilterConfig())
+
+    Returns:
+        (indexes to send to the LLM, {index: fast-path scores, or None if dropped})
+    """
+    config = config or PrefilterConfig()
+    to_score: List[int] = []
+    rejected: Dict[int, Optional[CandidateScores]] = {}
+    for i, profile in enumerate(profiles):
+        result = prefilter_candidate(profile, job, config)
+        if result.passed:
+            to_score.append(i)
+        elif config.mode == "drop":
+            rejected[i] = None
+        else:
+            rejected[i] = fast_path_scores(result)
+
+    with _stats_lock:
+        _stats.evaluated += len(profiles)
+        _stats.passed += len(to_score)
+        _stats.dropped += sum(1 for scores in rejected.values() if scores is None)
+        _stats.fast_pathed += sum(1 for scores in rejected.values() if scores is not None)
+    return to_score, rejected
@@ -0,0 +1,157 @@
+import os
+import re
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from ..services.metrics import get_metrics
+
+PROMPT_COMPACTION_ENABLED = os.environ.get("PROMPT_COMPACTION_ENABLED", "true").lower() not in ("0", "false", "no")
+# Estimated tokens of profile data allowed per candidate in a scoring prompt
+PROMPT_PROFILE_TOKEN_BUDGET = int(os.environ.get("PROMPT_PROFILE_TOKEN_BUDGET", "600"))
+# Cap on any single experience description, so one long entry can't take the whole budget
+PROMPT_DESCRIPTION_MAX_TOKENS = int(os.environ.get("PROMPT_DESCRIPTION_MAX_TOKENS", "120"))
+PROMPT_MAX_EDUCATIONS = int(os.environ.get("PROMPT_MAX_EDUCATIONS", "3"))
+
+# Fields sent for each entry; everything else in the API payload is noise to the scorer
+EDUCATION_FIELDS = ("school", "degree", "field_of_study", "start_year", "end_year")
+EXPERIENCE_FIELDS = ("title", "company", "start_year", "end_year", "duration")
+
+_TOKEN_RE = re.compile(r"[A-Za-z]+|\d+|\S")
+_SENTENCE_RE = re.compile(r"(?<=[.!?;])\s+|\n+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Fast local estimate of the BPE token count of text.
+
+    Words count one token per 4 letters (rounded up), digit runs one per 3 digits and
+    every other non-space character one token: the usual BPE rules of thumb, without
+    loading a tokenizer. Only used for budgeting; billed usage comes from the provider.
+    """
+    tokens = 0
+    for piece in _TOKEN_RE.findall(text):
+        if piece[0].isalpha():
+            tokens += (len(piece) + 3) // 4
+        elif piece[0].isdigit():
+            tokens += (len(piece) + 2) // 3
+        else:
+            tokens += 1
+    return tokens
+
+
+def serialize(data: Any) -> str:
+    """Compact JSON (no indentation or spaces after separators) for prompts"""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def _pick(entry: Dict[str, Any], fields: Tuple[str, ...]) -> Dict[str, Any]:
+    return {field: entry[field] for field in fields if entry.get(field) not in (None, "", [])}
+
+
+def _relevance(text: str, keywords: List[str]) -> int:
+    """Number of job keywords mentioned in text"""
+    text = text.lower()
+    return sum(1 for keyword in keywords if keyword and keyword.lower() in text)
+
+
+def _truncate(text: str, budget: int, keywords: List[str]) -> str:
+    """
+    Shorten text to about budget tokens, keeping sentences that mention a keyword
+    first and otherwise the original order. Repeated sentences are dropped.
+    """
+    if estimate_tokens(text) <= budget:
+        return text
+    sentences = list(dict.fromkeys(s.strip() for s in _SENTENCE_RE.split(text) if s.strip()))
+    ranked = sorted(range(len(sentences)), key=lambda i: (-_relevance(sentences[i], keywords), i))
+    kept, used = set(), 0
+    for i in ranked:
+        cost = estimate_tokens(sentences[i])
+        if used + cost <= budget:
+            kept.add(i)
+            used += cost
+    if not kept and sentences:
+        # A single sentence longer than the budget: cut it word by word
+        words, out = sentences[ranked[0]].split(), []
+        for word in words:
+            used_next = used + estimate_tokens(word)
+            if used_next > budget:
+                break
+            out.append(word)
+            used = used_next
+        return " ".join(out) + "..."
+    return " ".join(sentences[i] for i in sorted(kept))
+
+
+def compact_profile(profile: Dict[str, Any], keywords: Optional[List[str]] = None,
+                    token_budget: int = PROMPT_PROFILE_TOKEN_BUDGET,
+                    extra_fields: Tuple[str, ...] = ()) -> Dict[str, Any]:
+    """
+    Profile data for a scoring prompt, trimmed to an estimated token budget.
+
+    Education entries and the title, company and dates of every experience are kept
+    first, since trajectory and tenure depend on the whole history. The remaining
+    budget goes to experience descriptions, the most relevant (job keywords
+    mentioned) and most recent first. Experiences keep their original order.
+
+    Args:
+        profile: LinkedIn profile data from the API
+        keywords: Job keywords used to rank descriptions (and sentences inside them)
+        token_budget: Estimated tokens allowed for the serialized result
+        extra_fields: Top-level profile fields to include as well (e.g. "city")
+
+    Returns:
+        Dict with educations, experiences and the extra fields, ready for serialize()
+    """
+    keywords = keywords or []
+    data: Dict[str, Any] = {
+        "educations": [_pick(edu, EDUCATION_FIELDS) for edu in (profile.get("educations") or [])[:PROMPT_MAX_EDUCATIONS]],
+        "experiences": [],
+    }
+    for field in extra_fields:
+        if profile.get(field):
+            data[field] = profile[field]
+
+    experiences = profile.get("experiences") or []
+    headers = [_pick(exp, EXPERIENCE_FIELDS) for exp in experiences]
+    used = estimate_tokens(serialize(data))
+    for header in headers:
+        cost = estimate_tokens(serialize(header)) + 1
+        if used + cost > token_budget:
+            break
+        data["experiences"].append(header)
+        used += cost
+
+    # Experiences are listed most recent first; rank by keyword hits, then recency
+    candidates = [
+        (i, exp.get("description") or "") for i, exp in enumerate(experiences[:len(data["experiences"])])
+    ]
+    ranked = sorted(
+        (item for item in candidates if item[1].strip()),
+        key=lambda item: (-_relevance(item[1], keywords), item[0])
+    )
+    described: List[int] = []
+    for i, description in ranked:
+        remaining = token_budget - used - 4  # key, quotes and comma
+        if remaining <= 8:
+            break
+        text = _truncate(description.strip(), min(remaining, PROMPT_DESCRIPTION_MAX_TOKENS), keywords)
+        if text:
+            data["experiences"][i]["description"] = text
+            described.append(i)
+            used += estimate_tokens(text) + 4
+
+    # The per-field estimates above ignore JSON escaping; drop the least relevant
+    # descriptions until the serialized whole fits
+    kept = estimate_tokens(serialize(data))
+    while kept > token_budget and described:
+        del data["experiences"][described.pop()]["description"]
+        kept = estimate_tokens(serialize(data))
+    full = estimate_tokens(serialize({
+        "educations": profile.get("educations") or [],
+        "experiences": experiences,
+        **{field: profile.get(field) for field in extra_fields},
+    }))
+    metrics = get_metrics()
+    metrics.inc("prompt_compactions_total")
+    metrics.inc("prompt_profile_tokens_total", kept, result="kept")
+    metrics.inc("prompt_profile_tokens_total", max(0, full - kept), result="dropped")
+    return data
@@ -0,0 +1,154 @@
+import os
+import gzip
+import json
+import threading
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, IO, Iterator
+from ..data.models import JobResult
+
+RESULTS_JSONL_PATH = os.environ.get("RESULTS_JSONL_PATH", "results.jsonl")
+RESULTS_COMPRESS = os.environ.get("RESULTS_COMPRESS", "false").lower() in ("1", "true", "yes")
+
+
+@dataclass
+class ResultSummary:
+    jobs: int = 0
+    successful_jobs: int = 0
+    failed_jobs: int = 0
+    partial_jobs: int = 0
+    candidates: int = 0
+    top_candidates: int = 0
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    """Open a results file, transparently gzip-compressed if the name ends in .gz"""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class ResultWriter:
+    """
+    Append-only JSON Lines writer for job results.
+
+    Every JobResult is written and flushed as soon as its job finishes, so a crash
+    loses at most the jobs still in flight, memory stays flat however large the run
+    gets, and other tools can tail the file while the run is going.
+    """
+
+    def __init__(self, path: str = RESULTS_JSONL_PATH, compress: bool = RESULTS_COMPRESS,
+                 compact: bool = True, append: bool = False):
+        """
+        Args:
+            path: JSON Lines output file
+            compress: gzip the output (".gz" is appended to path if missing)
+            compact: Write records without whitespace
+            append: Keep existing records instead of truncating the file
+        """
+        if compress and not path.endswith(".gz"):
+            path += ".gz"
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.summary = ResultSummary()
+        self._separators = (",", ":") if compact else (", ", ": ")
+        self._lock = threading.Lock()
+        self._file = _open(path, "a" if append else "w")
+
+    def write(self, result: JobResult) -> None:
+        """
+        Append one job's result and flush it to disk.
+
+        Args:
+            result: Finished JobResult
+        """
+        if self._separators == (",", ":"):
+            line = result.model_dump_json()
+        else:
+            line = json.dumps(result.model_dump(), separators=self._separators)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.summary.jobs += 1
+            if result.error:
+                self.summary.failed_jobs += 1
+            else:
+                self.summary.successful_jobs += 1
+            if result.skipped:
+                self.summary.partial_jobs += 1
+            self.summary.candidates += result.candidates_found
+            self.summary.top_candidates += len(result.top_candidates)
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def summary_dict(self) -> Dict[str, int]:
+        """Running totals over every result written so far"""
+        with self._lock:
+            return asdict(self.summary)
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def iter_result_records(path: str = RESULTS_JSONL_PATH) -> Iterator[Dict[str, Any]]:
+    """
+    Read raw result records back from a JSON Lines file, one at a time.
+
+    A truncated last line (e.g. from a crash mid-write) is skipped.
+
+    Args:
+        path: JSON Lines file written by ResultWriter
+
+    Yields:
+        One dict per JobResult
+    """
+    with _open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"Skipping incomplete result record in {path}")
+
+
+def iter_results(path: str = RESULTS_JSONL_PATH) -> Iterator[JobResult]:
+    """Like iter_result_records(), validated into JobResult objects"""
+    for record in iter_result_records(path):
+        yield JobResult.model_validate(record)
+
+
+def finalize_results(path: str = RESULTS_JSONL_PATH, final_path: str = "final.json", indent: int = 2) -> int:
+    """
+    Convert a JSON Lines results file into the legacy final.json array.
+
+    Records are streamed one at a time, so memory use does not depend on the number of
+    results. The output is byte-for-byte what json.dump(list, indent=indent) produces.
+
+    Args:
+        path: JSON Lines file written by ResultWriter
+        final_path: Output JSON array file
+        indent: Indentation of the output
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    pad = " " * indent
+    tmp_path = final_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as out:
+        out.write("[")
+        for record in iter_result_records(path):
+            body = json.dumps(record, indent=indent).replace("\n", "\n" + pad)
+            out.write(("," if count else "") + "\n" + pad + body)
+            count += 1
+        out.write("\n]" if count else "]")
+    os.replace(tmp_path, final_path)
+    return count
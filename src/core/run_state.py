@@ -0,0 +1,288 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from ..data.models import JobData, JobResult, CandidateScores
+from ..services.urls import canonicalize_linkedin_url
+
+RUN_STATE_PATH = os.environ.get("RUN_STATE_PATH", ".cache/runs.sqlite3")
+
+# Candidate stages, in pipeline order
+FETCHED = "fetched"
+SCORED = "scored"
+DROPPED = "dropped"
+OUTREACH_DONE = "outreach_done"
+
+
+def new_run_id() -> str:
+    """Sortable, unique run identifier, e.g. 20261018-153000-1a2b3c"""
+    return time.strftime("%Y%m%d-%H%M%S") + "-" + uuid.uuid4().hex[:6]
+
+
+def _job_id(job: JobData) -> str:
+    return hashlib.sha256(job.model_dump_json().encode("utf-8")).hexdigest()[:16]
+
+
+def _jd_id(job_description: str) -> str:
+    """Identity of a JD text, insensitive to whitespace"""
+    return hashlib.sha256(" ".join(job_description.split()).encode("utf-8")).hexdigest()[:16]
+
+
+class RunStateStore:
+    """
+    Durable record of a sourcing run's progress (SQLite in WAL mode).
+
+    Per JD it stores the parsed job, so a resumed run processes exactly the jobs it
+    started with (job checkpoints are keyed on the parsed job, and a fresh LLM parse
+    may come out differently). Per job it stores the search result and the final
+    JobResult; per candidate it stores how far the candidate got (fetched, scored or
+    dropped, outreach done) along with the data produced at that stage. Every write is
+    committed immediately, so a crashed run can be resumed without paying for completed
+    work again.
+    """
+
+    def __init__(self, path: str = RUN_STATE_PATH):
+        """
+        Args:
+            path: SQLite file holding every run's state
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS run_jds (
+                run_id TEXT NOT NULL,
+                jd_id TEXT NOT NULL,
+                job TEXT NOT NULL,
+                PRIMARY KEY (run_id, jd_id)
+            );
+            CREATE TABLE IF NOT EXISTS run_jobs (
+                run_id TEXT NOT NULL,
+                job_id TEXT NOT NULL,
+                title TEXT NOT NULL,
+                urls TEXT,
+                result TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (run_id, job_id)
+            );
+            CREATE TABLE IF NOT EXISTS run_profiles (
+                run_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                PRIMARY KEY (run_id, url)
+            );
+            CREATE TABLE IF NOT EXISTS run_candidates (
+                run_id TEXT NOT NULL,
+                job_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                scores TEXT,
+                outreach_message TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (run_id, job_id, url)
+            );
+            """
+        )
+        self._conn.commit()
+
+    def _execute(self, sql: str, params: Tuple = ()) -> None:
+        with self._lock:
+            self._conn.execute(sql, params)
+            self._conn.commit()
+
+    def _fetchone(self, sql: str, params: Tuple = ()) -> Optional[Tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def start_run(self, run_id: Optional[str] = None) -> "RunState":
+        """
+        Begin a new run, or reopen an existing one to resume it.
+
+        Args:
+            run_id: Existing run to resume (None starts a new run)
+
+        Returns:
+            RunState handle for the run
+        """
+        now = time.time()
+        if run_id is None:
+            run_id = new_run_id()
+            self._execute("INSERT INTO runs (run_id, status, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                          (run_id, "running", now, now))
+        else:
+            if self._fetchone("SELECT 1 FROM runs WHERE run_id = ?", (run_id,)) is None:
+                raise ValueError(f"Unknown run id: {run_id}")
+            self._execute("UPDATE runs SET status = ?, updated_at = ? WHERE run_id = ?", ("running", now, run_id))
+        return RunState(self, run_id)
+
+    def list_runs(self) -> List[Dict[str, Any]]:
+        """All runs, newest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT run_id, status, created_at, updated_at FROM runs ORDER BY created_at DESC"
+            ).fetchall()
+        return [dict(zip(("run_id", "status", "created_at", "updated_at"), row)) for row in rows]
+
+
+class RunState:
+    """Checkpoint reads and writes for one run"""
+
+    def __init__(self, store: RunStateStore, run_id: str):
+        self.store = store
+        self.run_id = run_id
+
+    def finish(self) -> None:
+        """Mark the run as completed"""
+        self.store._execute("UPDATE runs SET status = ?, updated_at = ? WHERE run_id = ?",
+                            ("completed", time.time(), self.run_id))
+
+    # JD level
+
+    def get_job(self, job_description: str) -> Optional[JobData]:
+        """The job a JD was parsed into earlier in this run"""
+        row = self.store._fetchone("SELECT job FROM run_jds WHERE run_id = ? AND jd_id = ?",
+                                   (self.run_id, _jd_id(job_description)))
+        return JobData.model_validate_json(row[0]) if row else None
+
+    def record_job(self, job_description: str, job: JobData) -> None:
+        self.store._execute(
+            "INSERT OR IGNORE INTO run_jds (run_id, jd_id, job) VALUES (?, ?, ?)",
+            (self.run_id, _jd_id(job_description), job.model_dump_json())
+        )
+
+    # Job level
+
+    def get_result(self, job: JobData) -> Optional[JobResult]:
+        """The stored result of a job that already finished in this run"""
+        row = self.store._fetchone("SELECT result FROM run_jobs WHERE run_id = ? AND job_id = ?",
+                                   (self.run_id, _job_id(job)))
+        return JobResult.model_validate_json(row[0]) if row and row[0] else None
+
+    def record_result(self, job: JobData, result: JobResult) -> None:
+        # Failed and partial jobs are not checkpointed so a resume retries them
+        if result.error or result.skipped:
+            return
+        self.store._execute(
+            """
+            INSERT INTO run_jobs (run_id, job_id, title, result, updated_at) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(run_id, job_id) DO UPDATE SET result = excluded.result, updated_at = excluded.updated_at
+            """,
+            (self.run_id, _job_id(job), job.title, result.model_dump_json(), time.time())
+        )
+
+    def get_search(self, job: JobData) -> Optional[List[str]]:
+        """Profile URLs the job's search returned earlier in this run"""
+        row = self.store._fetchone("SELECT urls FROM run_jobs WHERE run_id = ? AND job_id = ?",
+                                   (self.run_id, _job_id(job)))
+        return json.loads(row[0]) if row and row[0] is not None else None
+
+    def record_search(self, job: JobData, urls: List[str]) -> None:
+        self.store._execute(
+            """
+            INSERT INTO run_jobs (run_id, job_id, title, urls, updated_at) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(run_id, job_id) DO UPDATE SET urls = excluded.urls, updated_at = excluded.updated_at
+            """,
+            (self.run_id, _job_id(job), job.title, json.dumps(urls), time.time())
+        )
+
+    # Candidate level
+
+    def get_profile(self, url: str) -> Optional[Dict[str, Any]]:
+        """A profile fetched earlier in this run"""
+        row = self.store._fetchone("SELECT payload FROM run_profiles WHERE run_id = ? AND url = ?",
+                                   (self.run_id, canonicalize_linkedin_url(url)))
+        return json.loads(row[0]) if row else None
+
+    def record_profile(self, job: JobData, url: str, profile: Dict[str, Any]) -> None:
+        now = time.time()
+        canonical = canonicalize_linkedin_url(url)
+        with self.store._lock:
+            self.store._conn.execute(
+                "INSERT OR IGNORE INTO run_profiles (run_id, url, payload) VALUES (?, ?, ?)",
+                (self.run_id, canonical, json.dumps(profile))
+            )
+            self.store._conn.execute(
+                "INSERT OR IGNORE INTO run_candidates (run_id, job_id, url, stage, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (self.run_id, _job_id(job), canonical, FETCHED, now)
+            )
+            self.store._conn.commit()
+
+    def get_scores(self, job: JobData, url: str) -> Tuple[bool, Optional[CandidateScores]]:
+        """
+        Returns:
+            (done, scores): done is True if the candidate was already scored or dropped;
+            scores is None for a dropped candidate
+        """
+        row = self.store._fetchone(
+            "SELECT stage, scores FROM run_candidates WHERE run_id = ? AND job_id = ? AND url = ?",
+            (self.run_id, _job_id(job), canonicalize_linkedin_url(url))
+        )
+        if row is None or row[0] == FETCHED:
+            return False, None
+        if row[0] == DROPPED:
+            return True, None
+        if row[1] is None:
+            # Outreach recorded for a candidate whose scores were never recorded in this run
+            return False, None
+        return True, CandidateScores.model_validate_json(row[1])
+
+    def record_scores(self, job: JobData, url: str, scores: Optional[CandidateScores]) -> None:
+        """
+        Record a scored candidate, or a dropped one when scores is None. Candidates whose
+        scoring call failed must not be recorded, so a resume scores them again.
+        """
+        self.store._execute(
+            """
+            INSERT INTO run_candidates (run_id, job_id, url, stage, scores, updated_at) VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(run_id, job_id, url) DO UPDATE SET
+                stage = excluded.stage, scores = excluded.scores, updated_at = excluded.updated_at
+            """,
+            (self.run_id, _job_id(job), canonicalize_linkedin_url(url), SCORED if scores else DROPPED,
+             scores.model_dump_json() if scores else None, time.time())
+        )
+
+    def get_outreach(self, job: JobData, url: str) -> Optional[str]:
+        row = self.store._fetchone(
+            "SELECT outreach_message FROM run_candidates WHERE run_id = ? AND job_id = ? AND url = ?",
+            (self.run_id, _job_id(job), canonicalize_linkedin_url(url))
+        )
+        return row[0] if row else None
+
+    def record_outreach(self, job: JobData, url: str, message: str) -> None:
+        """
+        Record a candidate's outreach message, creating the candidate's row if it has none
+        (e.g. its profile came from another job, so it was never recorded as fetched here)
+        """
+        self.store._execute(
+            """
+            INSERT INTO run_candidates (run_id, job_id, url, stage, outreach_message, updated_at) VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(run_id, job_id, url) DO UPDATE SET
+                stage = excluded.stage, outreach_message = excluded.outreach_message, updated_at = excluded.updated_at
+            """,
+            (self.run_id, _job_id(job), canonicalize_linkedin_url(url), OUTREACH_DONE, message, time.time())
+        )
+
+    def progress(self) -> Dict[str, int]:
+        """Counts of jobs and candidates per stage, for status output"""
+        with self.store._lock:
+            jobs_done = self.store._conn.execute(
+                "SELECT COUNT(*) FROM run_jobs WHERE run_id = ? AND result IS NOT NULL", (self.run_id,)
+            ).fetchone()[0]
+            stages = self.store._conn.execute(
+                "SELECT stage, COUNT(*) FROM run_candidates WHERE run_id = ? GROUP BY stage", (self.run_id,)
+            ).fetchall()
+        return {"jobs_done": jobs_done, **{stage: count for stage, count in stages}}
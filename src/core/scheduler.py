@@ -0,0 +1,227 @@
+import os
+import math
+import time
+import threading
+from typing import Any, Dict, List, Optional
+from ..data.models import JobData
+from ..services.metrics import get_metrics
+from ..services.quota import QuotaTracker, get_quota_tracker
+from ..services.rate_limiter import OPENAI
+
+# Candidates fetched at once across all jobs (0 = jobs run at once x fetch workers per job)
+SCHEDULER_CONCURRENCY = int(os.environ.get("SCHEDULER_CONCURRENCY", "0"))
+# Candidates scored per job unless the job sets max_candidates (0 = all found)
+SCHEDULER_CANDIDATES_PER_JOB = int(os.environ.get("SCHEDULER_CANDIDATES_PER_JOB", "0"))
+# Below this share of the daily quota left, per-job caps shrink in proportion...
+SCHEDULER_DEGRADE_BELOW = float(os.environ.get("SCHEDULER_DEGRADE_BELOW", "0.25"))
+# ...but never below this many candidates per job while any quota is left
+SCHEDULER_MIN_CANDIDATES = int(os.environ.get("SCHEDULER_MIN_CANDIDATES", "5"))
+# OpenAI tokens reserved per admitted candidate until the run has measured its own average
+SCHEDULER_TOKENS_PER_CANDIDATE = int(os.environ.get("SCHEDULER_TOKENS_PER_CANDIDATE", "1500"))
+# OpenAI tokens reserved per running job for the outreach messages written at its end
+SCHEDULER_OUTREACH_TOKENS_PER_JOB = int(os.environ.get("SCHEDULER_OUTREACH_TOKENS_PER_JOB", "5000"))
+# Seconds the quota usage is reused before it is read again
+_QUOTA_REFRESH_SECONDS = 0.1
+# Finished candidates needed before the measured token average replaces the default
+_MIN_MEASURED_CANDIDATES = 10
+
+
+class JobTicket:
+    """
+    A running job's place in the scheduler: wrap every candidate's fetch in admit() /
+    release(), and call finish() once an admitted candidate is scored or dropped.
+
+    skipped counts every candidate not admitted; quota_skipped only those the job's own
+    budget would have allowed, i.e. left out because the daily quota ran low.
+    """
+
+    def __init__(self, scheduler: "Scheduler", job: JobData, candidates: int, seq: int):
+        budget = job.max_candidates if job.max_candidates is not None else SCHEDULER_CANDIDATES_PER_JOB or None
+        self.job = job
+        self.priority = job.priority
+        self.budget = candidates if budget is None else min(budget, candidates)
+        self.seq = seq
+        self.admitted = 0
+        self.skipped = 0
+        self.quota_skipped = 0
+        self.waiting = 0
+        self._scheduler = scheduler
+
+    def admit(self) -> bool:
+        """Block until this job may process one more candidate; False if it should skip it"""
+        return self._scheduler._admit(self)
+
+    def release(self) -> None:
+        """Give back the slot of an admitted candidate"""
+        self._scheduler._release()
+
+    def finish(self, count: int = 1) -> None:
+        """Stop reserving tokens for admitted candidates that were scored or dropped"""
+        self._scheduler._finish(count)
+
+    def close(self) -> None:
+        """Remove the job from the scheduler once its candidates are done"""
+        self._scheduler._close(self)
+
+
+class Scheduler:
+    """
+    Shares candidate processing between the jobs of a run by priority and daily quota.
+
+    Every candidate a job fetches and scores first takes one of `concurrency` slots.
+    Free slots go to the highest-priority job with a candidate waiting and, among jobs
+    of equal priority, to the one admitted the fewest candidates so far, so a job with
+    thousands of candidates proceeds in step with the small ones instead of starving them.
+
+    Each job is capped at its candidate budget (job.max_candidates, or
+    SCHEDULER_CANDIDATES_PER_JOB). When less than `degrade_below` of any daily quota is
+    left, caps shrink in proportion to what is left, down to `min_candidates`, so the
+    remaining budget is spread over all jobs rather than spent on the first ones.
+
+    Tokens are only reported once a candidate is scored, so every admitted candidate
+    reserves the average tokens a candidate has cost so far until it is finished, and
+    every running job reserves outreach_tokens_per_job until it is closed; no candidate
+    is admitted whose reservation would not fit in the OpenAI token quota.
+    Candidate URLs are ranked by relevance, so a capped job keeps its best candidates.
+    """
+
+    def __init__(self, concurrency: int = 0, quota: Optional[QuotaTracker] = None,
+                 degrade_below: float = SCHEDULER_DEGRADE_BELOW, min_candidates: int = SCHEDULER_MIN_CANDIDATES,
+                 outreach_tokens_per_job: int = SCHEDULER_OUTREACH_TOKENS_PER_JOB):
+        """
+        Args:
+            concurrency: Candidates fetched at once across all jobs (0 = SCHEDULER_CONCURRENCY, or 12)
+            quota: Daily quota tracker (defaults to get_quota_tracker(); None when disabled)
+            degrade_below: Remaining quota share below which per-job caps shrink
+            min_candidates: Smallest cap per job while quota is left
+            outreach_tokens_per_job: OpenAI tokens reserved for each running job's outreach
+        """
+        self.concurrency = max(1, concurrency or SCHEDULER_CONCURRENCY or 12)
+        self.quota = quota if quota is not None else get_quota_tracker()
+        self.degrade_below = degrade_below
+        self.min_candidates = max(0, min_candidates)
+        self.outreach_tokens_per_job = max(0, outreach_tokens_per_job)
+        self._cond = threading.Condition()
+        self._tickets: List[JobTicket] = []
+        self._seq = 0
+        self._in_flight = 0
+        self._fraction = 1.0
+        self._tokens_left: Optional[int] = None
+        self._quota_read_at = 0.0
+        self._outstanding = 0
+        self._finished = 0
+        self._tokens_at_start = self.quota.used(OPENAI) if self.quota is not None else 0
+        self.tokens_per_candidate = float(SCHEDULER_TOKENS_PER_CANDIDATE)
+
+    def register(self, job: JobData, candidates: int) -> JobTicket:
+        """
+        Add a job whose candidates are about to be processed.
+
+        Args:
+            job: The job (its priority and max_candidates are used)
+            candidates: Number of candidate URLs found for it
+
+        Returns:
+            Ticket to admit the job's candidates with; close() it when done
+        """
+        with self._cond:
+            self._seq += 1
+            ticket = JobTicket(self, job, candidates, self._seq)
+            self._tickets.append(ticket)
+            return ticket
+
+    def _refresh_quota(self) -> None:
+        """Re-read the quota left and the measured tokens per candidate, at most every _QUOTA_REFRESH_SECONDS"""
+        now = time.monotonic()
+        if self.quota is None or now - self._quota_read_at < _QUOTA_REFRESH_SECONDS:
+            return
+        self._fraction = self.quota.remaining_fraction()
+        self._tokens_left = self.quota.remaining(OPENAI)
+        if self._finished >= _MIN_MEASURED_CANDIDATES:
+            spent = self.quota.used(OPENAI) - self._tokens_at_start
+            self.tokens_per_candidate = max(1.0, spent / self._finished)
+        self._quota_read_at = now
+
+    def cap(self, ticket: JobTicket) -> int:
+        """Candidates the job may be admitted in total, given the quota left now"""
+        self._refresh_quota()
+        fraction = self._fraction
+        if fraction >= self.degrade_below or self.degrade_below <= 0:
+            return ticket.budget
+        scaled = math.ceil(ticket.budget * fraction / self.degrade_below)
+        return min(ticket.budget, max(self.min_candidates, scaled))
+
+    def _skip_reason(self, ticket: JobTicket) -> Optional[str]:
+        self._refresh_quota()
+        if self._tokens_left is not None:
+            reserved = (self._outstanding + 1) * self.tokens_per_candidate + \
+                len(self._tickets) * self.outreach_tokens_per_job
+            if self._tokens_left < reserved:
+                return "quota"
+        if ticket.admitted >= self.cap(ticket):
+            return "capped"
+        return None
+
+    def _next(self) -> Optional[JobTicket]:
+        """Job the next free slot goes to (caller holds the lock)"""
+        waiting = [ticket for ticket in self._tickets if ticket.waiting and ticket.admitted < self.cap(ticket)]
+        return min(waiting, key=lambda t: (-t.priority, t.admitted, t.seq), default=None)
+
+    def _admit(self, ticket: JobTicket) -> bool:
+        metrics = get_metrics()
+        with self._cond:
+            ticket.waiting += 1
+            try:
+                while True:
+                    reason = self._skip_reason(ticket)
+                    if reason is not None:
+                        ticket.skipped += 1
+                        # A cap below the job's budget is the quota degrading it
+                        if reason == "quota" or ticket.admitted < ticket.budget:
+                            ticket.quota_skipped += 1
+                        metrics.inc("scheduler_candidates_total", result=reason)
+                        return False
+                    if self._in_flight < self.concurrency and self._next() is ticket:
+                        self._in_flight += 1
+                        self._outstanding += 1
+                        ticket.admitted += 1
+                        metrics.inc("scheduler_candidates_total", result="admitted")
+                        self._cond.notify_all()
+                        return True
+                    # The timeout picks up quota used by other processes
+                    self._cond.wait(_QUOTA_REFRESH_SECONDS)
+            finally:
+                ticket.waiting -= 1
+
+    def _release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def _finish(self, count: int) -> None:
+        with self._cond:
+            self._outstanding -= count
+            self._finished += count
+            self._cond.notify_all()
+
+    def _close(self, ticket: JobTicket) -> None:
+        with self._cond:
+            if ticket in self._tickets:
+                self._tickets.remove(ticket)
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Running jobs' progress and today's quota usage"""
+        with self._cond:
+            jobs = [
+                {"job": t.job.title, "priority": t.priority, "admitted": t.admitted,
+                 "skipped": t.skipped, "quota_skipped": t.quota_skipped, "cap": self.cap(t)}
+                for t in self._tickets
+            ]
+        return {
+            "in_flight": self._in_flight,
+            "concurrency": self.concurrency,
+            "tokens_per_candidate": round(self.tokens_per_candidate),
+            "jobs": jobs,
+            "quota": self.quota.usage() if self.quota is not None else {},
+        }
@@ -1,19 +1,133 @@
 import os
 import json
-from typing import Optional, Dict, Any
-from langchain_openai import ChatOpenAI
-from langchain_core.output_parsers import JsonOutputParser
-from pydantic import BaseModel, Field, SecretStr
-from ..data.prompts import scoring_prompt
+import hashlib
+from functools import lru_cache
+from typing import Optional, Dict, Any, List
+from ..data import prompts
 from ..data.models import ProfileData, CandidateScores, JobData
-from dotenv import load_dotenv
+from ..services.llm_cache import cached_invoke, cached_batch
+from ..services.llm_client import get_llm, DEFAULT_MODEL
+from .local_scoring import hybrid_scores
+from .prompt_compaction import compact_profile, serialize, PROMPT_COMPACTION_ENABLED
 
-# Initialize LangChain components
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-parser = JsonOutputParser()
 
+# LangChain components are created on first use and shared across calls
+def _llm():
+    return get_llm(temperature=0)
 
-def score_candidate(profile: Dict[Any, Any], job: JobData) -> CandidateScores:
+
+@lru_cache(maxsize=None)
+def _parser():
+    from langchain_core.output_parsers import JsonOutputParser
+    return JsonOutputParser()
+
+# Batch scoring settings
+SCORING_BATCH_SIZE = int(os.environ.get("SCORING_BATCH_SIZE", "5"))
+SCORING_MAX_CONCURRENCY = int(os.environ.get("SCORING_MAX_CONCURRENCY", "4"))
+SCORING_PACKED = os.environ.get("SCORING_PACKED", "false").lower() in ("1", "true", "yes")
+# "hybrid" asks the LLM for the subjective dimensions only and scores location and tenure
+# locally (see local_scoring.py); "llm" asks the LLM for all six
+SCORING_MODE = os.environ.get("SCORING_MODE", "hybrid").lower()
+SCORING_HYBRID = SCORING_MODE == "hybrid"
+
+# Scoring runs at temperature 0, so responses stay reusable for a long time
+SCORING_CACHE_TTL_SECONDS = float(os.environ.get("LLM_CACHE_TTL_SCORING_HOURS", "720")) * 3600
+
+
+def _empty_scores() -> CandidateScores:
+    """All-zero scores of an empty profile (a failed scoring call returns None instead)"""
+    return CandidateScores(
+        education_score=0,
+        career_trajectory_score=0,
+        company_relevance_score=0,
+        experience_match_score=0,
+        location_match_score=0,
+        tenure_score=0,
+        fit_score=0
+    )
+
+
+def _relevant_profile_data(profile: Dict[Any, Any], keywords: List[str]) -> Dict[str, Any]:
+    """Extract only the fields the scoring prompt uses, within the prompt token budget"""
+    if PROMPT_COMPACTION_ENABLED:
+        return compact_profile(profile, keywords, extra_fields=() if SCORING_HYBRID else ("city",))
+    data = {
+        "educations": profile.get("educations", []),
+        "experiences": profile.get("experiences", []),
+    }
+    if not SCORING_HYBRID:
+        data["city"] = profile.get("city", "")
+    return data
+
+
+def _dumps(data: Any) -> str:
+    """Serialize prompt data, compactly unless compaction is disabled"""
+    return serialize(data) if PROMPT_COMPACTION_ENABLED else json.dumps(data, indent=2)
+
+
+def _job_inputs(job: JobData) -> Dict[str, str]:
+    """Prompt inputs describing the job"""
+    inputs = {
+        "job_title": job.title,
+        "experience_level": job.experience_level,
+        "keywords": ", ".join(job.keywords)
+    }
+    if not SCORING_HYBRID:
+        inputs["job_location"] = job.location
+    return inputs
+
+
+def _prompt(name: str):
+    """The scoring prompt of the current mode, e.g. _prompt("batch_scoring_prompt")"""
+    return getattr(prompts, f"hybrid_{name}" if SCORING_HYBRID else name)
+
+
+def _to_scores(raw_scores: Dict[str, Any], profile: Dict[Any, Any], job: JobData) -> CandidateScores:
+    """Ensure all scores are numeric and validate with Pydantic"""
+    if SCORING_HYBRID:
+        return hybrid_scores(raw_scores, profile, job)
+    return CandidateScores(
+        education_score=float(raw_scores.get('education_score', 0)),
+        career_trajectory_score=float(raw_scores.get('career_trajectory_score', 0)),
+        company_relevance_score=float(raw_scores.get('company_relevance_score', 0)),
+        experience_match_score=float(raw_scores.get('experience_match_score', 0)),
+        location_match_score=float(raw_scores.get('location_match_score', 0)),
+        tenure_score=float(raw_scores.get('tenure_score', 0)),
+        fit_score=float(raw_scores.get('fit_score', 0))
+    )
+
+
+def scoring_fingerprint(job: JobData) -> str:
+    """
+    Hash of everything that goes into the LLM part of a candidate's scores: the scoring
+    mode, model and prompts, and the job fields the prompts show (the job location only
+    in llm mode; in hybrid mode it only feeds the local location score).
+    """
+    prefix = "hybrid_" if SCORING_HYBRID else ""
+    data = {
+        "mode": SCORING_MODE,
+        "model": DEFAULT_MODEL,
+        "prompts": [
+            getattr(prompts, f"{prefix}{name}_template")
+            for name in ("scoring", "batch_scoring", "multi_job_scoring")
+        ],
+        "compaction": PROMPT_COMPACTION_ENABLED,
+        "job": _job_inputs(job),
+    }
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def refresh_local_scores(scores: CandidateScores, profile: Dict[Any, Any], job: JobData) -> CandidateScores:
+    """
+    Recompute the locally scored dimensions (location, tenure and the fit score) of
+    stored scores for the current job; scores of llm mode are returned unchanged.
+    """
+    if not SCORING_HYBRID:
+        return scores
+    return hybrid_scores(scores.model_dump(), profile, job)
+
+
+def score_candidate(profile: Dict[Any, Any], job: JobData) -> Optional[CandidateScores]:
     """
     Score a candidate based on their LinkedIn profile data and job requirements.
     
@@ -22,63 +136,198 @@ def score_candidate(profile: Dict[Any, Any], job: JobData) -> CandidateScores:
         job: Job details from parsed_jobs.json
         
     Returns:
-        CandidateScores object containing all scores
+        CandidateScores object containing all scores, or None if the scoring call failed
+        (an empty profile gets all-zero scores)
     """
     if not profile:
-        return CandidateScores(
-            education_score=0,
-            career_trajectory_score=0,
-            company_relevance_score=0,
-            experience_match_score=0,
-            location_match_score=0,
-            tenure_score=0,
-            fit_score=0
-        )
-    
-    # Extract only relevant fields from profile
-    profile_data = {
-        "educations": profile.get("educations", []),
-        "experiences": profile.get("experiences", []),
-        "city": profile.get("city", "")
-    }
+        return _empty_scores()
     
     # Prepare the prompt inputs
     inputs = {
-        "job_title": job.title,
-        "job_location": job.location,
-        "experience_level": job.experience_level,
-        "keywords": ", ".join(job.keywords),
-        "profile_data": json.dumps(profile_data, indent=2)
+        **_job_inputs(job),
+        "profile_data": _dumps(_relevant_profile_data(profile, job.keywords))
     }
     
     try:
-        # Create the chain
-        chain = scoring_prompt | llm | parser
-        
-        # Get the scores
-        raw_scores = chain.invoke(inputs)
-        
-        # Ensure all scores are numeric and validate with Pydantic
-        scores = CandidateScores(
-            education_score=float(raw_scores.get('education_score', 0)),
-            career_trajectory_score=float(raw_scores.get('career_trajectory_score', 0)),
-            company_relevance_score=float(raw_scores.get('company_relevance_score', 0)),
-            experience_match_score=float(raw_scores.get('experience_match_score', 0)),
-            location_match_score=float(raw_scores.get('location_match_score', 0)),
-            tenure_score=float(raw_scores.get('tenure_score', 0)),
-            fit_score=float(raw_scores.get('fit_score', 0))
+        # Get the scores (served from the LLM response cache when the prompt was seen before)
+        raw_scores = cached_invoke(
+            _llm(), _prompt("scoring_prompt").invoke(inputs), parse=_parser().parse,
+            namespace="scoring", ttl_seconds=SCORING_CACHE_TTL_SECONDS
         )
         
-        return scores
+        return _to_scores(raw_scores, profile, job)
         
     except Exception as e:
         print(f"Error scoring candidate: {e}")
-        return CandidateScores(
-            education_score=0,
-            career_trajectory_score=0,
-            company_relevance_score=0,
-            experience_match_score=0,
-            location_match_score=0,
-            tenure_score=0,
-            fit_score=0
-        ) 
\ No newline at end of file
+        return None
+
+
+def _score_batch_individually(profiles: List[Dict[Any, Any]], job: JobData,
+                              max_concurrency: int) -> List[Optional[CandidateScores]]:
+    """One prompt per candidate, sent concurrently with llm.batch; None marks a failure"""
+    job_inputs = _job_inputs(job)
+    inputs = [
+        {**job_inputs, "profile_data": _dumps(_relevant_profile_data(profile, job.keywords))}
+        for profile in profiles
+    ]
+    raw_results = cached_batch(
+        _llm(), [_prompt("scoring_prompt").invoke(i) for i in inputs], parse=_parser().parse,
+        namespace="scoring", ttl_seconds=SCORING_CACHE_TTL_SECONDS, max_concurrency=max_concurrency
+    )
+    
+    results: List[Optional[CandidateScores]] = []
+    for profile, raw in zip(profiles, raw_results):
+        try:
+            if isinstance(raw, Exception):
+                raise raw
+            results.append(_to_scores(raw, profile, job))
+        except Exception as e:
+            print(f"Error scoring candidate in batch: {e}")
+            results.append(None)
+    return results
+
+
+def _score_batch_packed(profiles: List[Dict[Any, Any]], job: JobData, batch_size: int,
+                        max_concurrency: int) -> List[Optional[CandidateScores]]:
+    """Several candidates per prompt, each prompt returning a JSON array; None marks a failure"""
+    job_inputs = _job_inputs(job)
+    chunks = [list(range(i, min(i + batch_size, len(profiles)))) for i in range(0, len(profiles), batch_size)]
+    inputs = [
+        {
+            **job_inputs,
+            "candidates": _dumps(
+                [{"candidate_id": idx, **_relevant_profile_data(profiles[idx], job.keywords)} for idx in chunk]
+            )
+        }
+        for chunk in chunks
+    ]
+    raw_results = cached_batch(
+        _llm(), [_prompt("batch_scoring_prompt").invoke(i) for i in inputs], parse=_parser().parse,
+        namespace="scoring_packed", ttl_seconds=SCORING_CACHE_TTL_SECONDS, max_concurrency=max_concurrency
+    )
+    
+    results: List[Optional[CandidateScores]] = [None] * len(profiles)
+    for chunk, raw in zip(chunks, raw_results):
+        if isinstance(raw, Exception) or not isinstance(raw, list):
+            print(f"Error scoring packed batch: {raw if isinstance(raw, Exception) else 'response is not a JSON array'}")
+            continue
+        for entry in raw:
+            try:
+                idx = int(entry["candidate_id"])
+                if idx in chunk:
+                    results[idx] = _to_scores(entry, profiles[idx], job)
+            except Exception as e:
+                print(f"Error parsing packed candidate score: {e}")
+    return results
+
+
+def score_candidates(profiles: List[Dict[Any, Any]], job: JobData,
+                     batch_size: int = SCORING_BATCH_SIZE,
+                     max_concurrency: int = SCORING_MAX_CONCURRENCY,
+                     packed: bool = SCORING_PACKED) -> List[Optional[CandidateScores]]:
+    """
+    Score many candidates for one job with as few LLM round trips as possible.
+    
+    By default every candidate gets its own prompt and the prompts are sent concurrently
+    with llm.batch (cached prompts are not sent at all). With packed=True, batch_size candidates share one prompt that
+    returns a JSON array. Candidates whose result is missing or fails to parse are
+    re-scored individually, so one bad entry never costs the rest of the batch.
+    
+    Args:
+        profiles: LinkedIn profile data from the API
+        job: Job details
+        batch_size: Candidates per packed prompt, or per llm.batch call
+        max_concurrency: Maximum LLM requests in flight
+        packed: Pack several candidates into one prompt
+        
+    Returns:
+        CandidateScores for every profile, in input order; None for a profile whose
+        scoring failed even when retried on its own
+    """
+    results: List[Optional[CandidateScores]] = [None] * len(profiles)
+    pending = []
+    for i, profile in enumerate(profiles):
+        if profile:
+            pending.append(i)
+        else:
+            results[i] = _empty_scores()
+    if not pending:
+        return results
+    
+    batch_size = max(1, batch_size)
+    max_concurrency = max(1, max_concurrency)
+    try:
+        pending_profiles = [profiles[i] for i in pending]
+        if packed:
+            batch_results = _score_batch_packed(pending_profiles, job, batch_size, max_concurrency)
+        else:
+            batch_results = []
+            for start in range(0, len(pending_profiles), batch_size):
+                batch_results.extend(_score_batch_individually(
+                    pending_profiles[start:start + batch_size], job, max_concurrency
+                ))
+        for i, scores in zip(pending, batch_results):
+            results[i] = scores
+    except Exception as e:
+        print(f"Error in batch scoring, falling back to per-candidate scoring: {e}")
+    
+    # Fall back to single-candidate scoring only for the entries that failed
+    for i in pending:
+        if results[i] is None:
+            results[i] = score_candidate(profiles[i], job)
+    
+    return results
+
+
+def score_candidate_multi_job(profile: Dict[Any, Any], jobs: List[JobData]) -> List[Optional[CandidateScores]]:
+    """
+    Score one candidate against several jobs with a single LLM request.
+    
+    The profile is sent once and every job is listed next to it, so the profile tokens are
+    paid for once instead of once per job. Jobs missing from the response, or whose entry
+    fails to parse, are scored individually.
+    
+    Args:
+        profile: LinkedIn profile data from the API
+        jobs: Jobs the candidate was found for
+        
+    Returns:
+        CandidateScores per job, in the order of jobs (None where scoring failed)
+    """
+    if not profile:
+        return [_empty_scores() for _ in jobs]
+    if len(jobs) == 1:
+        return [score_candidate(profile, jobs[0])]
+    
+    inputs = {
+        "jobs": _dumps([
+            {
+                "job_id": i,
+                "title": job.title,
+                **({} if SCORING_HYBRID else {"location": job.location}),
+                "experience_level": job.experience_level,
+                "keywords": job.keywords
+            }
+            for i, job in enumerate(jobs)
+        ]),
+        "profile_data": _dumps(_relevant_profile_data(profile, [kw for job in jobs for kw in job.keywords]))
+    }
+    
+    results: List[Optional[CandidateScores]] = [None] * len(jobs)
+    try:
+        raw = cached_invoke(
+            _llm(), _prompt("multi_job_scoring_prompt").invoke(inputs), parse=_parser().parse,
+            namespace="scoring_multi_job", ttl_seconds=SCORING_CACHE_TTL_SECONDS
+        )
+        for entry in raw if isinstance(raw, list) else []:
+            try:
+                idx = int(entry["job_id"])
+                if 0 <= idx < len(jobs):
+                    results[idx] = _to_scores(entry, profile, jobs[idx])
+            except Exception as e:
+                print(f"Error parsing multi-job candidate score: {e}")
+    except Exception as e:
+        print(f"Error scoring candidate against multiple jobs: {e}")
+    
+    return [scores if scores is not None else score_candidate(profile, job)
+            for scores, job in zip(results, jobs)]
@@ -0,0 +1,144 @@
+import os
+from typing import List
+from ..data.models import JobData
+from ..services.api_client import asearch_linkedin_profiles, SEARCH_MAX_PAGES, SEARCH_PAGE_SIZE
+from ..services.http_client import run_sync
+from ..services.metrics import get_metrics
+from ..services.urls import canonicalize_linkedin_url, is_linkedin_profile_url
+from .talent_pool import get_talent_pool, TALENT_POOL_MIN_CANDIDATES
+
+SEARCH_MAX_QUERIES = int(os.environ.get("SEARCH_MAX_QUERIES", "4"))
+# Cap on the merged pool, since every URL costs a profile fetch and possibly an LLM call
+SEARCH_MAX_CANDIDATES = int(os.environ.get("SEARCH_MAX_CANDIDATES", "30"))
+SITE_FILTER = "site:linkedin.com/in/"
+
+# Experience levels that read naturally in front of a job title
+SENIORITY_WORDS = ("intern", "junior", "mid", "senior", "staff", "principal", "lead", "director")
+
+
+def _quote(term: str) -> str:
+    return f'"{term}"' if " " in term.strip() else term.strip()
+
+
+def build_search_queries(job: JobData, max_queries: int = SEARCH_MAX_QUERIES) -> List[str]:
+    """
+    Search query variants for a job, most specific first.
+
+    The first query is the original title + location query, so the fan-out always covers
+    what a single search returned. The others add the job's top keywords, its seniority,
+    or search by skills alone to reach candidates whose titles differ from the job's.
+
+    Args:
+        job: Job details
+        max_queries: Maximum number of variants
+
+    Returns:
+        Distinct queries, each restricted to LinkedIn profiles
+    """
+    title = job.title.strip()
+    location = (job.location or "").strip()
+    keywords = [_quote(keyword) for keyword in job.keywords if keyword.strip()]
+    level = (job.experience_level or "").strip().lower()
+    seniority = next((word for word in SENIORITY_WORDS if word in level.split()), None)
+
+    variants = [f"{title} {location}"]
+    if keywords:
+        variants.append(f"{title} {' '.join(keywords[:2])} {location}")
+    if seniority and seniority not in title.lower():
+        variants.append(f"{seniority.title()} {title} {location}")
+    if len(keywords) > 2:
+        variants.append(f"{' '.join(keywords[:3])} {location}")
+    elif keywords:
+        variants.append(f"{' '.join(keywords)} {location}")
+
+    queries: List[str] = []
+    for variant in variants:
+        query = f"{' '.join(variant.split())} {SITE_FILTER}"
+        if query not in queries:
+            queries.append(query)
+    return queries[:max(1, max_queries)]
+
+
+def _merge_results(result_lists: List[List[str]]) -> List[str]:
+    """
+    Interleave ranked result lists (1st of every query, then 2nd, ...) into canonical,
+    de-duplicated profile URLs, so the best matches of each query come first.
+    """
+    seen = set()
+    urls = []
+    for rank in range(max((len(links) for links in result_lists), default=0)):
+        for links in result_lists:
+            if rank >= len(links) or not is_linkedin_profile_url(links[rank]):
+                continue
+            url = canonicalize_linkedin_url(links[rank])
+            if url not in seen:
+                seen.add(url)
+                urls.append(url)
+    return urls
+
+
+async def asearch_candidates(job: JobData, max_queries: int = SEARCH_MAX_QUERIES,
+                             max_candidates: int = SEARCH_MAX_CANDIDATES) -> List[str]:
+    """
+    Run the query variants of a job, most specific first, and merge the results.
+
+    Every search page is a paid call, so the variants run one after another and stop
+    as soon as max_candidates unique URLs were found, and no query asks for more pages
+    than max_candidates needs.
+
+    Args:
+        job: Job details
+        max_queries: Maximum number of query variants
+        max_candidates: Maximum number of URLs returned
+
+    Returns:
+        Canonical LinkedIn profile URLs, de-duplicated, best ranked first
+    """
+    pages = max(1, min(SEARCH_MAX_PAGES, -(-max_candidates // SEARCH_PAGE_SIZE)))
+    results: List[List[str]] = []
+    for query in build_search_queries(job, max_queries):
+        results.append(await asearch_linkedin_profiles(query, pages))
+        if len(_merge_results(results)) >= max_candidates:
+            break
+    return _merge_results(results)[:max_candidates]
+
+
+def search_candidates(job: JobData, max_queries: int = SEARCH_MAX_QUERIES,
+                      max_candidates: int = SEARCH_MAX_CANDIDATES) -> List[str]:
+    """Blocking version of asearch_candidates()"""
+    return run_sync(asearch_candidates(job, max_queries, max_candidates))
+
+
+def source_candidates(job: JobData, max_candidates: int = SEARCH_MAX_CANDIDATES,
+                      min_local: int = TALENT_POOL_MIN_CANDIDATES) -> List[str]:
+    """
+    Candidate URLs for a job, from the local talent pool first.
+
+    The external search is skipped only when at least min_local pool profiles hold the
+    job title itself; matching a keyword alone is too loose for that. Otherwise the
+    search tops up the local title and keyword matches.
+
+    Args:
+        job: Job details
+        max_candidates: Maximum number of URLs returned
+        min_local: Local title matches needed to skip the external search
+
+    Returns:
+        Canonical LinkedIn profile URLs, local matches first
+    """
+    pool = get_talent_pool()
+    if pool is not None:
+        title_matches = pool.search(job, max_candidates, title_only=True)
+        if title_matches and len(title_matches) >= min(min_local, max_candidates):
+            get_metrics().inc("talent_pool_searches_total", result="local")
+            return title_matches
+    local = pool.search(job, max_candidates) if pool is not None else []
+    get_metrics().inc("talent_pool_searches_total", result="topped_up" if local else "external")
+
+    seen = set(local)
+    urls = list(local)
+    for url in search_candidates(job, max_candidates=max_candidates):
+        if url not in seen:
+            seen.add(url)
+            urls.append(url)
+    return urls[:max_candidates]
@@ -0,0 +1,381 @@
+import os
+import json
+import time
+import uuid
+import queue
+import itertools
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from ..data import prompts
+from ..data.models import JobData, JobResult
+from ..services.http_client import get_async_client, run_sync
+from ..services.llm_cache import get_llm_cache
+from ..services.llm_client import get_llm
+from ..services.metrics import get_metrics
+from ..services.profile_cache import get_profile_cache
+from .candidate_processor import process_job
+from .parse_jd import parse_job_description, job_priority
+from .pipeline import PipelineConfig
+from .scheduler import Scheduler, SCHEDULER_CONCURRENCY
+from .talent_pool import get_talent_pool
+
+SERVICE_HOST = os.environ.get("SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.environ.get("SERVICE_PORT", "8080"))
+# Jobs processed at once; the rest wait in a queue of SERVICE_QUEUE_SIZE
+SERVICE_WORKERS = int(os.environ.get("SERVICE_WORKERS", "3"))
+SERVICE_QUEUE_SIZE = int(os.environ.get("SERVICE_QUEUE_SIZE", "32"))
+# Finished submissions kept for status and event requests
+SERVICE_MAX_SUBMISSIONS = int(os.environ.get("SERVICE_MAX_SUBMISSIONS", "1000"))
+# Retry-After sent with 429 responses when the queue is full
+SERVICE_RETRY_AFTER_SECONDS = int(os.environ.get("SERVICE_RETRY_AFTER_SECONDS", "30"))
+SERVICE_MAX_BODY_BYTES = int(os.environ.get("SERVICE_MAX_BODY_BYTES", str(1024 * 1024)))
+
+# Submission states
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """Raised by submit() when the job queue is at capacity"""
+
+
+@dataclass
+class Submission:
+    id: str
+    job_description: Optional[str] = None
+    job: Optional[JobData] = None
+    priority: int = 0
+    max_candidates: Optional[int] = None
+    status: str = QUEUED
+    created_at: float = field(default_factory=time.time)
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    result: Optional[JobResult] = None
+    error: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (COMPLETED, FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "priority": self.priority,
+            "created_at": self.created_at,
+            "job": self.job.model_dump() if self.job else None,
+            "result": self.result.model_dump() if self.result else None,
+            "error": self.error,
+        }
+
+
+class SourcingService:
+    """
+    Long-lived sourcing worker pool behind the HTTP API.
+
+    Submissions are parsed (if they are JD text) and run through process_job by a fixed
+    set of worker threads. Everything process-wide stays warm between submissions: the
+    LLM clients, the HTTP connection pool, the caches, the rate limiters and the
+    resilience state. The queue is bounded, so a flood of submissions is refused with
+    QueueFullError instead of piling up. Queued submissions start in priority order,
+    and running ones share a Scheduler for candidate slots and daily quotas.
+    """
+
+    def __init__(self, workers: int = SERVICE_WORKERS, queue_size: int = SERVICE_QUEUE_SIZE,
+                 config: Optional[PipelineConfig] = None, max_submissions: int = SERVICE_MAX_SUBMISSIONS):
+        """
+        Args:
+            workers: Jobs processed concurrently
+            queue_size: Submissions allowed to wait for a worker
+            config: Per-stage concurrency inside each job
+            max_submissions: Finished submissions kept in memory for status requests
+        """
+        self.workers = max(1, workers)
+        self.config = config or PipelineConfig()
+        self.max_submissions = max_submissions
+        self.scheduler = Scheduler(SCHEDULER_CONCURRENCY or self.workers * self.config.fetch_workers)
+        # (-priority, arrival, submission); the stop sentinels sort after every submission
+        self._queue: "queue.PriorityQueue[Tuple[float, int, Optional[Submission]]]" = \
+            queue.PriorityQueue(maxsize=max(1, queue_size))
+        self._arrivals = itertools.count()
+        self._submissions: "OrderedDict[str, Submission]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._running = 0
+        self._stopping = False
+
+    def warm_up(self) -> None:
+        """Build the clients, prompts and caches now so the first submission doesn't pay for them"""
+        get_llm()
+        get_llm(temperature=0)
+        for name in ("keyword_extraction_prompt", "scoring_prompt", "hybrid_scoring_prompt", "outreach_prompt"):
+            getattr(prompts, name)
+
+        async def open_pool() -> None:
+            get_async_client()
+        run_sync(open_pool())
+        get_llm_cache()
+        get_profile_cache()
+        get_talent_pool()
+
+    def start(self) -> "SourcingService":
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"service-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting submissions and let the workers finish the queued ones"""
+        with self._cond:
+            self._stopping = True
+        for _ in self._threads:
+            self._queue.put((float("inf"), next(self._arrivals), None))
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def submit(self, job_description: Optional[str] = None, job: Optional[JobData] = None,
+               priority: Optional[int] = None, max_candidates: Optional[int] = None) -> Submission:
+        """
+        Queue a job, given as JD text or as already parsed JobData.
+
+        Args:
+            job_description: JD text to parse
+            job: Parsed job (takes precedence over job_description)
+            priority: Overrides the job's priority (or the JD's "Priority:" line)
+            max_candidates: Overrides the job's candidate budget
+
+        Raises:
+            QueueFullError: If the queue is at capacity (or the service is stopping)
+            ValueError: If neither a JD nor a job is given
+        """
+        if not (job_description and job_description.strip()) and job is None:
+            raise ValueError("A job description or a job is required")
+        if priority is None:
+            priority = job.priority if job is not None else job_priority(job_description)
+        submission = Submission(id=uuid.uuid4().hex[:12], job_description=job_description, job=job,
+                                priority=priority, max_candidates=max_candidates)
+        with self._cond:
+            if self._stopping:
+                raise QueueFullError("Service is shutting down")
+            try:
+                self._queue.put_nowait((-priority, next(self._arrivals), submission))
+            except queue.Full:
+                get_metrics().inc("service_rejections_total")
+                raise QueueFullError(f"Job queue is full ({self._queue.maxsize} waiting)")
+            self._submissions[submission.id] = submission
+            self._evict()
+        self._emit(submission, QUEUED, {"queue_depth": self._queue.qsize()})
+        return submission
+
+    def _evict(self) -> None:
+        """Drop the oldest finished submissions beyond max_submissions (caller holds the lock)"""
+        excess = len(self._submissions) - self.max_submissions
+        for submission_id in [sid for sid, sub in self._submissions.items() if sub.finished][:max(0, excess)]:
+            del self._submissions[submission_id]
+
+    def get(self, submission_id: str) -> Optional[Submission]:
+        with self._cond:
+            return self._submissions.get(submission_id)
+
+    def wait_events(self, submission: Submission, since: int, timeout: float = 15.0) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Events after the first `since`, waiting up to timeout for new ones.
+
+        Returns:
+            (new events, whether the submission has finished)
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: len(submission.events) > since or submission.finished, timeout)
+            return submission.events[since:], submission.finished
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            statuses = [sub.status for sub in self._submissions.values()]
+        return {
+            "workers": self.workers,
+            "running": self._running,
+            "queued": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "completed": statuses.count(COMPLETED),
+            "failed": statuses.count(FAILED),
+            "scheduler": self.scheduler.stats(),
+        }
+
+    def _emit(self, submission: Submission, event: str, details: Optional[Dict[str, Any]] = None) -> None:
+        with self._cond:
+            submission.events.append({"event": event, "time": round(time.time(), 3), **(details or {})})
+            self._cond.notify_all()
+
+    def _set_status(self, submission: Submission, status: str) -> None:
+        with self._cond:
+            submission.status = status
+            self._cond.notify_all()
+
+    def _work(self) -> None:
+        while True:
+            _, _, submission = self._queue.get()
+            if submission is None:
+                return
+            with self._cond:
+                self._running += 1
+            try:
+                self._process(submission)
+            finally:
+                with self._cond:
+                    self._running -= 1
+
+    def _process(self, submission: Submission) -> None:
+        self._set_status(submission, RUNNING)
+        try:
+            if submission.job is None:
+                self._emit(submission, "parsing")
+                submission.job = parse_job_description(submission.job_description)
+                if submission.job is None:
+                    raise ValueError("Could not parse the job description")
+                self._emit(submission, "parsed", {"job": submission.job.model_dump()})
+            updates = {"priority": submission.priority}
+            if submission.max_candidates is not None:
+                updates["max_candidates"] = submission.max_candidates
+            submission.job = submission.job.model_copy(update=updates)
+            result = process_job(submission.job, self.config,
+                                 on_progress=lambda event, details: self._emit(submission, event, details),
+                                 scheduler=self.scheduler)
+            submission.result = result
+            self._emit(submission, COMPLETED, {"result": result.model_dump()})
+            self._set_status(submission, COMPLETED)
+            get_metrics().inc("service_jobs_total", status=COMPLETED)
+        except Exception as e:
+            print(f"Error processing submission {submission.id}: {e}")
+            submission.error = str(e)
+            self._emit(submission, FAILED, {"error": submission.error})
+            self._set_status(submission, FAILED)
+            get_metrics().inc("service_jobs_total", status=FAILED)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    JSON API of the sourcing service:
+
+        POST /jobs                 {"job_description": "..."} or {"job": {...JobData}}, optionally with
+                                   "priority" and "max_candidates" -> 202, or 429 when full
+        GET  /jobs/<id>            status, parsed job and JobResult once completed
+        GET  /jobs/<id>/events     progress events as JSON Lines, streamed until the job finishes
+        GET  /health               worker and queue state
+        GET  /metrics              Prometheus text
+    """
+
+    service: SourcingService
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send_json(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self) -> None:
+        if self.path.rstrip("/") != "/jobs":
+            return self._send_json(404, {"error": "Not found"})
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > SERVICE_MAX_BODY_BYTES:
+            return self._send_json(413, {"error": "Request body too large"})
+        raw = self.rfile.read(length).decode("utf-8", errors="replace")
+        try:
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                body = json.loads(raw)
+                job = JobData.model_validate(body["job"]) if body.get("job") else None
+                max_candidates = body.get("max_candidates")
+                submission = self.service.submit(
+                    body.get("job_description"), job,
+                    int(body["priority"]) if body.get("priority") is not None else None,
+                    max(0, int(max_candidates)) if max_candidates is not None else None
+                )
+            else:
+                submission = self.service.submit(raw)
+        except QueueFullError as e:
+            return self._send_json(429, {"error": str(e)}, {"Retry-After": str(SERVICE_RETRY_AFTER_SECONDS)})
+        except Exception as e:
+            return self._send_json(400, {"error": str(e)})
+        self._send_json(202, {
+            "id": submission.id,
+            "status": submission.status,
+            "status_url": f"/jobs/{submission.id}",
+            "events_url": f"/jobs/{submission.id}/events",
+        })
+
+    def do_GET(self) -> None:
+        parts = [part for part in self.path.split("?")[0].split("/") if part]
+        if parts == ["health"]:
+            return self._send_json(200, {"status": "ok", **self.service.stats()})
+        if parts == ["metrics"]:
+            data = get_metrics().to_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+        if len(parts) in (2, 3) and parts[0] == "jobs":
+            submission = self.service.get(parts[1])
+            if submission is None:
+                return self._send_json(404, {"error": "Unknown job id"})
+            if len(parts) == 2:
+                return self._send_json(200, submission.to_dict())
+            if parts[2] == "events":
+                return self._stream_events(submission)
+        self._send_json(404, {"error": "Not found"})
+
+    def _stream_events(self, submission: Submission) -> None:
+        # HTTP/1.0 response without a length: the body ends when the connection closes
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        sent = 0
+        while True:
+            events, finished = self.service.wait_events(submission, sent)
+            try:
+                for event in events:
+                    self.wfile.write((json.dumps(event) + "\n").encode("utf-8"))
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            sent += len(events)
+            if finished and not events:
+                return
+
+
+def make_server(service: SourcingService, host: str = SERVICE_HOST, port: int = SERVICE_PORT) -> ThreadingHTTPServer:
+    """HTTP server exposing a started SourcingService (call serve_forever() on it)"""
+    handler = type("SourcingHandler", (_Handler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(host: str = SERVICE_HOST, port: int = SERVICE_PORT, workers: int = SERVICE_WORKERS,
+          queue_size: int = SERVICE_QUEUE_SIZE) -> None:
+    """Warm up and run the sourcing service until interrupted"""
+    service = SourcingService(workers, queue_size)
+    print("Warming up clients and caches...")
+    service.warm_up()
+    service.start()
+    server = make_server(service, host, port)
+    print(f"Sourcing service listening on http://{host}:{port} ({workers} workers, queue of {queue_size})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down, finishing queued jobs...")
+    finally:
+        server.server_close()
+        service.stop()
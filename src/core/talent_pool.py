@@ -0,0 +1,221 @@
+import os
+import re
+import time
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+from ..data.models import JobData
+from ..services.profile_cache import PROFILE_CACHE_TTL_HOURS
+from ..services.urls import canonicalize_linkedin_url
+
+TALENT_POOL_PATH = os.environ.get("TALENT_POOL_PATH", ".cache/talent_pool.sqlite3")
+TALENT_POOL_ENABLED = os.environ.get("TALENT_POOL_ENABLED", "true").lower() not in ("0", "false", "no")
+# Profiles indexed longer ago than this are no longer returned by searches
+TALENT_POOL_MAX_AGE_DAYS = float(os.environ.get("TALENT_POOL_MAX_AGE_DAYS", "90"))
+# Local title matches needed to skip the external search entirely
+TALENT_POOL_MIN_CANDIDATES = int(os.environ.get("TALENT_POOL_MIN_CANDIDATES", "30"))
+
+# BM25 column weights, in index column order (url is not indexed)
+BM25_WEIGHTS = {
+    "url": 0.0,
+    "titles": 4.0,
+    "headline": 3.0,
+    "companies": 1.5,
+    "descriptions": 1.0,
+    "schools": 0.5,
+}
+
+_QUERY_TERM_RE = re.compile(r"[\w+#.]+")
+
+
+def _join(values: List[Optional[str]]) -> str:
+    return " ".join(value for value in values if value)
+
+
+def _index_fields(profile: Dict[str, Any]) -> Dict[str, str]:
+    """Searchable text of a profile, one string per index column"""
+    experiences = profile.get("experiences") or []
+    educations = profile.get("educations") or []
+    return {
+        "titles": _join([exp.get("title") for exp in experiences]),
+        "headline": _join([profile.get("headline"), profile.get("about")]),
+        "companies": _join([exp.get("company") for exp in experiences]),
+        "descriptions": _join([exp.get("description") for exp in experiences]),
+        "schools": _join([_join([edu.get("school"), edu.get("degree"), edu.get("field_of_study")]) for edu in educations]),
+    }
+
+
+def _phrase(text: str) -> Optional[str]:
+    words = _QUERY_TERM_RE.findall(text.lower())
+    return '"' + " ".join(words) + '"' if words else None
+
+
+def _match_query(job: JobData, title_only: bool = False) -> str:
+    """
+    FTS5 query matching the job title or any keyword, each as a phrase (single title
+    words like "engineer" would match nearly every profile). With title_only, only the
+    title phrase is matched, in the titles and headline columns.
+    """
+    if title_only:
+        title = _phrase(job.title)
+        return f"{{titles headline}} : {title}" if title else ""
+    terms = [phrase for phrase in map(_phrase, [job.title] + list(job.keywords)) if phrase]
+    return " OR ".join(dict.fromkeys(terms))
+
+
+def _job_city(job: JobData) -> Optional[str]:
+    """City part of the job location, or None for remote/unspecified jobs"""
+    location = (job.location or "").strip().lower()
+    if not location or "remote" in location:
+        return None
+    return location.split(",")[0].strip() or None
+
+
+class TalentPool:
+    """
+    Persistent local index of every profile fetched so far, for candidate discovery.
+
+    Profile URLs are indexed with their fetch time, searchable with BM25 over titles,
+    headline, companies, experience descriptions and schools (SQLite FTS5), and faceted
+    by city. A job whose role was sourced before finds its candidates here without a
+    search API call. The pool only indexes: the profiles themselves are fetched through
+    the profile cache, so they are as fresh as PROFILE_CACHE_TTL_HOURS allows.
+    """
+
+    def __init__(self, path: str = TALENT_POOL_PATH, max_age_seconds: float = TALENT_POOL_MAX_AGE_DAYS * 86400):
+        """
+        Args:
+            path: SQLite file holding the pool (":memory:" for a throwaway pool)
+            max_age_seconds: Profiles fetched longer ago than this are ignored (0 or less keeps them forever)
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._drop_payloads()
+        self._conn.executescript(
+            f"""
+            CREATE TABLE IF NOT EXISTS pool_profiles (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL UNIQUE,
+                city TEXT,
+                fetched_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_pool_profiles_city ON pool_profiles(city);
+            CREATE VIRTUAL TABLE IF NOT EXISTS pool_index USING fts5(
+                {", ".join(f"{column} UNINDEXED" if column == "url" else column for column in BM25_WEIGHTS)},
+                tokenize = 'unicode61'
+            );
+            """
+        )
+        self._conn.commit()
+
+    def _drop_payloads(self) -> None:
+        """Pools created before profiles were left to the profile cache stored them too; drop that copy"""
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(pool_profiles)")]
+        if "payload" not in columns:
+            return
+        try:
+            self._conn.execute("ALTER TABLE pool_profiles DROP COLUMN payload")
+        except sqlite3.OperationalError:
+            # SQLite before 3.35 can't drop columns; the index is rebuilt as profiles are fetched
+            self._conn.executescript("DROP TABLE pool_profiles; DROP TABLE IF EXISTS pool_index;")
+        self._conn.commit()
+
+    def _min_fetched_at(self) -> float:
+        return time.time() - self.max_age_seconds if self.max_age_seconds > 0 else 0.0
+
+    def add(self, url: str, profile: Dict[str, Any]) -> None:
+        """
+        Index a fetched profile, or re-index it if it may have been fetched again since.
+
+        A profile indexed less than PROFILE_CACHE_TTL_HOURS ago is left alone: within that
+        window it can only have been served from the profile cache, unchanged.
+
+        Args:
+            url: LinkedIn profile URL (any form, it is canonicalized)
+            profile: Profile data returned by the API (empty results are skipped)
+        """
+        if not profile:
+            return
+        canonical = canonicalize_linkedin_url(url)
+        city = (profile.get("city") or "").strip().lower() or None
+        now = time.time()
+        ttl_seconds = PROFILE_CACHE_TTL_HOURS * 3600
+        with self._lock:
+            row = self._conn.execute("SELECT id, fetched_at FROM pool_profiles WHERE url = ?", (canonical,)).fetchone()
+            if row is not None and (ttl_seconds <= 0 or now - row[1] < ttl_seconds):
+                return
+            fields = _index_fields(profile)
+            if row is None:
+                cursor = self._conn.execute(
+                    "INSERT INTO pool_profiles (url, city, fetched_at) VALUES (?, ?, ?)",
+                    (canonical, city, now)
+                )
+                rowid = cursor.lastrowid
+            else:
+                rowid = row[0]
+                self._conn.execute(
+                    "UPDATE pool_profiles SET city = ?, fetched_at = ? WHERE id = ?",
+                    (city, now, rowid)
+                )
+                self._conn.execute("DELETE FROM pool_index WHERE rowid = ?", (rowid,))
+            self._conn.execute(
+                f"INSERT INTO pool_index (rowid, {', '.join(BM25_WEIGHTS)}) VALUES (?, {', '.join('?' * len(BM25_WEIGHTS))})",
+                (rowid, canonical, *(fields[column] for column in list(BM25_WEIGHTS)[1:]))
+            )
+            self._conn.commit()
+
+    def search(self, job: JobData, limit: int = 30, title_only: bool = False) -> List[str]:
+        """
+        Best local matches for a job.
+
+        Args:
+            job: Job whose keywords and title are matched (BM25) and whose city filters
+                the results (remote jobs are not filtered)
+            limit: Maximum number of URLs
+            title_only: Only return profiles whose titles or headline contain the job title
+
+        Returns:
+            Canonical profile URLs, best match first
+        """
+        query = _match_query(job, title_only)
+        if not query:
+            return []
+        weights = ", ".join(str(weight) for weight in BM25_WEIGHTS.values())
+        sql = f"""
+            SELECT p.url FROM pool_index
+            JOIN pool_profiles p ON p.id = pool_index.rowid
+            WHERE pool_index MATCH ? AND p.fetched_at >= ?
+        """
+        params: List[Any] = [query, self._min_fetched_at()]
+        city = _job_city(job)
+        if city is not None:
+            sql += " AND p.city LIKE ?"
+            params.append(city.replace("%", "") + "%")
+        sql += f" ORDER BY bm25(pool_index, {weights}) LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [row[0] for row in rows]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pool_profiles").fetchone()[0]
+
+
+_default_pool: Optional[TalentPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_talent_pool() -> Optional[TalentPool]:
+    """Return the process-wide talent pool, or None if it is disabled"""
+    global _default_pool
+    if not TALENT_POOL_ENABLED:
+        return None
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = TalentPool()
+        return _default_pool
@@ -0,0 +1,291 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+WORK_QUEUE_PATH = os.environ.get("WORK_QUEUE_PATH", ".cache/work_queue.sqlite3")
+# A claimed task goes back to the queue if its worker stops heartbeating for this long
+WORK_QUEUE_LEASE_SECONDS = float(os.environ.get("WORK_QUEUE_LEASE_SECONDS", "120"))
+# Claims per task before it is marked failed (crashed workers count as attempts)
+WORK_QUEUE_MAX_ATTEMPTS = int(os.environ.get("WORK_QUEUE_MAX_ATTEMPTS", "3"))
+
+# Task states
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+_COLUMNS = ("id", "queue_id", "kind", "payload", "parent_id", "status", "attempts", "owner", "result", "error")
+
+
+@dataclass
+class Task:
+    id: int
+    queue_id: str
+    kind: str
+    payload: Dict[str, Any]
+    parent_id: Optional[int]
+    status: str
+    attempts: int
+    owner: Optional[str]
+    result: Any
+    error: Optional[str]
+
+
+def _to_task(row: Tuple) -> Task:
+    values = dict(zip(_COLUMNS, row))
+    values["payload"] = json.loads(values["payload"])
+    values["result"] = json.loads(values["result"]) if values["result"] is not None else None
+    return Task(**values)
+
+
+class WorkQueue:
+    """
+    Durable task queue with leases, shared by any number of worker processes (SQLite in WAL mode).
+
+    A worker claims a task, which leases it for lease_seconds; it must heartbeat to keep
+    the lease and complete or fail the task before it runs out. Tasks whose lease expired
+    (the worker crashed or hung) are handed to the next claimer, and a completion from a
+    worker that lost its lease is ignored, so every task's result is recorded once.
+
+    Tasks can have children, inserted atomically with their parent's completion, and a
+    follow-up task that is enqueued once when the last of a parent's children finishes,
+    which is enough to express the job -> candidate chunks -> finalize flow.
+
+    Workers on several machines can share one queue file on a filesystem with working
+    POSIX locks; SQLite over NFS is not safe.
+    """
+
+    def __init__(self, path: str = WORK_QUEUE_PATH, lease_seconds: float = WORK_QUEUE_LEASE_SECONDS,
+                 max_attempts: int = WORK_QUEUE_MAX_ATTEMPTS):
+        """
+        Args:
+            path: SQLite file holding the queue
+            lease_seconds: How long a claim lasts without a heartbeat
+            max_attempts: Claims per task before it is marked failed
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max(1, max_attempts)
+        self._lock = threading.Lock()
+        # Autocommit mode, so claims can take the write lock up front with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS queue_tasks (
+                id INTEGER PRIMARY KEY,
+                queue_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                parent_id INTEGER,
+                follow_up TEXT,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                owner TEXT,
+                lease_expires REAL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_queue_tasks_claim ON queue_tasks(status, queue_id, id);
+            CREATE INDEX IF NOT EXISTS idx_queue_tasks_parent ON queue_tasks(parent_id);
+            """
+        )
+
+    def _transaction(self, fn, *args):
+        """Run fn(*args) in one write transaction"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                value = fn(*args)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return value
+
+    def _insert(self, queue_id: str, kind: str, payload: Dict[str, Any], parent_id: Optional[int] = None,
+                follow_up: Optional[Tuple[str, Dict[str, Any]]] = None) -> int:
+        now = time.time()
+        cursor = self._conn.execute(
+            """
+            INSERT INTO queue_tasks (queue_id, kind, payload, parent_id, follow_up, status, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (queue_id, kind, json.dumps(payload), parent_id,
+             json.dumps(follow_up) if follow_up is not None else None, PENDING, now, now)
+        )
+        return cursor.lastrowid
+
+    def enqueue(self, queue_id: str, kind: str, payload: Dict[str, Any]) -> int:
+        """
+        Add a task.
+
+        Args:
+            queue_id: Group of tasks the task belongs to (e.g. one run)
+            kind: Task type, used by workers to dispatch it
+            payload: JSON-serializable task input
+
+        Returns:
+            The task id
+        """
+        return self._transaction(self._insert, queue_id, kind, payload)
+
+    def _finish(self, task_id: int, status: str, result: Any, error: Optional[str]) -> None:
+        """Mark a task finished and enqueue its siblings' follow-up if it was the last one"""
+        self._conn.execute(
+            "UPDATE queue_tasks SET status = ?, result = ?, error = ?, owner = NULL, lease_expires = NULL, "
+            "updated_at = ? WHERE id = ?",
+            (status, json.dumps(result) if result is not None else None, error, time.time(), task_id)
+        )
+        queue_id, parent_id, follow_up = self._conn.execute(
+            "SELECT queue_id, parent_id, follow_up FROM queue_tasks WHERE id = ?", (task_id,)
+        ).fetchone()
+        if parent_id is None or follow_up is None:
+            return
+        kind, payload = json.loads(follow_up)
+        unfinished = self._conn.execute(
+            "SELECT 1 FROM queue_tasks WHERE parent_id = ? AND status IN (?, ?) LIMIT 1",
+            (parent_id, PENDING, LEASED)
+        ).fetchone()
+        exists = self._conn.execute(
+            "SELECT 1 FROM queue_tasks WHERE parent_id = ? AND kind = ? LIMIT 1", (parent_id, kind)
+        ).fetchone()
+        if unfinished is None and exists is None:
+            self._insert(queue_id, kind, payload, parent_id)
+
+    def _claim(self, worker_id: str, queue_id: Optional[str]) -> Optional[Task]:
+        now = time.time()
+        # Tasks whose last lease expired and that are out of attempts are poison: fail them
+        for (task_id,) in self._conn.execute(
+            "SELECT id FROM queue_tasks WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+            (LEASED, now, self.max_attempts)
+        ).fetchall():
+            self._finish(task_id, FAILED, None, "Lease expired on the last attempt")
+
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM queue_tasks WHERE (status = ? OR (status = ? AND lease_expires < ?))"
+        params: List[Any] = [PENDING, LEASED, now]
+        if queue_id is not None:
+            sql += " AND queue_id = ?"
+            params.append(queue_id)
+        row = self._conn.execute(sql + " ORDER BY id LIMIT 1", params).fetchone()
+        if row is None:
+            return None
+        task = _to_task(row)
+        task.status, task.owner, task.attempts = LEASED, worker_id, task.attempts + 1
+        self._conn.execute(
+            "UPDATE queue_tasks SET status = ?, owner = ?, attempts = ?, lease_expires = ?, updated_at = ? WHERE id = ?",
+            (LEASED, worker_id, task.attempts, now + self.lease_seconds, now, task.id)
+        )
+        return task
+
+    def claim(self, worker_id: str, queue_id: Optional[str] = None) -> Optional[Task]:
+        """
+        Lease the oldest available task.
+
+        Args:
+            worker_id: Unique id of the claiming worker
+            queue_id: Only claim tasks of this queue (None claims from any)
+
+        Returns:
+            The leased Task, or None if nothing is available
+        """
+        return self._transaction(self._claim, worker_id, queue_id)
+
+    def heartbeat(self, task: Task) -> bool:
+        """Extend the task's lease; False if the worker no longer holds it"""
+        def extend() -> bool:
+            cursor = self._conn.execute(
+                "UPDATE queue_tasks SET lease_expires = ?, updated_at = ? WHERE id = ? AND owner = ? AND status = ?",
+                (time.time() + self.lease_seconds, time.time(), task.id, task.owner, LEASED)
+            )
+            return cursor.rowcount == 1
+        return self._transaction(extend)
+
+    def _holds_lease(self, task: Task) -> bool:
+        row = self._conn.execute(
+            "SELECT 1 FROM queue_tasks WHERE id = ? AND owner = ? AND status = ?", (task.id, task.owner, LEASED)
+        ).fetchone()
+        return row is not None
+
+    def complete(self, task: Task, result: Any = None,
+                 children: Sequence[Tuple[str, Dict[str, Any]]] = (),
+                 follow_up: Optional[Tuple[str, Dict[str, Any]]] = None) -> bool:
+        """
+        Record a task's result, atomically with any child tasks it produced.
+
+        Args:
+            task: Task returned by claim()
+            result: JSON-serializable result
+            children: (kind, payload) tasks to enqueue under this task
+            follow_up: (kind, payload) task enqueued under this task once all children finished
+
+        Returns:
+            False if the lease was lost (the result and children are discarded)
+        """
+        def finish() -> bool:
+            if not self._holds_lease(task):
+                return False
+            for kind, payload in children:
+                self._insert(task.queue_id, kind, payload, task.id, follow_up)
+            if not children and follow_up is not None:
+                self._insert(task.queue_id, follow_up[0], follow_up[1], task.id)
+            self._finish(task.id, DONE, result, None)
+            return True
+        return self._transaction(finish)
+
+    def fail(self, task: Task, error: str) -> bool:
+        """
+        Give a task back after an error: it is retried by the next claim until it runs
+        out of attempts, then marked failed.
+
+        Returns:
+            False if the lease was lost
+        """
+        def release() -> bool:
+            if not self._holds_lease(task):
+                return False
+            if task.attempts >= self.max_attempts:
+                self._finish(task.id, FAILED, None, error)
+            else:
+                self._conn.execute(
+                    "UPDATE queue_tasks SET status = ?, owner = NULL, lease_expires = NULL, error = ?, "
+                    "updated_at = ? WHERE id = ?",
+                    (PENDING, error, time.time(), task.id)
+                )
+            return True
+        return self._transaction(release)
+
+    def tasks(self, queue_id: str, kind: Optional[str] = None, parent_id: Optional[int] = None) -> List[Task]:
+        """Tasks of a queue in creation order, optionally filtered by kind and parent"""
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM queue_tasks WHERE queue_id = ?"
+        params: List[Any] = [queue_id]
+        if kind is not None:
+            sql += " AND kind = ?"
+            params.append(kind)
+        if parent_id is not None:
+            sql += " AND parent_id = ?"
+            params.append(parent_id)
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY id", params).fetchall()
+        return [_to_task(row) for row in rows]
+
+    def counts(self, queue_id: str) -> Dict[str, int]:
+        """Number of tasks per status"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM queue_tasks WHERE queue_id = ? GROUP BY status", (queue_id,)
+            ).fetchall()
+        return {status: count for status, count in rows}
+
+    def is_drained(self, queue_id: str) -> bool:
+        """True once no task of the queue is pending or leased"""
+        counts = self.counts(queue_id)
+        return counts.get(PENDING, 0) == 0 and counts.get(LEASED, 0) == 0
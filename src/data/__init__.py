@@ -1,6 +1,6 @@
 from .models import JobData, ProfileData, CandidateScores, TopCandidate, JobResult, FinalResults
 from .job_descriptions import get_all_job_descriptions, add_job_description, get_job_description_by_index
-from .prompts import keyword_extraction_prompt, scoring_prompt, outreach_prompt
+from . import prompts
 
 __all__ = [
     'JobData',
@@ -14,5 +14,17 @@ __all__ = [
     'get_job_description_by_index',
     'keyword_extraction_prompt',
     'scoring_prompt',
+    'batch_scoring_prompt',
+    'multi_job_scoring_prompt',
+    'hybrid_scoring_prompt',
+    'hybrid_batch_scoring_prompt',
+    'hybrid_multi_job_scoring_prompt',
     'outreach_prompt'
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name: str):
+    # Prompts are built lazily by the prompts module (see prompts.__getattr__)
+    if name.endswith('_prompt'):
+        return getattr(prompts, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
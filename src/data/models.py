@@ -5,24 +5,40 @@ class Education(BaseModel):
     school: Optional[str] = None
     degree: Optional[str] = None
     field_of_study: Optional[str] = None
+    start_year: Optional[int] = None
+    end_year: Optional[int] = None
 
 class Experience(BaseModel):
     company: Optional[str] = None
     title: Optional[str] = None
+    start_year: Optional[int] = None
+    end_year: Optional[int] = None
     duration: Optional[str] = None
     description: Optional[str] = None
 
+# Shape of the compact profile dicts produced by services.profile_normalizer.normalize_profile
 class ProfileData(BaseModel):
     educations: List[Education] = Field(default_factory=list)
     experiences: List[Experience] = Field(default_factory=list)
     city: Optional[str] = None
+    state: Optional[str] = None
+    country: Optional[str] = None
+    location: Optional[str] = None
     full_name: Optional[str] = None
+    headline: Optional[str] = None
+    about: Optional[str] = None
 
 class JobData(BaseModel):
     title: str
     location: str
     experience_level: str
     keywords: List[str] = Field(default_factory=list)
+    # Requisition ID from the JD, if any; links edited versions of the same job
+    id: Optional[str] = None
+    # Scheduling: higher priorities are served first; max_candidates caps the
+    # candidates scored for the job (None uses SCHEDULER_CANDIDATES_PER_JOB)
+    priority: int = 0
+    max_candidates: Optional[int] = Field(default=None, ge=0)
 
 class ScoreBreakdown(BaseModel):
     education: float = Field(ge=0, le=10)
@@ -54,6 +70,10 @@ class JobResult(BaseModel):
     top_candidates: List[TopCandidate] = Field(default_factory=list)
     all_candidates: List[TopCandidate] = Field(default_factory=list)
     error: Optional[str] = None
+    # Candidates left out because the daily quota ran low, or whose profile fetch or
+    # scoring call failed; a result with skipped candidates is partial, so it is
+    # neither checkpointed nor reused by later runs
+    skipped: int = Field(default=0, ge=0)
 
 class FinalResults(RootModel[List[JobResult]]):
     pass 
\ No newline at end of file
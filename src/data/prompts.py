@@ -1,6 +1,4 @@
-from langchain_core.prompts import ChatPromptTemplate
-
-keyword_extraction_prompt = ChatPromptTemplate.from_template(
+keyword_extraction_template = (
 """
 You are an expert job description parser. Extract the following information from the given job description:
 
@@ -20,21 +18,8 @@ Focus on extracting the most relevant and specific information. For keywords, in
 """
 )
 
-scoring_prompt = ChatPromptTemplate.from_template(
-"""
-You are an expert candidate evaluator. Analyze the candidate's LinkedIn profile data and score them based on the following criteria for the given job position.
-
-Job Details:
-Title: {job_title}
-Location: {job_location}
-Experience Level: {experience_level}
-Keywords: {keywords}
-
-Candidate Profile Data:
-{profile_data}
-
-Please evaluate the candidate using this scoring framework and return scores in JSON format:
-
+# Dimensions that need judgement; the hybrid scoring prompts ask for these only
+subjective_scoring_criteria = """
 **Education (20% weight)**
 - Elite schools (MIT, Stanford, Harvard, etc.): 9-10
 - Strong schools (Top 50 universities): 7-8  
@@ -54,7 +39,10 @@ Please evaluate the candidate using this scoring framework and return scores in
 - Perfect skill match with job requirements: 9-10
 - Strong overlap with required skills: 7-8
 - Some relevant skills: 5-6
+"""
 
+# Scoring framework shared by the single and batch scoring prompts
+scoring_criteria = subjective_scoring_criteria + """
 **Location Match (10% weight)**
 - Exact city match: 10
 - Same metro area: 8
@@ -67,7 +55,23 @@ Please evaluate the candidate using this scoring framework and return scores in
 
 Calculate the weighted fit_score out of 10 using the formula:
 fit_score = (education_score * 0.20) + (career_trajectory_score * 0.20) + (company_relevance_score * 0.15) + (experience_match_score * 0.25) + (location_match_score * 0.10) + (tenure_score * 0.10)
+"""
+
+scoring_template = (
+"""
+You are an expert candidate evaluator. Analyze the candidate's LinkedIn profile data and score them based on the following criteria for the given job position.
 
+Job Details:
+Title: {job_title}
+Location: {job_location}
+Experience Level: {experience_level}
+Keywords: {keywords}
+
+Candidate Profile Data:
+{profile_data}
+
+Please evaluate the candidate using this scoring framework and return scores in JSON format:
+""" + scoring_criteria + """
 Return the scores in this exact JSON format:
 {{
     "education_score": <score>,
@@ -82,7 +86,146 @@ Return the scores in this exact JSON format:
 """
 )
 
-outreach_prompt = ChatPromptTemplate.from_template(
+batch_scoring_template = (
+"""
+You are an expert candidate evaluator. Analyze each candidate's LinkedIn profile data and score them independently based on the following criteria for the given job position.
+
+Job Details:
+Title: {job_title}
+Location: {job_location}
+Experience Level: {experience_level}
+Keywords: {keywords}
+
+Candidates (JSON array, each with a candidate_id):
+{candidates}
+
+Please evaluate every candidate using this scoring framework:
+""" + scoring_criteria + """
+Return a JSON array with exactly one object per candidate, in this exact format:
+[
+    {{
+        "candidate_id": <candidate_id from the input>,
+        "education_score": <score>,
+        "career_trajectory_score": <score>,
+        "company_relevance_score": <score>,
+        "experience_match_score": <score>,
+        "location_match_score": <score>,
+        "tenure_score": <score>,
+        "fit_score": <weighted_score_out_of_10>
+    }}
+]
+"""
+)
+
+
+multi_job_scoring_template = (
+"""
+You are an expert candidate evaluator. Analyze the candidate's LinkedIn profile data and score them separately for each of the given job positions.
+
+Jobs (JSON array, each with a job_id):
+{jobs}
+
+Candidate Profile Data:
+{profile_data}
+
+Please evaluate the candidate against every job using this scoring framework:
+""" + scoring_criteria + """
+Return a JSON array with exactly one object per job, in this exact format:
+[
+    {{
+        "job_id": <job_id from the input>,
+        "education_score": <score>,
+        "career_trajectory_score": <score>,
+        "company_relevance_score": <score>,
+        "experience_match_score": <score>,
+        "location_match_score": <score>,
+        "tenure_score": <score>,
+        "fit_score": <weighted_score_out_of_10>
+    }}
+]
+"""
+)
+
+# Hybrid scoring: location and tenure are computed locally (core/local_scoring.py) and
+# the fit score is combined there, so these prompts neither send the candidate's city
+# nor ask for those scores
+hybrid_scoring_template = (
+"""
+You are an expert candidate evaluator. Analyze the candidate's LinkedIn profile data and score them based on the following criteria for the given job position.
+
+Job Details:
+Title: {job_title}
+Experience Level: {experience_level}
+Keywords: {keywords}
+
+Candidate Profile Data:
+{profile_data}
+
+Please evaluate the candidate using this scoring framework and return scores in JSON format:
+""" + subjective_scoring_criteria + """
+Return the scores in this exact JSON format:
+{{
+    "education_score": <score>,
+    "career_trajectory_score": <score>,
+    "company_relevance_score": <score>,
+    "experience_match_score": <score>
+}}
+"""
+)
+
+hybrid_batch_scoring_template = (
+"""
+You are an expert candidate evaluator. Analyze each candidate's LinkedIn profile data and score them independently based on the following criteria for the given job position.
+
+Job Details:
+Title: {job_title}
+Experience Level: {experience_level}
+Keywords: {keywords}
+
+Candidates (JSON array, each with a candidate_id):
+{candidates}
+
+Please evaluate every candidate using this scoring framework:
+""" + subjective_scoring_criteria + """
+Return a JSON array with exactly one object per candidate, in this exact format:
+[
+    {{
+        "candidate_id": <candidate_id from the input>,
+        "education_score": <score>,
+        "career_trajectory_score": <score>,
+        "company_relevance_score": <score>,
+        "experience_match_score": <score>
+    }}
+]
+"""
+)
+
+hybrid_multi_job_scoring_template = (
+"""
+You are an expert candidate evaluator. Analyze the candidate's LinkedIn profile data and score them separately for each of the given job positions.
+
+Jobs (JSON array, each with a job_id):
+{jobs}
+
+Candidate Profile Data:
+{profile_data}
+
+Please evaluate the candidate against every job using this scoring framework:
+""" + subjective_scoring_criteria + """
+Return a JSON array with exactly one object per job, in this exact format:
+[
+    {{
+        "job_id": <job_id from the input>,
+        "education_score": <score>,
+        "career_trajectory_score": <score>,
+        "company_relevance_score": <score>,
+        "experience_match_score": <score>
+    }}
+]
+"""
+)
+
+outreach_template = (
 """
 You are a professional recruiter reaching out to a potential candidate. Create a personalized LinkedIn message based on the candidate's profile and the job opportunity.
 
@@ -111,4 +254,27 @@ Create a personalized, professional LinkedIn message that:
 
 Return only the message content, no JSON formatting.
 """
-) 
\ No newline at end of file
+)
+
+# Prompt templates are built from the strings above on first access, so importing
+# this module doesn't load LangChain
+_templates = {
+    "keyword_extraction_prompt": keyword_extraction_template,
+    "scoring_prompt": scoring_template,
+    "batch_scoring_prompt": batch_scoring_template,
+    "multi_job_scoring_prompt": multi_job_scoring_template,
+    "hybrid_scoring_prompt": hybrid_scoring_template,
+    "hybrid_batch_scoring_prompt": hybrid_batch_scoring_template,
+    "hybrid_multi_job_scoring_prompt": hybrid_multi_job_scoring_template,
+    "outreach_prompt": outreach_template,
+}
+
+
+def __getattr__(name: str):
+    template = _templates.get(name)
+    if template is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from langchain_core.prompts import ChatPromptTemplate
+    prompt = ChatPromptTemplate.from_template(template)
+    globals()[name] = prompt
+    return prompt
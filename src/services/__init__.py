@@ -1,6 +1,60 @@
-from .api_client import search_linkedin_profiles, get_linkedin_profile
+from .api_client import search_linkedin_profiles, get_linkedin_profile, asearch_linkedin_profiles, aget_linkedin_profile
+from .http_client import aget, get, run_sync, run_blocking, get_async_client, close_http_clients
+from .profile_cache import ProfileCache, CacheStats, get_profile_cache
+from .urls import canonicalize_linkedin_url
+from .profile_normalizer import normalize_profile
+from .llm_cache import LLMCache, get_llm_cache, cached_invoke, cached_batch, make_cache_key
+from .rate_limiter import TokenBucket, get_rate_limiter, configure_rate_limit, GOOGLE_CSE, RAPIDAPI, OPENAI
+from .llm_client import get_llm, reset_llm_clients
+from .env import load_env, require_env
+from .metrics import Metrics, get_metrics, traced
+from .quota import QuotaTracker, QuotaExceededError, get_quota_tracker
+from .resilience import (
+    RetryPolicy, CircuitBreaker, CircuitOpenError, AIMDLimiter, ProviderGuard, get_guard, call_with_retry
+)
  
 __all__ = [
     'search_linkedin_profiles',
-    'get_linkedin_profile'
+    'get_linkedin_profile',
+    'asearch_linkedin_profiles',
+    'aget_linkedin_profile',
+    'aget',
+    'get',
+    'run_sync',
+    'run_blocking',
+    'get_async_client',
+    'close_http_clients',
+    'ProfileCache',
+    'CacheStats',
+    'get_profile_cache',
+    'canonicalize_linkedin_url',
+    'normalize_profile',
+    'LLMCache',
+    'get_llm_cache',
+    'cached_invoke',
+    'cached_batch',
+    'make_cache_key',
+    'TokenBucket',
+    'get_rate_limiter',
+    'configure_rate_limit',
+    'GOOGLE_CSE',
+    'RAPIDAPI',
+    'OPENAI',
+    'get_llm',
+    'reset_llm_clients',
+    'load_env',
+    'require_env',
+    'Metrics',
+    'get_metrics',
+    'traced',
+    'QuotaTracker',
+    'QuotaExceededError',
+    'get_quota_tracker',
+    'RetryPolicy',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'AIMDLimiter',
+    'ProviderGuard',
+    'get_guard',
+    'call_with_retry'
 ] 
\ No newline at end of file
@@ -1,58 +1,174 @@
-import requests
 import os
-from dotenv import load_dotenv
+import json
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+from .env import require_env
+from .http_client import aget, run_sync, run_blocking
+from .metrics import get_metrics
+from .resilience import get_guard, backoff_delay, parse_retry_after
+from .profile_cache import ProfileCache, get_profile_cache
+from .profile_normalizer import normalize_profile
+from .quota import get_quota_tracker
+from .rate_limiter import get_rate_limiter, GOOGLE_CSE, RAPIDAPI
 
-load_dotenv()
-
-GOOGLE_API_KEY = os.environ['GOOGLE_SEARCH_API_KEY']
-GOOGLE_CSE_ID = os.environ['GOOGLE_SEARCH_CSE_ID']
-RAPID_API_KEY = os.environ['RAPID_API_KEY']
 RAPID_API_HOST = "fresh-linkedin-profile-data.p.rapidapi.com"
+# Endpoints can be pointed at local stand-ins (see benchmarks/pipeline.py)
+GOOGLE_CSE_URL = os.environ.get("GOOGLE_CSE_URL", "https://www.googleapis.com/customsearch/v1")
+RAPID_API_URL = os.environ.get("RAPID_API_URL", f"https://{RAPID_API_HOST}/get-linkedin-profile")
 
+# Google CSE returns 10 results per page; start indexes are 1, 11, 21, ...
+SEARCH_PAGE_SIZE = 10
+SEARCH_MAX_PAGES = int(os.environ.get("SEARCH_MAX_PAGES", "3"))
 
-def search_linkedin_profiles(query: str) -> list:
-    """Search for LinkedIn profiles using Google Custom Search API"""
-    url = "https://www.googleapis.com/customsearch/v1"
+
+async def _request(provider: str, url: str, **kwargs):
+    """
+    One guarded API call.
+
+    Every attempt is rate limited and capped by the provider's adaptive concurrency limit.
+    429s, transient 5xx responses and connection errors are retried with exponential
+    backoff and jitter, waiting at least as long as Retry-After asks. Every response
+    counts against the provider's daily quota; the quota's SQLite reads and writes run in
+    the executor so they don't hold up the other requests on the loop.
+
+    Returns:
+        The first non-retryable response, or the last one once retries are exhausted
+
+    Raises:
+        CircuitOpenError: If the provider's circuit breaker is open
+        QuotaExceededError: If the provider's daily quota is used up
+        Exception: The last transport error once retries are exhausted
+    """
+    metrics = get_metrics()
+    guard = get_guard(provider)
+    quota = get_quota_tracker()
+    attempt = 1
+    while True:
+        # Quota first: a refused call must not take the circuit's half-open trial
+        if quota is not None:
+            await run_blocking(quota.check, provider)
+        trial = guard.check()
+        recorded = False
+        try:
+            await get_rate_limiter(provider).aacquire()
+            await guard.limiter.aacquire()
+            try:
+                with metrics.in_flight(provider):
+                    response = await aget(url, **kwargs)
+            except Exception as e:
+                metrics.record_request(provider, "error")
+                recorded = True
+                if not guard.record(None, e) or attempt >= guard.policy.max_attempts:
+                    raise
+                retry_after = None
+            else:
+                metrics.record_request(provider, response.status_code)
+                recorded = True
+                retryable = guard.record(response.status_code)
+                if quota is not None:
+                    await run_blocking(quota.record, provider)
+                if not retryable or attempt >= guard.policy.max_attempts:
+                    return response
+                retry_after = parse_retry_after(response.headers.get("retry-after"))
+            finally:
+                guard.limiter.release()
+        finally:
+            # Cancelled, or failed before a response: let another call be the trial
+            if trial and not recorded:
+                guard.release_trial()
+        metrics.record_retry(provider)
+        await asyncio.sleep(backoff_delay(attempt, guard.policy, retry_after))
+        attempt += 1
+
+
+async def _asearch_page(query: str, start: int) -> Tuple[List[str], bool]:
+    """One page of Google Custom Search results: (links, whether a next page exists)"""
     params = {
-        "key": GOOGLE_API_KEY,
-        "cx": GOOGLE_CSE_ID,
-        "q": query
+        "key": require_env("GOOGLE_SEARCH_API_KEY"),
+        "cx": require_env("GOOGLE_SEARCH_CSE_ID"),
+        "q": query,
+        "start": start
     }
-    
+    response = await _request(GOOGLE_CSE, GOOGLE_CSE_URL, params=params)
+    if response.status_code != 200:
+        print(f"Google Search API error: {response.status_code}")
+        return [], False
+    data = response.json()
+    links = [item['link'] for item in data.get('items', [])]
+    has_next = bool(data.get('queries', {}).get('nextPage')) or len(links) >= SEARCH_PAGE_SIZE
+    return links, has_next
+
+
+async def asearch_linkedin_profiles(query: str, pages: int = SEARCH_MAX_PAGES) -> list:
+    """
+    Search for LinkedIn profiles using Google Custom Search API (async, pooled connections).
+
+    Page 1 is requested first; only if it was full or has a nextPage link are the other
+    pages, whose start indexes are known up front, requested all at once. Results after
+    a short page are the end of the search, so nothing past one is kept.
+
+    Args:
+        query: Search query
+        pages: Result pages to fetch at most (10 results each)
+
+    Returns:
+        Result links in rank order (pages that failed are skipped)
+    """
     try:
-        response = requests.get(url, params=params)
-        if response.status_code == 200:
-            links = []
-            for item in response.json()['items']:
-                links.append(item['link'])
-            # Check for next page and fetch up to 2 more pages
-            page_count = 1
-            while page_count < 3 and 'queries' in response.json() and 'nextPage' in response.json()['queries']:
-                next_page = response.json()['queries']['nextPage'][0]
-                start_index = next_page['startIndex']
-                
-                params['start'] = start_index
-                response = requests.get(url, params=params)
-                
-                if response.status_code == 200:
-                    for item in response.json()['items']:
-                        links.append(item['link'])
-                    page_count += 1
-                else:
-                    break
-
-            return links
-        else:
-            print(f"Google Search API error: {response.status_code}")
-            return []
+        links, has_next = await _asearch_page(query, 1)
     except Exception as e:
         print(f"Error searching profiles: {e}")
         return []
+    if not has_next or pages <= 1:
+        return links
+
+    results = await asyncio.gather(
+        *(_asearch_page(query, 1 + page * SEARCH_PAGE_SIZE) for page in range(1, pages)),
+        return_exceptions=True
+    )
+    for page in results:
+        if isinstance(page, Exception):
+            print(f"Error searching profiles: {page}")
+            continue
+        page_links, has_next = page
+        links.extend(page_links)
+        if not has_next:
+            break
+    return links
+
+
+def search_linkedin_profiles(query: str, pages: int = SEARCH_MAX_PAGES) -> list:
+    """Search for LinkedIn profiles using Google Custom Search API"""
+    return run_sync(asearch_linkedin_profiles(query, pages))
+
+
+def _cached_profile(profile_url: str, cache: ProfileCache) -> Optional[Dict[str, Any]]:
+    """A profile from the profile cache (blocking: SQLite), or None on a miss"""
+    cached = cache.get(profile_url)
+    get_metrics().record_cache("profile", "miss" if cached is None else "hit")
+    # Entries cached before normalization was added are compacted on the way out
+    return normalize_profile(cached) if cached is not None else None
 
 
-def get_linkedin_profile(profile_url: str) -> dict:
-    """Fetch LinkedIn profile data using RapidAPI"""
-    url = "https://fresh-linkedin-profile-data.p.rapidapi.com/get-linkedin-profile"
+def _store_profile(profile_url: str, response: Any, cache: Optional[ProfileCache]) -> dict:
+    """
+    Turn a RapidAPI response into compact profile data and cache it (blocking: JSON
+    parsing and SQLite).
+    """
+    if response.status_code != 200:
+        print(f"LinkedIn API error: {response.status_code}")
+        return {}
+    profile = normalize_profile(response.json()['data'])
+    metrics = get_metrics()
+    metrics.inc("profile_payload_bytes_total", len(response.content), form="raw")
+    metrics.inc("profile_payload_bytes_total", len(json.dumps(profile)), form="compact")
+    if cache is not None:
+        cache.put(profile_url, profile)
+    return profile
+
+
+async def _afetch_profile(profile_url: str):
+    """The RapidAPI profile request itself, network only"""
     params = {
         "linkedin_url": profile_url,
         "include_skills": "false",
@@ -69,17 +185,47 @@ def get_linkedin_profile(profile_url: str) -> dict:
     }
 
     headers = {
-        "x-rapidapi-key": RAPID_API_KEY,
+        "x-rapidapi-key": require_env("RAPID_API_KEY"),
         "x-rapidapi-host": RAPID_API_HOST
     }
-    
+    return await _request(RAPIDAPI, RAPID_API_URL, headers=headers, params=params)
+
+
+async def aget_linkedin_profile(profile_url: str, use_cache: bool = True) -> dict:
+    """
+    Fetch LinkedIn profile data using RapidAPI (async), serving repeat URLs from the profile cache.
+
+    Profiles are returned, and cached, in the compact form of normalize_profile(). The
+    cache lookup and write run in the executor, so only the request itself is on the loop.
+    """
+    cache = get_profile_cache() if use_cache else None
+    if cache is not None:
+        cached = await run_blocking(_cached_profile, profile_url, cache)
+        if cached is not None:
+            return cached
+    try:
+        response = await _afetch_profile(profile_url)
+        return await run_blocking(_store_profile, profile_url, response, cache)
+    except Exception as e:
+        print(f"Error fetching profile: {e}")
+        return {}
+
+
+def get_linkedin_profile(profile_url: str, use_cache: bool = True) -> dict:
+    """
+    Fetch compact LinkedIn profile data using RapidAPI, serving repeat URLs from the profile cache.
+
+    The cache is read and written on the calling thread; only the request runs on the
+    shared HTTP loop.
+    """
+    cache = get_profile_cache() if use_cache else None
+    if cache is not None:
+        cached = _cached_profile(profile_url, cache)
+        if cached is not None:
+            return cached
     try:
-        response = requests.get(url, headers=headers, params=params)    
-        if response.status_code == 200:
-            return response.json()['data']
-        else:
-            print(f"LinkedIn API error: {response.status_code}")
-            return {}
+        response = run_sync(_afetch_profile(profile_url))
+        return _store_profile(profile_url, response, cache)
     except Exception as e:
         print(f"Error fetching profile: {e}")
-        return {} 
+        return {}
@@ -0,0 +1,40 @@
+import os
+import threading
+
+_loaded = False
+_lock = threading.Lock()
+
+
+def load_env() -> None:
+    """Load .env into os.environ once per process (later calls are free)"""
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if not _loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _loaded = True
+
+
+def require_env(name: str) -> str:
+    """
+    Read a required setting, loading .env first.
+
+    Settings are read when first needed rather than at import time, so importing the
+    package works without every API key set.
+
+    Args:
+        name: Environment variable name
+
+    Returns:
+        The variable's value
+
+    Raises:
+        KeyError: If the variable is not set
+    """
+    load_env()
+    try:
+        return os.environ[name]
+    except KeyError:
+        raise KeyError(f"Missing required environment variable: {name}") from None
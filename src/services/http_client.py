@@ -0,0 +1,153 @@
+import os
+import atexit
+import asyncio
+import functools
+import threading
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+if TYPE_CHECKING:
+    import httpx
+
+HTTP_TIMEOUT_SECONDS = float(os.environ.get("HTTP_TIMEOUT_SECONDS", "30"))
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.environ.get("HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
+HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", "200"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("HTTP_MAX_KEEPALIVE_CONNECTIONS", "50"))
+
+T = TypeVar("T")
+
+
+def _new_client() -> "httpx.AsyncClient":
+    """Build a pooled keep-alive client with the configured timeouts and limits"""
+    # Imported here so importing the package doesn't pay for httpx until the first request
+    import httpx
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS),
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+    )
+
+
+# httpx clients are bound to the event loop they were first used on, so keep one pool per loop
+_clients: Dict[int, "httpx.AsyncClient"] = {}
+_clients_lock = threading.Lock()
+
+
+def get_async_client() -> "httpx.AsyncClient":
+    """
+    Return the pooled AsyncClient for the running event loop, creating it on first use.
+
+    Returns:
+        Shared httpx.AsyncClient
+    """
+    loop_id = id(asyncio.get_running_loop())
+    with _clients_lock:
+        client = _clients.get(loop_id)
+        if client is None or client.is_closed:
+            client = _clients[loop_id] = _new_client()
+        return client
+
+
+async def aget(url: str, params: Optional[Dict[str, Any]] = None,
+               headers: Optional[Dict[str, str]] = None) -> "httpx.Response":
+    """
+    Send a GET request over the pooled connection for the running loop.
+
+    Args:
+        url: Request URL
+        params: Query parameters
+        headers: Extra request headers
+
+    Returns:
+        httpx.Response (non-2xx responses are returned, not raised)
+    """
+    return await get_async_client().get(url, params=params, headers=headers)
+
+
+async def run_blocking(fn: Callable[..., T], *args: Any) -> T:
+    """
+    Run blocking work (SQLite reads and writes, CPU-bound parsing) in the loop's default
+    executor, so it doesn't hold up the other requests in flight on the same loop.
+
+    Args:
+        fn: Blocking callable
+        *args: Its arguments
+
+    Returns:
+        fn(*args)
+    """
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(fn, *args))
+
+
+class _LoopThread:
+    """Background event loop that lets synchronous callers share one async connection pool"""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="http-client-loop", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def stop(self) -> None:
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            asyncio.run_coroutine_threadsafe(_close_loop_client(), loop).result(timeout=5)
+            loop.call_soon_threadsafe(loop.stop)
+
+
+_loop_thread = _LoopThread()
+
+
+async def _close_loop_client() -> None:
+    loop_id = id(asyncio.get_running_loop())
+    with _clients_lock:
+        client = _clients.pop(loop_id, None)
+    if client is not None:
+        await client.aclose()
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """
+    Run a coroutine on the shared background loop and block until it finishes.
+
+    This is the sync wrapper used by the blocking API functions: every thread that
+    calls it reuses the same pooled connections instead of opening its own.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    if _loop_thread.in_loop_thread():
+        raise RuntimeError("run_sync() cannot be called from the HTTP client loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, _loop_thread.loop()).result()
+
+
+def get(url: str, params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None) -> "httpx.Response":
+    """Blocking version of aget() that shares the background connection pool"""
+    return run_sync(aget(url, params=params, headers=headers))
+
+
+def close_http_clients() -> None:
+    """Close the background loop and its connection pool"""
+    try:
+        _loop_thread.stop()
+    except Exception:
+        pass
+
+
+atexit.register(close_http_clients)
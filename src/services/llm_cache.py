@@ -0,0 +1,367 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional, Union
+from .rate_limiter import get_rate_limiter, OPENAI
+from .metrics import get_metrics
+from .quota import QuotaExceededError, get_quota_tracker
+from .resilience import (
+    CircuitOpenError, get_guard, call_with_retry, backoff_delay, error_status, error_retry_after
+)
+
+LLM_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", ".cache/llm.sqlite3")
+LLM_CACHE_MEMORY_ENTRIES = int(os.environ.get("LLM_CACHE_MEMORY_ENTRIES", "2048"))
+LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+
+
+@dataclass
+class LLMCacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    writes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+
+
+def _normalize_prompt(prompt: Any) -> str:
+    """Render a prompt to text and collapse whitespace so cosmetic changes don't miss the cache"""
+    text = prompt if isinstance(prompt, str) else prompt.to_string()
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _model_params(llm: Any) -> Dict[str, Any]:
+    """The generation parameters that change the output of a chat model"""
+    return {
+        "temperature": getattr(llm, "temperature", None),
+        "max_tokens": getattr(llm, "max_tokens", None),
+        "top_p": getattr(llm, "top_p", None),
+        "seed": getattr(llm, "seed", None),
+    }
+
+
+def make_cache_key(model: str, params: Dict[str, Any], prompt: Any) -> str:
+    """
+    Build a cache key from the model, its generation parameters and the rendered prompt.
+
+    Args:
+        model: Model name
+        params: Generation parameters (temperature, max_tokens, ...)
+        prompt: Rendered prompt (string or LangChain PromptValue)
+
+    Returns:
+        sha256 hex digest
+    """
+    material = json.dumps(
+        {"model": model, "params": params, "prompt": _normalize_prompt(prompt)},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Two-tier LLM response cache: an in-memory LRU in front of a persistent SQLite table"""
+
+    def __init__(self, path: str = LLM_CACHE_PATH, memory_entries: int = LLM_CACHE_MEMORY_ENTRIES):
+        """
+        Args:
+            path: SQLite file for the persistent tier (":memory:" for a throwaway cache)
+            memory_entries: Capacity of the in-memory LRU tier
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.memory_entries = memory_entries
+        self.stats = LLMCacheStats()
+        # key -> (response, expires_at), least recently used first
+        self._memory: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("DELETE FROM llm_responses WHERE expires_at < ?", (time.time(),))
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a response, checking memory first and then disk.
+
+        Args:
+            key: Key from make_cache_key()
+
+        Returns:
+            The cached response text, or None on a miss or an expired entry
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                response, expires_at = entry
+                if expires_at >= now:
+                    self._memory.move_to_end(key)
+                    self.stats.memory_hits += 1
+                    return response
+                del self._memory[key]
+
+            row = self._conn.execute(
+                "SELECT response, expires_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] < now:
+                self.stats.misses += 1
+                return None
+            self.stats.disk_hits += 1
+            self._remember(key, row[0], row[1])
+            return row[0]
+
+    def put(self, key: str, response: str, ttl_seconds: float, namespace: str = "default") -> None:
+        """
+        Store a response in both tiers.
+
+        Args:
+            key: Key from make_cache_key()
+            response: Raw response text
+            ttl_seconds: How long the response may be reused
+            namespace: Call site name, kept for inspection and selective purges
+        """
+        now = time.time()
+        expires_at = now + ttl_seconds
+        with self._lock:
+            self._remember(key, response, expires_at)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, namespace, response, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (key, namespace, response, now, expires_at),
+            )
+            self._conn.commit()
+            self.stats.writes += 1
+
+    def _remember(self, key: str, response: str, expires_at: float) -> None:
+        """Insert into the memory tier, evicting the least recently used entry (lock held)"""
+        self._memory[key] = (response, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Drop every cached response, or only those of one call site"""
+        with self._lock:
+            self._memory.clear()
+            if namespace is None:
+                self._conn.execute("DELETE FROM llm_responses")
+            else:
+                self._conn.execute("DELETE FROM llm_responses WHERE namespace = ?", (namespace,))
+            self._conn.commit()
+
+    def stats_dict(self) -> Dict[str, Any]:
+        """Stats snapshot for logging"""
+        return {**asdict(self.stats), "hit_rate": round(self.stats.hit_rate, 3)}
+
+
+_default_cache: Optional[LLMCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """Return the process-wide LLM cache, or None if caching is disabled"""
+    global _default_cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LLMCache()
+        return _default_cache
+
+
+def _response_text(message: Any) -> str:
+    return message if isinstance(message, str) else str(message.content)
+
+
+def _record_usage(llm: Any, message: Any, provider: str = OPENAI) -> None:
+    """Count the tokens the provider reported for one response, against its daily quota too"""
+    usage = getattr(message, "usage_metadata", None) or {}
+    get_metrics().record_llm_usage(
+        getattr(llm, "model_name", type(llm).__name__),
+        usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+    )
+    quota = get_quota_tracker()
+    if quota is not None:
+        quota.record(provider, usage.get("input_tokens", 0) + usage.get("output_tokens", 0))
+
+
+def cached_invoke(llm: Any, prompt: Any, parse: Callable[[str], Any] = lambda text: text,
+                  namespace: str = "default", ttl_seconds: float = 0, provider: str = OPENAI) -> Any:
+    """
+    Invoke a chat model through the response cache.
+
+    Only responses that parse successfully are stored, so a malformed completion is
+    never replayed. Cache misses are refused once the provider's daily quota is used up,
+    and are rate limited against the provider's bucket and retried with backoff on
+    throttling and transient errors.
+
+    Args:
+        llm: LangChain chat model
+        prompt: Rendered prompt (string or PromptValue)
+        parse: Turns the response text into the caller's result, e.g. JsonOutputParser.parse
+        namespace: Call site name
+        ttl_seconds: How long the response may be reused; 0 or less bypasses the cache
+        provider: Rate limiter bucket charged on a miss
+
+    Returns:
+        parse(response_text)
+
+    Raises:
+        QuotaExceededError: If the response isn't cached and the provider's daily quota is used up
+    """
+    cache = get_llm_cache() if ttl_seconds > 0 else None
+    key = None
+    if cache is not None:
+        key = make_cache_key(getattr(llm, "model_name", type(llm).__name__), _model_params(llm), prompt)
+        cached = cache.get(key)
+        if cached is not None:
+            try:
+                result = parse(cached)
+                get_metrics().record_cache("llm", "hit")
+                return result
+            except Exception:
+                pass
+        get_metrics().record_cache("llm", "miss")
+
+    quota = get_quota_tracker()
+    if quota is not None:
+        quota.check(provider)
+
+    def invoke():
+        get_rate_limiter(provider).acquire()
+        return llm.invoke(prompt)
+
+    message = call_with_retry(invoke, provider)
+    _record_usage(llm, message, provider)
+    text = _response_text(message)
+    result = parse(text)
+    if cache is not None:
+        cache.put(key, text, ttl_seconds, namespace)
+    return result
+
+
+def cached_batch(llm: Any, prompts: List[Any], parse: Callable[[str], Any] = lambda text: text,
+                 namespace: str = "default", ttl_seconds: float = 0, max_concurrency: int = 4,
+                 provider: str = OPENAI) -> List[Union[Any, Exception]]:
+    """
+    Batch version of cached_invoke(): cache hits are served locally and only the misses
+    are sent, concurrently, as one Runnable batch.
+
+    Every prompt sent holds a slot of the provider's adaptive limit while it is in flight,
+    so batches and call_with_retry() traffic share the same cap, and prompts that failed with
+    a throttling or transient error are resent together after a backoff. While the
+    provider's circuit is half-open, a single prompt goes out as the trial and the rest
+    follow once it has closed the circuit. Once the provider's daily quota is used up,
+    the prompts not sent yet fail with QuotaExceededError.
+
+    Args:
+        llm: LangChain chat model
+        prompts: Rendered prompts
+        parse: Turns each response text into the caller's result
+        namespace: Call site name
+        ttl_seconds: How long responses may be reused; 0 or less bypasses the cache
+        max_concurrency: Maximum requests in flight
+        provider: Rate limiter bucket charged for each miss
+
+    Returns:
+        One parsed result per prompt, or the Exception raised for it
+    """
+    cache = get_llm_cache() if ttl_seconds > 0 else None
+    results: List[Union[Any, Exception, None]] = [None] * len(prompts)
+    keys: List[Optional[str]] = [None] * len(prompts)
+    misses = []
+    for i, prompt in enumerate(prompts):
+        if cache is not None:
+            keys[i] = make_cache_key(getattr(llm, "model_name", type(llm).__name__), _model_params(llm), prompt)
+            cached = cache.get(keys[i])
+            if cached is not None:
+                try:
+                    results[i] = parse(cached)
+                    get_metrics().record_cache("llm", "hit")
+                    continue
+                except Exception:
+                    pass
+            get_metrics().record_cache("llm", "miss")
+        misses.append(i)
+
+    guard = get_guard(provider)
+    quota = get_quota_tracker()
+
+    def invoke(prompt: Any) -> Any:
+        guard.limiter.acquire()
+        try:
+            return llm.invoke(prompt)
+        finally:
+            guard.limiter.release()
+
+    # Imported here so importing the module doesn't pay for LangChain
+    from langchain_core.runnables import RunnableLambda
+    limited = RunnableLambda(invoke)
+    attempt = 1
+    while misses:
+        try:
+            # Quota first: a refused batch must not take the circuit's half-open trial
+            if quota is not None:
+                quota.check(provider)
+            trial = guard.check()
+        except (QuotaExceededError, CircuitOpenError) as e:
+            for i in misses:
+                results[i] = e
+            break
+        sending, waiting = (misses[:1], misses[1:]) if trial else (misses, [])
+        try:
+            get_rate_limiter(provider).acquire(len(sending))
+            responses = limited.batch(
+                [prompts[i] for i in sending],
+                config={"max_concurrency": max(1, min(max_concurrency, guard.limiter.limit))},
+                return_exceptions=True
+            )
+        except BaseException:
+            if trial:
+                guard.release_trial()
+            raise
+        retry, retry_after = [], None
+        for i, response in zip(sending, responses):
+            if isinstance(response, Exception):
+                results[i] = response
+                if guard.record(error_status(response), response) and attempt < guard.policy.max_attempts:
+                    retry.append(i)
+                    retry_after = max(retry_after or 0.0, error_retry_after(response) or 0.0)
+                continue
+            guard.record(200)
+            _record_usage(llm, response, provider)
+            text = _response_text(response)
+            try:
+                results[i] = parse(text)
+            except Exception as e:
+                results[i] = e
+                continue
+            if cache is not None:
+                cache.put(keys[i], text, ttl_seconds, namespace)
+
+        if retry:
+            get_metrics().inc("api_retries_total", len(retry), provider=provider)
+            time.sleep(backoff_delay(attempt, guard.policy, retry_after))
+            attempt += 1
+        misses = sorted(retry + waiting)
+    return results
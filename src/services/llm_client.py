@@ -0,0 +1,55 @@
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+from .env import load_env, require_env
+
+DEFAULT_MODEL = "gpt-4o-mini"
+
+_clients: Dict[Tuple[str, Optional[float]], Any] = {}
+_clients_lock = threading.Lock()
+
+
+def get_llm(temperature: Optional[float] = None, model: str = DEFAULT_MODEL) -> Any:
+    """
+    Return the shared chat model client for a model and temperature.
+
+    Clients are built on first use and reused by every module, so importing the package
+    doesn't pay for langchain_openai or need OPENAI_API_KEY until an LLM call is made.
+
+    Args:
+        temperature: Sampling temperature (None uses the provider default)
+        model: OpenAI model name
+
+    Returns:
+        langchain_openai.ChatOpenAI instance
+    """
+    key = (model, temperature)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            from langchain_openai import ChatOpenAI
+            from pydantic import SecretStr
+            load_env()
+            kwargs: Dict[str, Any] = {
+                "api_key": SecretStr(require_env("OPENAI_API_KEY")),
+                "model": model,
+                # Retries are done by services.resilience so they share the backoff,
+                # circuit breaker and concurrency limit of every other OpenAI call
+                "max_retries": 0,
+            }
+            if temperature is not None:
+                kwargs["temperature"] = temperature
+            base_url = os.environ.get("OPENAI_BASE_URL")
+            if base_url:
+                kwargs["base_url"] = base_url
+            client = _clients[key] = ChatOpenAI(**kwargs)
+        return client
+
+
+def reset_llm_clients() -> None:
+    """Drop every cached client, e.g. after changing OPENAI_BASE_URL in a benchmark"""
+    with _clients_lock:
+        _clients.clear()
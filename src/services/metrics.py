@@ -0,0 +1,272 @@
+import os
+import json
+import time
+import threading
+import functools
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() not in ("0", "false", "no")
+METRICS_SUMMARY_PATH = os.environ.get("METRICS_SUMMARY_PATH", "run_summary.json")
+METRICS_PROMETHEUS_PATH = os.environ.get("METRICS_PROMETHEUS_PATH", "metrics.prom")
+# Recent samples kept per span for quantiles
+METRICS_MAX_SAMPLES = int(os.environ.get("METRICS_MAX_SAMPLES", "4096"))
+
+METRIC_PREFIX = "syn_"
+QUANTILES = (0.5, 0.95, 0.99)
+
+# USD per 1M (prompt, completion) tokens, for the cost estimate
+MODEL_PRICES_PER_1M = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+
+# Metric name -> help text; every metric the package records is listed here
+METRIC_HELP = {
+    "span_duration_seconds": "Wall time of instrumented operations",
+    "span_errors_total": "Instrumented operations that raised",
+    "api_requests_total": "External API requests by provider and HTTP status",
+    "api_retries_total": "External API requests that were retried",
+    "api_in_flight": "External API requests currently in flight",
+    "concurrency_limit": "Adaptive (AIMD) concurrency limit per provider",
+    "circuit_open": "1 while a provider's circuit breaker is open",
+    "circuit_rejections_total": "Calls refused because the provider's circuit was open",
+    "cache_lookups_total": "Cache lookups by cache and result",
+    "talent_pool_searches_total": "Candidate searches served locally, topped up or external",
+    "llm_requests_total": "LLM requests sent (cache misses)",
+    "llm_prompt_tokens_total": "Prompt tokens reported by the LLM provider",
+    "llm_completion_tokens_total": "Completion tokens reported by the LLM provider",
+    "llm_cost_usd_total": "Estimated LLM spend in USD",
+    "service_jobs_total": "Service submissions finished, by status",
+    "service_rejections_total": "Service submissions refused because the queue was full",
+    "pipeline_items_failed_total": "Items a pipeline stage dropped because processing them raised",
+    "prompt_compactions_total": "Profiles compacted for a scoring prompt",
+    "prompt_profile_tokens_total": "Estimated profile tokens kept in or trimmed from scoring prompts",
+    "profile_payload_bytes_total": "Fetched profile payload sizes, raw from the API and as kept after normalization",
+    "quota_rejections_total": "Calls refused because the provider's daily quota was used up",
+    "scheduler_candidates_total": "Candidates admitted by the scheduler, or skipped by a per-job cap or quota",
+    "incremental_reuses_total": "Job results, searches, scores and outreach reused from an earlier version of a job",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _quantile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+class Metrics:
+    """
+    In-process metrics registry: counters, gauges and timing spans with labels.
+
+    Everything is kept in plain dicts under one lock, so recording is cheap enough to
+    leave on in production runs. Export with to_prometheus() or summary().
+    """
+
+    def __init__(self, enabled: bool = METRICS_ENABLED, max_samples: int = METRICS_MAX_SAMPLES):
+        """
+        Args:
+            enabled: Record anything at all (disabled registries ignore every call)
+            max_samples: Recent durations kept per span series for quantiles
+        """
+        self.enabled = enabled
+        self.max_samples = max_samples
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._gauges: Dict[str, Dict[Labels, float]] = {}
+        self._spans: Dict[Labels, Tuple[List[float], Deque[float]]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Add value to a counter"""
+        if not self.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def add_gauge(self, name: str, delta: float, **labels: Any) -> None:
+        """Move a gauge up or down"""
+        if not self.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            series = self._gauges.setdefault(name, {})
+            series[key] = series.get(key, 0) + delta
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """Set a gauge to an absolute value"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges.setdefault(name, {})[_labels(labels)] = value
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record one duration of the named span"""
+        if not self.enabled:
+            return
+        key = _labels({"span": name})
+        with self._lock:
+            entry = self._spans.get(key)
+            if entry is None:
+                entry = self._spans[key] = ([0, 0.0], deque(maxlen=self.max_samples))
+            entry[0][0] += 1
+            entry[0][1] += seconds
+            entry[1].append(seconds)
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one occurrence of the span; exceptions are counted and re-raised"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.inc("span_errors_total", span=name)
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    @contextmanager
+    def in_flight(self, provider: str) -> Iterator[None]:
+        """Count the enclosed block as an in-flight request to provider"""
+        self.add_gauge("api_in_flight", 1, provider=provider)
+        try:
+            yield
+        finally:
+            self.add_gauge("api_in_flight", -1, provider=provider)
+
+    def record_request(self, provider: str, status: Any) -> None:
+        """Count one external API response (status is the HTTP code, or "error")"""
+        self.inc("api_requests_total", provider=provider, status=status)
+
+    def record_retry(self, provider: str) -> None:
+        self.inc("api_retries_total", provider=provider)
+
+    def record_cache(self, cache: str, result: str) -> None:
+        """Count one cache lookup (result: "hit", "miss", ...)"""
+        self.inc("cache_lookups_total", cache=cache, result=result)
+
+    def record_llm_usage(self, model: str, prompt_tokens: int, completion_tokens: int) -> None:
+        """Count an LLM response's tokens and their estimated cost"""
+        self.inc("llm_requests_total", model=model)
+        self.inc("llm_prompt_tokens_total", prompt_tokens, model=model)
+        self.inc("llm_completion_tokens_total", completion_tokens, model=model)
+        prices = MODEL_PRICES_PER_1M.get(model)
+        if prices is not None:
+            cost = (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000
+            self.inc("llm_cost_usd_total", cost, model=model)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._spans.clear()
+            self.started_at = time.time()
+
+    def _snapshot(self):
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            gauges = {name: dict(series) for name, series in self._gauges.items()}
+            spans = {key: (count, total, sorted(samples)) for key, ((count, total), samples) in self._spans.items()}
+        return counters, gauges, spans
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        counters, gauges, spans = self._snapshot()
+        lines: List[str] = []
+
+        def header(name: str, kind: str) -> None:
+            lines.append(f"# HELP {METRIC_PREFIX}{name} {METRIC_HELP.get(name, name)}")
+            lines.append(f"# TYPE {METRIC_PREFIX}{name} {kind}")
+
+        for name in sorted(counters):
+            header(name, "counter")
+            for labels, value in sorted(counters[name].items()):
+                lines.append(f"{METRIC_PREFIX}{name}{_format_labels(labels)} {value:g}")
+        for name in sorted(gauges):
+            header(name, "gauge")
+            for labels, value in sorted(gauges[name].items()):
+                lines.append(f"{METRIC_PREFIX}{name}{_format_labels(labels)} {value:g}")
+        if spans:
+            name = "span_duration_seconds"
+            header(name, "summary")
+            for labels, (count, total, ordered) in sorted(spans.items()):
+                for q in QUANTILES:
+                    lines.append(f"{METRIC_PREFIX}{name}{_format_labels(labels, ('quantile', str(q)))} "
+                                 f"{_quantile(ordered, q):.6f}")
+                lines.append(f"{METRIC_PREFIX}{name}_sum{_format_labels(labels)} {total:.6f}")
+                lines.append(f"{METRIC_PREFIX}{name}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-friendly run summary: span latencies, counters and gauges"""
+        counters, gauges, spans = self._snapshot()
+
+        def flatten(series: Dict[Labels, float]) -> List[Dict[str, Any]]:
+            return [{**dict(labels), "value": round(value, 6)} for labels, value in sorted(series.items())]
+
+        return {
+            "started_at": self.started_at,
+            "elapsed_seconds": round(time.time() - self.started_at, 3),
+            "spans": {
+                dict(labels)["span"]: {
+                    "count": count,
+                    "total_seconds": round(total, 3),
+                    **{f"p{int(q * 100)}_ms": round(_quantile(ordered, q) * 1000, 1) for q in QUANTILES},
+                }
+                for labels, (count, total, ordered) in sorted(spans.items())
+            },
+            "counters": {name: flatten(series) for name, series in sorted(counters.items())},
+            "gauges": {name: flatten(series) for name, series in sorted(gauges.items())},
+        }
+
+    def write(self, summary_path: Optional[str] = METRICS_SUMMARY_PATH,
+              prometheus_path: Optional[str] = METRICS_PROMETHEUS_PATH) -> None:
+        """
+        Write the JSON summary and the Prometheus text file.
+
+        Args:
+            summary_path: JSON run summary output (None skips it)
+            prometheus_path: Prometheus text output (None skips it)
+        """
+        if summary_path:
+            with open(summary_path, "w") as f:
+                json.dump(self.summary(), f, indent=2)
+        if prometheus_path:
+            with open(prometheus_path, "w") as f:
+                f.write(self.to_prometheus())
+
+
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """Return the process-wide metrics registry"""
+    return _metrics
+
+
+def traced(name: str) -> Callable[[Callable], Callable]:
+    """Decorator timing every call of the function as the named span"""
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with get_metrics().span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
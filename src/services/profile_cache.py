@@ -0,0 +1,170 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from dataclasses import dataclass, asdict
+from typing import Optional, Dict, Any
+from .urls import canonicalize_linkedin_url
+
+PROFILE_CACHE_PATH = os.environ.get("PROFILE_CACHE_PATH", ".cache/profiles.sqlite3")
+PROFILE_CACHE_TTL_HOURS = float(os.environ.get("PROFILE_CACHE_TTL_HOURS", "168"))
+PROFILE_CACHE_MAX_ENTRIES = int(os.environ.get("PROFILE_CACHE_MAX_ENTRIES", "50000"))
+# A hit only bumps its entry's LRU recency when the last bump is older than this, so hot
+# reads don't each turn into a write
+PROFILE_CACHE_TOUCH_SECONDS = float(os.environ.get("PROFILE_CACHE_TOUCH_SECONDS", "60"))
+PROFILE_CACHE_ENABLED = os.environ.get("PROFILE_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ProfileCache:
+    """Persistent LinkedIn profile cache keyed by the hash of the canonical profile URL"""
+
+    def __init__(self, path: str = PROFILE_CACHE_PATH, ttl_seconds: float = PROFILE_CACHE_TTL_HOURS * 3600,
+                 max_entries: int = PROFILE_CACHE_MAX_ENTRIES, touch_seconds: float = PROFILE_CACHE_TOUCH_SECONDS):
+        """
+        Args:
+            path: SQLite file to store profiles in (":memory:" for a throwaway cache)
+            ttl_seconds: How long a fetched profile stays valid (0 or less disables expiry)
+            max_entries: Maximum number of profiles kept; least recently used are evicted first
+            touch_seconds: Minimum age of an entry's recency before a hit refreshes it
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.touch_seconds = touch_seconds
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS profiles (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_profiles_last_access ON profiles(last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        """Content address of a profile: sha256 of its canonical URL"""
+        return hashlib.sha256(canonicalize_linkedin_url(url).encode("utf-8")).hexdigest()
+
+    def _is_expired(self, fetched_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - fetched_at > self.ttl_seconds
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached profile.
+
+        Args:
+            url: LinkedIn profile URL (any form, it is canonicalized)
+
+        Returns:
+            The cached profile data, or None on a miss or an expired entry
+        """
+        key = self.key_for(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, fetched_at, last_access FROM profiles WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            payload, fetched_at, last_access = row
+            if self._is_expired(fetched_at, now):
+                self._conn.execute("DELETE FROM profiles WHERE key = ?", (key,))
+                self._conn.commit()
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+            if now - last_access >= self.touch_seconds:
+                self._conn.execute("UPDATE profiles SET last_access = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+            self.stats.hits += 1
+        return json.loads(payload)
+
+    def contains(self, url: str) -> bool:
+        """Check for a fresh entry without touching stats or LRU order"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fetched_at FROM profiles WHERE key = ?", (self.key_for(url),)
+            ).fetchone()
+        return row is not None and not self._is_expired(row[0], time.time())
+
+    def put(self, url: str, profile: Dict[str, Any]) -> None:
+        """
+        Store a fetched profile, evicting the least recently used entries if the cache is full.
+
+        Args:
+            url: LinkedIn profile URL the data was fetched for
+            profile: Profile data returned by the API (empty results are not cached)
+        """
+        if not profile:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO profiles (key, url, payload, fetched_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (self.key_for(url), canonicalize_linkedin_url(url), json.dumps(profile), now, now),
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM profiles WHERE key IN (SELECT key FROM profiles ORDER BY last_access ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self.stats.evictions += overflow
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every cached profile"""
+        with self._lock:
+            self._conn.execute("DELETE FROM profiles")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def stats_dict(self) -> Dict[str, Any]:
+        """Stats snapshot for logging"""
+        return {**asdict(self.stats), "hit_rate": round(self.stats.hit_rate, 3), "entries": len(self)}
+
+
+_default_cache: Optional[ProfileCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_profile_cache() -> Optional[ProfileCache]:
+    """Return the process-wide profile cache, or None if caching is disabled"""
+    global _default_cache
+    if not PROFILE_CACHE_ENABLED:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ProfileCache()
+        return _default_cache
@@ -0,0 +1,67 @@
+import sys
+from typing import Any, Dict, List, Tuple
+
+# The profile fields anything downstream reads (see ProfileData); the rest of the
+# RapidAPI payload (ids, image and company URLs, follower counts...) is dropped on arrival
+PROFILE_FIELDS = ("full_name", "headline", "about", "city", "state", "country", "location")
+EDUCATION_FIELDS = ("school", "degree", "field_of_study", "start_year", "end_year")
+EXPERIENCE_FIELDS = ("title", "company", "start_year", "end_year", "duration", "description")
+
+# Values repeated across many profiles; interned so every profile shares one string object
+INTERNED_FIELDS = frozenset((
+    "city", "state", "country", "location", "school", "degree", "field_of_study", "title", "company",
+))
+
+
+def _value(field: str, value: Any) -> Any:
+    if isinstance(value, str):
+        value = value.strip()
+        if field in INTERNED_FIELDS:
+            value = sys.intern(value)
+    return value
+
+
+def _project(entry: Dict[str, Any], fields: Tuple[str, ...]) -> Dict[str, Any]:
+    """Keep only fields that are set, stripping strings and interning the repeated ones"""
+    projected = {}
+    for field in fields:
+        value = entry.get(field)
+        if value is None:
+            continue
+        value = _value(field, value)
+        if value != "":
+            projected[field] = value
+    return projected
+
+
+def _project_list(entries: Any, fields: Tuple[str, ...]) -> List[Dict[str, Any]]:
+    if not isinstance(entries, list):
+        return []
+    return [projected for projected in (_project(entry, fields) for entry in entries if isinstance(entry, dict)) if projected]
+
+
+def normalize_profile(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compact form of a LinkedIn profile payload, as cached and passed through the pipeline.
+
+    Keeps the ProfileData fields only: the top-level PROFILE_FIELDS, and EDUCATION_FIELDS
+    and EXPERIENCE_FIELDS of each entry. Unset and empty values are dropped, strings are
+    stripped, and company names, schools, cities and other repeated values are interned.
+    Normalizing an already compact profile returns an equal dict.
+
+    Args:
+        profile: Profile data returned by the API (or read back from a cache)
+
+    Returns:
+        The compact profile, or {} for an empty or malformed payload
+    """
+    if not isinstance(profile, dict) or not profile:
+        return {}
+    compact = _project(profile, PROFILE_FIELDS)
+    educations = _project_list(profile.get("educations"), EDUCATION_FIELDS)
+    experiences = _project_list(profile.get("experiences"), EXPERIENCE_FIELDS)
+    if educations:
+        compact["educations"] = educations
+    if experiences:
+        compact["experiences"] = experiences
+    return compact
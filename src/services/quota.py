@@ -0,0 +1,129 @@
+import os
+import time
+import sqlite3
+import threading
+from typing import Dict, Optional
+from .metrics import get_metrics
+from .rate_limiter import GOOGLE_CSE, RAPIDAPI, OPENAI
+
+QUOTA_PATH = os.environ.get("QUOTA_PATH", ".cache/quota.sqlite3")
+QUOTA_ENABLED = os.environ.get("QUOTA_ENABLED", "true").lower() not in ("0", "false", "no")
+# Daily limits per provider (0 = unlimited): API calls for Google CSE and RapidAPI,
+# prompt + completion tokens for OpenAI. Days are UTC calendar days.
+QUOTA_DAILY_LIMITS = {
+    GOOGLE_CSE: int(os.environ.get("QUOTA_GOOGLE_CSE_CALLS_PER_DAY", "0")),
+    RAPIDAPI: int(os.environ.get("QUOTA_RAPIDAPI_CALLS_PER_DAY", "0")),
+    OPENAI: int(os.environ.get("QUOTA_OPENAI_TOKENS_PER_DAY", "0")),
+}
+
+
+class QuotaExceededError(Exception):
+    """Raised instead of calling a provider whose daily quota is used up"""
+
+
+def _today() -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime())
+
+
+class QuotaTracker:
+    """
+    Daily usage per provider, persisted so the quota holds across runs and across the
+    worker processes sharing the file.
+
+    Usage is recorded as it happens (calls as they are sent, tokens as the provider
+    reports them); check() refuses calls once a provider's limit is reached.
+    """
+
+    def __init__(self, path: str = QUOTA_PATH, limits: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            path: SQLite file holding the usage (":memory:" for a throwaway tracker)
+            limits: Daily limit per provider (defaults to QUOTA_DAILY_LIMITS; 0 = unlimited)
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.limits = dict(QUOTA_DAILY_LIMITS if limits is None else limits)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS quota_usage (
+                day TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                used INTEGER NOT NULL,
+                PRIMARY KEY (day, provider)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def record(self, provider: str, amount: int = 1) -> None:
+        """Add usage for today (calls, or tokens for OpenAI)"""
+        if amount <= 0:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO quota_usage (day, provider, used) VALUES (?, ?, ?) "
+                "ON CONFLICT(day, provider) DO UPDATE SET used = used + excluded.used",
+                (_today(), provider, int(amount))
+            )
+            self._conn.commit()
+
+    def used(self, provider: str) -> int:
+        """Usage recorded today"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT used FROM quota_usage WHERE day = ? AND provider = ?", (_today(), provider)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def remaining(self, provider: str) -> Optional[int]:
+        """Usage left today, or None if the provider is unlimited"""
+        limit = self.limits.get(provider, 0)
+        if limit <= 0:
+            return None
+        return max(0, limit - self.used(provider))
+
+    def remaining_fraction(self) -> float:
+        """Smallest share of today's quota left over the limited providers (1.0 if none is limited)"""
+        fractions = [
+            self.remaining(provider) / limit
+            for provider, limit in self.limits.items() if limit > 0
+        ]
+        return min(fractions, default=1.0)
+
+    def exhausted(self, provider: str) -> bool:
+        remaining = self.remaining(provider)
+        return remaining is not None and remaining <= 0
+
+    def check(self, provider: str) -> None:
+        """
+        Raises:
+            QuotaExceededError: If the provider's daily quota is used up
+        """
+        if self.exhausted(provider):
+            get_metrics().inc("quota_rejections_total", provider=provider)
+            raise QuotaExceededError(f"Daily {provider} quota of {self.limits[provider]} is used up")
+
+    def usage(self) -> Dict[str, Dict[str, Optional[int]]]:
+        """Today's usage and limit per provider"""
+        return {
+            provider: {"used": self.used(provider), "limit": limit or None}
+            for provider, limit in self.limits.items()
+        }
+
+
+_default_tracker: Optional[QuotaTracker] = None
+_default_tracker_lock = threading.Lock()
+
+
+def get_quota_tracker() -> Optional[QuotaTracker]:
+    """Return the process-wide quota tracker, or None if quota tracking is disabled"""
+    global _default_tracker
+    if not QUOTA_ENABLED:
+        return None
+    with _default_tracker_lock:
+        if _default_tracker is None:
+            _default_tracker = QuotaTracker()
+        return _default_tracker
@@ -0,0 +1,120 @@
+import os
+import time
+import asyncio
+import threading
+from typing import Dict
+
+GOOGLE_CSE = "google_cse"
+RAPIDAPI = "rapidapi"
+OPENAI = "openai"
+
+# Requests per second and burst size per provider, overridable with
+# RATE_LIMIT_<PROVIDER>_RPS / RATE_LIMIT_<PROVIDER>_BURST
+DEFAULT_LIMITS = {
+    GOOGLE_CSE: (1.5, 3),
+    RAPIDAPI: (1.0, 1),
+    OPENAI: (5.0, 10),
+}
+
+
+class TokenBucket:
+    """
+    Thread-safe and asyncio-compatible token bucket.
+
+    Callers reserve tokens under a short lock and then sleep outside it, so waiting
+    threads and coroutines never block each other and are served in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            burst: Maximum tokens that can accumulate while idle
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """Take tokens (possibly going into debt) and return how long the caller must wait"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Block the current thread until the tokens are available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, tokens: float = 1) -> float:
+        """
+        Wait without blocking the event loop until the tokens are available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def _limit_from_env(provider: str):
+    rate, burst = DEFAULT_LIMITS.get(provider, (1.0, 1))
+    prefix = f"RATE_LIMIT_{provider.upper()}"
+    return float(os.environ.get(f"{prefix}_RPS", rate)), int(os.environ.get(f"{prefix}_BURST", burst))
+
+
+def get_rate_limiter(provider: str) -> TokenBucket:
+    """
+    Return the process-wide token bucket for a provider, creating it on first use.
+
+    Args:
+        provider: One of GOOGLE_CSE, RAPIDAPI, OPENAI (or any custom name)
+
+    Returns:
+        The shared TokenBucket for that provider
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            rate, burst = _limit_from_env(provider)
+            limiter = _limiters[provider] = TokenBucket(rate, burst)
+        return limiter
+
+
+def configure_rate_limit(provider: str, rate: float, burst: int = 1) -> TokenBucket:
+    """
+    Replace a provider's bucket, e.g. to match a paid quota tier.
+
+    Args:
+        provider: Provider name
+        rate: Requests per second
+        burst: Burst size
+
+    Returns:
+        The new TokenBucket
+    """
+    with _limiters_lock:
+        limiter = _limiters[provider] = TokenBucket(rate, burst)
+        return limiter
@@ -0,0 +1,384 @@
+import os
+import time
+import random
+import asyncio
+import threading
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, TypeVar
+from .metrics import get_metrics
+
+T = TypeVar("T")
+
+RETRY_MAX_ATTEMPTS = int(os.environ.get("RETRY_MAX_ATTEMPTS", "4"))
+RETRY_BASE_DELAY_SECONDS = float(os.environ.get("RETRY_BASE_DELAY_SECONDS", "0.5"))
+RETRY_MAX_DELAY_SECONDS = float(os.environ.get("RETRY_MAX_DELAY_SECONDS", "30"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("CIRCUIT_FAILURE_THRESHOLD", "8"))
+CIRCUIT_RESET_SECONDS = float(os.environ.get("CIRCUIT_RESET_SECONDS", "30"))
+
+# Responses worth retrying: throttling and transient server errors
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+# Transport-level exception classes (httpx, openai) that mean the request never got an answer
+RETRYABLE_ERROR_CLASSES = {"TransportError", "APIConnectionError", "APITimeoutError"}
+
+# Starting and maximum concurrent requests per provider, overridable with
+# CONCURRENCY_<PROVIDER>_INITIAL / CONCURRENCY_<PROVIDER>_MAX
+DEFAULT_CONCURRENCY = {
+    "google_cse": (4, 16),
+    "rapidapi": (4, 32),
+    "openai": (8, 64),
+}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit breaker is open"""
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = RETRY_MAX_ATTEMPTS
+    base_delay: float = RETRY_BASE_DELAY_SECONDS
+    max_delay: float = RETRY_MAX_DELAY_SECONDS
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Seconds to wait according to a Retry-After header.
+
+    Args:
+        value: Header value, either delay-seconds or an HTTP date
+
+    Returns:
+        Non-negative delay in seconds, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, policy: RetryPolicy, retry_after: Optional[float] = None) -> float:
+    """
+    Delay before retry number attempt (1-based): exponential backoff with full jitter,
+    never shorter than the server's Retry-After.
+    """
+    delay = random.uniform(0, min(policy.max_delay, policy.base_delay * 2 ** (attempt - 1)))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, policy.max_delay))
+    return delay
+
+
+class CircuitBreaker:
+    """
+    Stops calling a provider after consecutive failures.
+
+    After failure_threshold failures in a row the circuit opens and calls fail fast with
+    CircuitOpenError. Once reset_seconds have passed, one trial call is let through
+    (half-open); its success closes the circuit and its failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_seconds: float = CIRCUIT_RESET_SECONDS):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+    def claim(self) -> Optional[bool]:
+        """None if no call may go out now, otherwise whether this call is the half-open trial"""
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            if time.monotonic() - self._opened_at < self.reset_seconds or self._trial_in_flight:
+                return None
+            self._trial_in_flight = True
+            return True
+
+    def allow(self) -> bool:
+        """Whether a call may go out now"""
+        return self.claim() is not None
+
+    def release_trial(self) -> None:
+        """Give up the half-open trial without an outcome (the call was never sent or was cancelled)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class AIMDLimiter:
+    """
+    Adaptive cap on concurrent requests (additive increase, multiplicative decrease).
+
+    Every success raises the limit by about 1/limit, so it grows by one per window of
+    healthy requests; a throttled response halves it, at most once per cooldown so a
+    burst of 429s from the same window only counts once. The limit settles just under
+    the provider's real capacity.
+    """
+
+    def __init__(self, initial: int, max_limit: int, min_limit: int = 1,
+                 decrease_factor: float = 0.5, cooldown: float = 1.0):
+        """
+        Args:
+            initial: Starting limit
+            max_limit: Upper bound of the limit
+            min_limit: Lower bound of the limit
+            decrease_factor: Multiplier applied when throttled
+            cooldown: Minimum seconds between two decreases
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self._limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _try_acquire(self) -> bool:
+        with self._cond:
+            if self._in_flight < int(self._limit):
+                self._in_flight += 1
+                return True
+            return False
+
+    def acquire(self) -> None:
+        """Block the current thread until a slot is free"""
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+    async def aacquire(self) -> None:
+        """Wait without blocking the event loop until a slot is free"""
+        delay = 0.005
+        while not self._try_acquire():
+            await asyncio.sleep(delay)
+            delay = min(0.05, delay * 2)
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._cond.notify()
+
+    def on_success(self) -> None:
+        with self._cond:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            self._cond.notify()
+
+    def on_throttle(self) -> None:
+        with self._cond:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.cooldown:
+                self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+                self._last_decrease = now
+
+
+class ProviderGuard:
+    """Retry policy, circuit breaker and AIMD concurrency limit of one provider"""
+
+    def __init__(self, provider: str, policy: Optional[RetryPolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None, limiter: Optional[AIMDLimiter] = None):
+        self.provider = provider
+        self.policy = policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        if limiter is None:
+            initial, max_limit = DEFAULT_CONCURRENCY.get(provider, (4, 16))
+            prefix = f"CONCURRENCY_{provider.upper()}"
+            limiter = AIMDLimiter(int(os.environ.get(f"{prefix}_INITIAL", initial)),
+                                  int(os.environ.get(f"{prefix}_MAX", max_limit)))
+        self.limiter = limiter
+
+    def check(self) -> bool:
+        """
+        Raise CircuitOpenError if the provider must not be called now.
+
+        Returns:
+            True if the call is the half-open trial: its outcome must be recorded, or
+            release_trial() called if it ends without one
+        """
+        trial = self.breaker.claim()
+        if trial is None:
+            get_metrics().inc("circuit_rejections_total", provider=self.provider)
+            raise CircuitOpenError(f"Circuit open for {self.provider}")
+        return trial
+
+    def release_trial(self) -> None:
+        self.breaker.release_trial()
+
+    def succeeded(self) -> None:
+        self.breaker.record_success()
+        self.limiter.on_success()
+        self._publish()
+
+    def throttled(self) -> None:
+        """
+        A 429: back off concurrency but leave the circuit as it is. A throttled trial
+        neither closes nor reopens it; the next call becomes the trial instead.
+        """
+        self.breaker.release_trial()
+        self.limiter.on_throttle()
+        self._publish()
+
+    def failed(self) -> None:
+        self.breaker.record_failure()
+        self._publish()
+
+    def rejected(self) -> None:
+        """A non-retryable 4xx response: the provider is up, the request was bad"""
+        self.breaker.record_success()
+        self._publish()
+
+    def inconclusive(self) -> None:
+        """
+        A non-retryable error without a response (e.g. a parse error or an SDK auth
+        error): it says nothing about the provider, so only the trial is given up
+        """
+        self.breaker.release_trial()
+
+    def record(self, status: Optional[int], error: Optional[BaseException] = None) -> bool:
+        """
+        Update the breaker and limit from one outcome.
+
+        Args:
+            status: HTTP status of the response (None if there was none)
+            error: Exception raised instead of a response
+
+        Returns:
+            True if the outcome is worth retrying
+        """
+        if status == 429:
+            self.throttled()
+            return True
+        if error is not None and status is None:
+            retryable = is_retryable_error(error)
+        else:
+            retryable = status in RETRYABLE_STATUS
+        if retryable:
+            self.failed()
+        elif status is None:
+            self.inconclusive()
+        elif error is None and status < 400:
+            self.succeeded()
+        elif status < 500:
+            self.rejected()
+        else:
+            self.failed()
+        return retryable
+
+    def _publish(self) -> None:
+        metrics = get_metrics()
+        metrics.set_gauge("concurrency_limit", self.limiter.limit, provider=self.provider)
+        metrics.set_gauge("circuit_open", int(self.breaker.is_open), provider=self.provider)
+
+
+_guards: Dict[str, ProviderGuard] = {}
+_guards_lock = threading.Lock()
+
+
+def get_guard(provider: str) -> ProviderGuard:
+    """Return the process-wide ProviderGuard of a provider, creating it on first use"""
+    with _guards_lock:
+        guard = _guards.get(provider)
+        if guard is None:
+            guard = _guards[provider] = ProviderGuard(provider)
+        return guard
+
+
+def error_status(error: BaseException) -> Optional[int]:
+    """HTTP status carried by an SDK exception (e.g. openai.RateLimitError), if any"""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Throttling, transient server errors, timeouts and dropped connections"""
+    if isinstance(error, CircuitOpenError):
+        return False
+    status = error_status(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    return any(cls.__name__ in RETRYABLE_ERROR_CLASSES for cls in type(error).__mro__)
+
+
+def error_retry_after(error: BaseException) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    return parse_retry_after(headers.get("retry-after")) if headers is not None else None
+
+
+def call_with_retry(fn: Callable[[], T], provider: str) -> T:
+    """
+    Call fn under the provider's guard, retrying throttled and transient failures.
+
+    Args:
+        fn: The call, e.g. lambda: llm.invoke(prompt)
+        provider: Provider whose retry policy, breaker and concurrency limit apply
+
+    Returns:
+        fn()'s result
+
+    Raises:
+        CircuitOpenError: If the provider's circuit is open
+        Exception: The last error once retries are exhausted or the error isn't retryable
+    """
+    guard = get_guard(provider)
+    attempt = 1
+    while True:
+        trial = guard.check()
+        recorded = False
+        guard.limiter.acquire()
+        try:
+            result = fn()
+        except Exception as e:
+            recorded = True
+            retryable = guard.record(error_status(e), e)
+            if not retryable or attempt >= guard.policy.max_attempts:
+                raise
+            delay = backoff_delay(attempt, guard.policy, error_retry_after(e))
+        else:
+            recorded = True
+            guard.succeeded()
+            return result
+        finally:
+            guard.limiter.release()
+            if trial and not recorded:
+                guard.release_trial()
+        get_metrics().record_retry(provider)
+        time.sleep(delay)
+        attempt += 1
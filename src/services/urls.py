@@ -0,0 +1,41 @@
+from urllib.parse import urlsplit, unquote
+
+LINKEDIN_HOST = "www.linkedin.com"
+
+
+def canonicalize_linkedin_url(url: str) -> str:
+    """
+    Normalize a LinkedIn profile URL so the same profile always maps to the same string.
+
+    Locale subdomains (uk.linkedin.com, in.linkedin.com, ...), the scheme, query
+    strings, fragments, trailing slashes and letter case are all normalized away.
+
+    Args:
+        url: LinkedIn URL as returned by search or entered by hand
+
+    Returns:
+        Canonical URL, e.g. https://www.linkedin.com/in/jane-doe
+    """
+    url = (url or "").strip()
+    if not url:
+        return ""
+    if "://" not in url:
+        url = "https://" + url
+
+    parts = urlsplit(url)
+    host = parts.netloc.lower().split("@")[-1].split(":")[0]
+    if host != "linkedin.com" and not host.endswith(".linkedin.com"):
+        # Not a LinkedIn URL, only strip the noise around it
+        return f"https://{host}{parts.path.rstrip('/')}"
+
+    segments = [unquote(s).lower() for s in parts.path.split("/") if s]
+    # Profile URLs are /in/<slug>; anything after the slug is a sub-page
+    if len(segments) >= 2 and segments[0] in ("in", "pub"):
+        segments = segments[:2]
+
+    return f"https://{LINKEDIN_HOST}/" + "/".join(segments)
+
+
+def is_linkedin_profile_url(url: str) -> bool:
+    """True for a member profile URL (/in/<slug>), False for company pages, posts, etc."""
+    return canonicalize_linkedin_url(url).startswith(f"https://{LINKEDIN_HOST}/in/")
@@ -0,0 +1,43 @@
+import unittest
+
+from src.core.incremental import changed_fields, job_fingerprint, job_lineage_key
+from src.data.models import JobData
+
+
+def _job(**fields) -> JobData:
+    defaults = {"title": "Software Engineer", "location": "Berlin, Germany",
+                "experience_level": "Senior", "keywords": ["Python", "Go"]}
+    return JobData(**{**defaults, **fields})
+
+
+class JobFingerprintTest(unittest.TestCase):
+    def test_ignores_case_whitespace_and_keyword_order(self):
+        job = _job()
+        same = _job(title="  software   ENGINEER ", keywords=["go", "python", " "])
+        self.assertEqual(job_fingerprint(job), job_fingerprint(same))
+
+    def test_ignores_id_and_scheduling_fields(self):
+        self.assertEqual(job_fingerprint(_job()), job_fingerprint(_job(id="R-1", priority=2, max_candidates=5)))
+
+    def test_changed_fields(self):
+        old = job_fingerprint(_job())
+        self.assertEqual(changed_fields(old, old), set())
+        new = job_fingerprint(_job(location="Munich, Germany", keywords=["Python", "Rust"]))
+        self.assertEqual(changed_fields(old, new), {"location", "keywords"})
+
+    def test_missing_fields_count_as_changed(self):
+        self.assertEqual(changed_fields({}, job_fingerprint(_job())),
+                         {"title", "location", "experience_level", "keywords"})
+
+
+class JobLineageKeyTest(unittest.TestCase):
+    def test_requisition_id_wins(self):
+        self.assertEqual(job_lineage_key(_job(id=" R-1 ")), job_lineage_key(_job(id="r-1", title="Chef")))
+
+    def test_title_and_location_without_id(self):
+        self.assertEqual(job_lineage_key(_job()), job_lineage_key(_job(title="software engineer", keywords=[])))
+        self.assertNotEqual(job_lineage_key(_job()), job_lineage_key(_job(location="Munich, Germany")))
+
+
+if __name__ == "__main__":
+    unittest.main()
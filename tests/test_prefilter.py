@@ -0,0 +1,47 @@
+import unittest
+
+from src.core.prefilter import PrefilterResult, fast_path_scores, keyword_overlap
+from src.data.models import JobData
+
+PROFILE = {
+    "headline": "Cloud engineer at Google. Loves Python, Node.js and C++.",
+    "experiences": [{"title": "Machine Learning Engineer", "description": "Built AI tooling"}],
+}
+
+
+def _overlap(*keywords: str) -> float:
+    job = JobData(title="Engineer", location="Berlin", experience_level="Mid", keywords=list(keywords))
+    return keyword_overlap(PROFILE, job)
+
+
+class KeywordOverlapTest(unittest.TestCase):
+    def test_short_keywords_match_whole_words_only(self):
+        for keyword in ("C", "R", "Go", "Java"):
+            self.assertEqual(_overlap(keyword), 0.0, keyword)
+
+    def test_whole_words_match(self):
+        for keyword in ("AI", "python", "C++", "Node.js", "cloud"):
+            self.assertEqual(_overlap(keyword), 1.0, keyword)
+
+    def test_multi_word_keywords(self):
+        self.assertEqual(_overlap("machine learning"), 1.0)
+        self.assertEqual(_overlap("learning machine"), 1.0)
+        self.assertEqual(_overlap("deep learning"), 0.0)
+
+    def test_fraction_of_keywords(self):
+        self.assertEqual(_overlap("Python", "Go", "AI", "Rust"), 0.5)
+        self.assertEqual(_overlap(), 1.0)
+
+
+class FastPathScoresTest(unittest.TestCase):
+    def test_only_measured_dimensions_are_scored(self):
+        result = PrefilterResult(score=0.1, keyword_overlap=1.0, location_match=1.0, seniority_fit=1.0, passed=False)
+        scores = fast_path_scores(result)
+        self.assertEqual(scores.experience_match_score, 10.0)
+        self.assertEqual(scores.location_match_score, 10.0)
+        self.assertEqual(scores.tenure_score, 0)
+        self.assertEqual(scores.fit_score, 3.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+from src.services.quota import QuotaExceededError, QuotaTracker
+from src.services.rate_limiter import GOOGLE_CSE, OPENAI, RAPIDAPI
+
+
+class QuotaTrackerTest(unittest.TestCase):
+    def setUp(self):
+        self.quota = QuotaTracker(":memory:", limits={GOOGLE_CSE: 0, RAPIDAPI: 10, OPENAI: 1000})
+
+    def test_records_usage(self):
+        self.quota.record(RAPIDAPI)
+        self.quota.record(RAPIDAPI, 2)
+        self.quota.record(RAPIDAPI, 0)
+        self.assertEqual(self.quota.used(RAPIDAPI), 3)
+        self.assertEqual(self.quota.remaining(RAPIDAPI), 7)
+
+    def test_unlimited_provider(self):
+        self.quota.record(GOOGLE_CSE, 10 ** 6)
+        self.assertIsNone(self.quota.remaining(GOOGLE_CSE))
+        self.quota.check(GOOGLE_CSE)
+
+    def test_check_refuses_once_used_up(self):
+        self.quota.record(RAPIDAPI, 9)
+        self.quota.check(RAPIDAPI)
+        self.quota.record(RAPIDAPI, 5)
+        self.assertEqual(self.quota.remaining(RAPIDAPI), 0)
+        self.assertTrue(self.quota.exhausted(RAPIDAPI))
+        with self.assertRaises(QuotaExceededError):
+            self.quota.check(RAPIDAPI)
+
+    def test_remaining_fraction_is_the_smallest_share(self):
+        self.assertEqual(self.quota.remaining_fraction(), 1.0)
+        self.quota.record(RAPIDAPI, 5)
+        self.quota.record(OPENAI, 750)
+        self.assertEqual(self.quota.remaining_fraction(), 0.25)
+        self.assertEqual(QuotaTracker(":memory:", limits={}).remaining_fraction(), 1.0)
+
+    def test_usage(self):
+        self.quota.record(OPENAI, 42)
+        self.assertEqual(self.quota.usage()[OPENAI], {"used": 42, "limit": 1000})
+        self.assertEqual(self.quota.usage()[GOOGLE_CSE], {"used": 0, "limit": None})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+import time
+import unittest
+
+from src.services.resilience import (
+    AIMDLimiter, CircuitBreaker, ProviderGuard, is_retryable_error, parse_retry_after
+)
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def _open_guard() -> ProviderGuard:
+    """Guard whose circuit is open and ready for its half-open trial"""
+    guard = ProviderGuard("test", breaker=CircuitBreaker(failure_threshold=1, reset_seconds=0.01),
+                          limiter=AIMDLimiter(4, 8))
+    guard.record(503)
+    time.sleep(0.02)
+    return guard
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=3, reset_seconds=60)
+        for _ in range(2):
+            breaker.record_failure()
+        self.assertFalse(breaker.is_open)
+        breaker.record_failure()
+        self.assertTrue(breaker.is_open)
+        self.assertIsNone(breaker.claim())
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertFalse(breaker.is_open)
+
+    def test_half_open_lets_one_trial_through(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        self.assertIs(breaker.claim(), True)
+        self.assertIsNone(breaker.claim())
+        breaker.release_trial()
+        self.assertIs(breaker.claim(), True)
+
+    def test_trial_outcome_closes_or_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=5, reset_seconds=0.01)
+        for _ in range(5):
+            breaker.record_failure()
+        time.sleep(0.02)
+        breaker.claim()
+        breaker.record_failure()
+        self.assertTrue(breaker.is_open)
+        self.assertIsNone(breaker.claim())
+        time.sleep(0.02)
+        breaker.claim()
+        breaker.record_success()
+        self.assertFalse(breaker.is_open)
+        self.assertIs(breaker.claim(), False)
+
+
+class AIMDLimiterTest(unittest.TestCase):
+    def test_additive_increase_up_to_max(self):
+        limiter = AIMDLimiter(initial=2, max_limit=3)
+        limiter.on_success()
+        self.assertEqual(limiter.limit, 2)
+        # +1/limit per success: one more slot per window of healthy requests
+        limiter.on_success()
+        limiter.on_success()
+        self.assertEqual(limiter.limit, 3)
+        for _ in range(10):
+            limiter.on_success()
+        self.assertEqual(limiter.limit, 3)
+
+    def test_multiplicative_decrease_once_per_cooldown(self):
+        limiter = AIMDLimiter(initial=16, max_limit=32, cooldown=60)
+        limiter.on_throttle()
+        limiter.on_throttle()
+        self.assertEqual(limiter.limit, 8)
+
+    def test_decrease_stops_at_min(self):
+        limiter = AIMDLimiter(initial=2, max_limit=8, min_limit=1, cooldown=0)
+        for _ in range(5):
+            limiter.on_throttle()
+        self.assertEqual(limiter.limit, 1)
+
+    def test_slots(self):
+        limiter = AIMDLimiter(initial=1, max_limit=1)
+        limiter.acquire()
+        self.assertEqual(limiter.in_flight, 1)
+        self.assertFalse(limiter._try_acquire())
+        limiter.release()
+        self.assertEqual(limiter.in_flight, 0)
+
+
+class ProviderGuardRecordTest(unittest.TestCase):
+    def test_success_closes_circuit_and_raises_limit(self):
+        guard = _open_guard()
+        self.assertTrue(guard.check())
+        self.assertFalse(guard.record(200))
+        self.assertFalse(guard.breaker.is_open)
+        self.assertGreater(guard.limiter._limit, 4)
+
+    def test_throttled_trial_leaves_circuit_open(self):
+        guard = _open_guard()
+        guard.check()
+        self.assertTrue(guard.record(429))
+        self.assertTrue(guard.breaker.is_open)
+        self.assertEqual(guard.limiter.limit, 2)
+        # The trial was given up, so the next call can be the trial
+        self.assertTrue(guard.check())
+
+    def test_error_without_response_is_inconclusive(self):
+        guard = _open_guard()
+        guard.check()
+        self.assertFalse(guard.record(None, ValueError("bad json")))
+        self.assertTrue(guard.breaker.is_open)
+        self.assertTrue(guard.check())
+
+    def test_client_error_response_means_provider_is_up(self):
+        guard = _open_guard()
+        guard.check()
+        self.assertFalse(guard.record(400))
+        self.assertFalse(guard.breaker.is_open)
+
+    def test_server_errors_count_as_failures(self):
+        guard = _open_guard()
+        guard.check()
+        self.assertTrue(guard.record(503))
+        self.assertTrue(guard.breaker.is_open)
+        time.sleep(0.02)
+        guard.check()
+        self.assertFalse(guard.record(501))
+        self.assertTrue(guard.breaker.is_open)
+
+    def test_transport_error_is_retryable(self):
+        guard = ProviderGuard("test", breaker=CircuitBreaker(failure_threshold=2), limiter=AIMDLimiter(4, 8))
+        self.assertTrue(guard.record(None, ConnectionError("reset")))
+        self.assertFalse(guard.breaker.is_open)
+        self.assertTrue(guard.record(None, TimeoutError("slow")))
+        self.assertTrue(guard.breaker.is_open)
+
+
+class RetryHelpersTest(unittest.TestCase):
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("3"), 3.0)
+        self.assertEqual(parse_retry_after("-1"), 0.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+    def test_is_retryable_error(self):
+        self.assertTrue(is_retryable_error(StatusError(429)))
+        self.assertTrue(is_retryable_error(StatusError(502)))
+        self.assertFalse(is_retryable_error(StatusError(401)))
+        self.assertTrue(is_retryable_error(ConnectionError()))
+        self.assertFalse(is_retryable_error(ValueError()))
+
+
+if __name__ == "__main__":
+    unittest.main()
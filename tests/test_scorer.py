@@ -0,0 +1,47 @@
+import unittest
+from unittest import mock
+
+from src.core import scorer
+from src.data.models import JobData
+
+JOB = JobData(title="Software Engineer", location="Berlin, Germany", experience_level="Senior", keywords=["Python"])
+PROFILE = {"full_name": "Jane Doe", "city": "Berlin", "experiences": [{"title": "Engineer", "company": "Acme"}]}
+ALL_ZERO = {
+    "education_score": 0, "career_trajectory_score": 0, "company_relevance_score": 0,
+    "experience_match_score": 0, "location_match_score": 0, "tenure_score": 0, "fit_score": 0,
+}
+
+
+class ScoringFailureTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(scorer, "_llm", return_value=mock.Mock(name="llm"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_failed_call_returns_none(self):
+        with mock.patch.object(scorer, "cached_invoke", side_effect=RuntimeError("down")):
+            self.assertIsNone(scorer.score_candidate(PROFILE, JOB))
+
+    def test_failed_batch_marks_only_the_failures(self):
+        with mock.patch.object(scorer, "cached_batch", side_effect=RuntimeError("down")), \
+                mock.patch.object(scorer, "cached_invoke", side_effect=RuntimeError("down")):
+            results = scorer.score_candidates([PROFILE, {}], JOB)
+        self.assertIsNone(results[0])
+        self.assertIsNotNone(results[1])
+        self.assertEqual(results[1].fit_score, 0)
+
+    def test_all_zero_llm_score_is_not_a_failure(self):
+        with mock.patch.object(scorer, "SCORING_HYBRID", False), \
+                mock.patch.object(scorer, "cached_batch", return_value=[dict(ALL_ZERO)]):
+            [scores] = scorer.score_candidates([PROFILE], JOB)
+        self.assertIsNotNone(scores)
+        self.assertEqual(scores.fit_score, 0)
+
+    def test_multi_job_failure_returns_none_per_job(self):
+        other = JOB.model_copy(update={"title": "Data Engineer"})
+        with mock.patch.object(scorer, "cached_invoke", side_effect=RuntimeError("down")):
+            self.assertEqual(scorer.score_candidate_multi_job(PROFILE, [JOB, other]), [None, None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+
+from src.services.urls import canonicalize_linkedin_url, is_linkedin_profile_url
+
+
+class CanonicalizeLinkedinUrlTest(unittest.TestCase):
+    def test_variants_of_one_profile_are_equal(self):
+        variants = [
+            "https://www.linkedin.com/in/jane-doe",
+            "http://linkedin.com/in/jane-doe/",
+            "https://uk.linkedin.com/in/Jane-Doe?trk=public_profile#about",
+            "www.linkedin.com/in/jane-doe/details/experience/",
+            "https://user@de.linkedin.com:443/in/jane%2Ddoe",
+        ]
+        for url in variants:
+            self.assertEqual(canonicalize_linkedin_url(url), "https://www.linkedin.com/in/jane-doe", url)
+
+    def test_empty_and_non_linkedin_urls(self):
+        self.assertEqual(canonicalize_linkedin_url("  "), "")
+        self.assertEqual(canonicalize_linkedin_url("https://Example.com/a/?q=1"), "https://example.com/a")
+
+    def test_profile_urls_only(self):
+        self.assertTrue(is_linkedin_profile_url("uk.linkedin.com/in/jane-doe"))
+        self.assertFalse(is_linkedin_profile_url("https://www.linkedin.com/company/acme"))
+        self.assertFalse(is_linkedin_profile_url("https://example.com/in/jane-doe"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import time
+import unittest
+
+from src.core.work_queue import WorkQueue, PENDING, LEASED, DONE, FAILED
+
+
+class WorkQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.queue = WorkQueue(":memory:", lease_seconds=60, max_attempts=2)
+
+    def test_claim_and_complete(self):
+        task_id = self.queue.enqueue("run", "job", {"n": 1})
+        task = self.queue.claim("w1")
+        self.assertEqual((task.id, task.status, task.owner, task.attempts), (task_id, LEASED, "w1", 1))
+        self.assertEqual(task.payload, {"n": 1})
+        self.assertIsNone(self.queue.claim("w2"))
+        self.assertTrue(self.queue.complete(task, {"ok": True}))
+        [done] = self.queue.tasks("run")
+        self.assertEqual((done.status, done.result), (DONE, {"ok": True}))
+        self.assertTrue(self.queue.is_drained("run"))
+
+    def test_claims_are_scoped_to_a_queue(self):
+        self.queue.enqueue("a", "job", {})
+        self.assertIsNone(self.queue.claim("w1", "b"))
+        self.assertIsNotNone(self.queue.claim("w1", "a"))
+
+    def test_expired_lease_is_reclaimed_and_stale_completion_ignored(self):
+        queue = WorkQueue(":memory:", lease_seconds=0.01, max_attempts=3)
+        queue.enqueue("run", "job", {})
+        first = queue.claim("w1")
+        time.sleep(0.02)
+        second = queue.claim("w2")
+        self.assertEqual((second.id, second.attempts), (first.id, 2))
+        self.assertFalse(queue.heartbeat(first))
+        self.assertFalse(queue.complete(first, "stale"))
+        self.assertTrue(queue.complete(second, "fresh"))
+        self.assertEqual(queue.tasks("run")[0].result, "fresh")
+
+    def test_heartbeat_keeps_the_lease(self):
+        queue = WorkQueue(":memory:", lease_seconds=0.05)
+        queue.enqueue("run", "job", {})
+        task = queue.claim("w1")
+        time.sleep(0.03)
+        self.assertTrue(queue.heartbeat(task))
+        time.sleep(0.03)
+        self.assertIsNone(queue.claim("w2"))
+
+    def test_expired_lease_on_last_attempt_fails_the_task(self):
+        queue = WorkQueue(":memory:", lease_seconds=0.01, max_attempts=1)
+        queue.enqueue("run", "job", {})
+        queue.claim("w1")
+        time.sleep(0.02)
+        self.assertIsNone(queue.claim("w2"))
+        self.assertEqual(queue.tasks("run")[0].status, FAILED)
+
+    def test_fail_retries_until_out_of_attempts(self):
+        self.queue.enqueue("run", "job", {})
+        task = self.queue.claim("w1")
+        self.assertTrue(self.queue.fail(task, "boom"))
+        self.assertEqual(self.queue.tasks("run")[0].status, PENDING)
+        task = self.queue.claim("w1")
+        self.assertTrue(self.queue.fail(task, "boom again"))
+        [failed] = self.queue.tasks("run")
+        self.assertEqual((failed.status, failed.error), (FAILED, "boom again"))
+
+    def test_follow_up_is_enqueued_once_after_the_last_child(self):
+        self.queue.enqueue("run", "job", {})
+        parent = self.queue.claim("w1")
+        self.queue.complete(parent, children=[("chunk", {"i": 0}), ("chunk", {"i": 1})],
+                            follow_up=("finalize", {"job": 1}))
+        first = self.queue.claim("w1")
+        second = self.queue.claim("w2")
+        self.queue.complete(first)
+        self.assertEqual(self.queue.tasks("run", kind="finalize"), [])
+        self.queue.fail(second, "boom")
+        second = self.queue.claim("w2")
+        self.queue.fail(second, "boom")
+        [finalize] = self.queue.tasks("run", kind="finalize")
+        self.assertEqual((finalize.parent_id, finalize.payload), (parent.id, {"job": 1}))
+        self.assertEqual(self.queue.counts("run")[PENDING], 1)
+
+    def test_follow_up_without_children_is_enqueued_right_away(self):
+        self.queue.enqueue("run", "job", {})
+        parent = self.queue.claim("w1")
+        self.queue.complete(parent, follow_up=("finalize", {}))
+        self.assertEqual(len(self.queue.tasks("run", kind="finalize", parent_id=parent.id)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,25 @@
+import argparse
+from src.core.distributed import run_worker, WORKER_POLL_SECONDS
+from src.core.work_queue import WorkQueue, WORK_QUEUE_PATH
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Process job and candidate tasks from the shared work queue")
+    parser.add_argument("--queue", metavar="QUEUE_ID", help="only work on this queue (a run id); exit once it is drained")
+    parser.add_argument("--queue-path", default=WORK_QUEUE_PATH, help="SQLite file of the work queue")
+    parser.add_argument("--worker-id", help="unique worker id (default: host-pid-random)")
+    parser.add_argument("--forever", action="store_true", help="keep polling after the queue is drained")
+    parser.add_argument("--poll-seconds", type=float, default=WORKER_POLL_SECONDS)
+    return parser.parse_args()
+
+
+def main():
+    """Worker entry point: run as many of these as needed, on one machine or several sharing the queue file"""
+    args = parse_args()
+    completed = run_worker(args.queue, WorkQueue(args.queue_path), args.worker_id,
+                           forever=args.forever, poll_seconds=args.poll_seconds)
+    print(f"Worker done: {completed} tasks completed")
+
+
+if __name__ == "__main__":
+    main()